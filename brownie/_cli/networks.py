@@ -45,7 +45,7 @@ as well as possible data fields when declaring new networks."""
 
 DEV_REQUIRED: Final = ("id", "host", "cmd", "cmd_settings")
 PROD_REQUIRED: Final = ("id", "host", "chainid")
-OPTIONAL: Final = ("name", "explorer", "timeout", "multicall2", "provider")
+OPTIONAL: Final = ("name", "explorer", "timeout", "multicall2", "multicall3", "provider")
 
 DEV_CMD_SETTINGS: Final = frozenset(
     [
@@ -1,6 +1,8 @@
 #!/usr/bin/python3
 
 import decimal
+import threading
+from collections import OrderedDict
 from typing import (
     Any,
     Dict,
@@ -24,7 +26,7 @@ except ImportError:
 
 import cchecksum
 import faster_eth_utils
-from eth_typing import ABIComponent, HexStr
+from eth_typing import ABIComponent, ChecksumAddress, HexStr
 from mypy_extensions import mypyc_attr
 from typing_extensions import Self
 
@@ -53,6 +55,9 @@ WeiInputTypes = TypeVar("WeiInputTypes", str, float, int, bytes, decimal.Decimal
 WeiInputType = str | float | int | bytes | decimal.Decimal | None
 
 
+# maximum number of addresses held by the checksum cache
+CHECKSUM_CACHE_SIZE: Final = 65536
+
 to_checksum_address: Final = cchecksum.to_checksum_address
 
 add_0x_prefix: Final = faster_eth_utils.add_0x_prefix
@@ -229,6 +234,56 @@ def _to_fixed(value: Any) -> decimal.Decimal:
         raise TypeError(f"Cannot convert {type(value).__name__} '{value}' to decimal.") from e
 
 
+@final
+class _ChecksumCache:
+    """
+    Thread-safe LRU cache of EIP-55 checksummed addresses, keyed by the hex string
+    they are computed from.
+
+    Shared by `EthAddress` and `to_address`, so that an address which appears in many
+    decoded return values, event logs or trace steps is only hashed once.
+    """
+
+    def __init__(self, maxsize: int = CHECKSUM_CACHE_SIZE) -> None:
+        self.maxsize: Final = maxsize
+        self._lock: Final = threading.Lock()
+        self._addresses: Final[OrderedDict[str, ChecksumAddress]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._addresses)
+
+    def checksum(self, value: str) -> ChecksumAddress:
+        """
+        Returns the checksummed form of a 0x-prefixed address. Raises `ValueError`
+        if the value is not a valid address.
+        """
+        with self._lock:
+            address = self._addresses.get(value)
+            if address is not None:
+                self._addresses.move_to_end(value)
+                self.hits += 1
+                return address
+            self.misses += 1
+        # invalid values raise here and are not cached
+        address = to_checksum_address(value)
+        with self._lock:
+            self._addresses[value] = address
+            while len(self._addresses) > self.maxsize:
+                self._addresses.popitem(last=False)
+        return address
+
+    def clear(self) -> None:
+        with self._lock:
+            self._addresses.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+checksum_cache: Final = _ChecksumCache()
+
+
 @final
 @mypyc_attr(native_class=False)
 class EthAddress(str):
@@ -244,7 +299,7 @@ class EthAddress(str):
             converted_value = str(value)  # type: ignore [assignment]
         converted_value = add_0x_prefix(converted_value)
         try:
-            converted_value = to_checksum_address(converted_value)
+            converted_value = checksum_cache.checksum(converted_value)  # type: ignore [assignment]
         except ValueError:
             raise ValueError(f"{value!r} is not a valid ETH address") from None
         return str.__new__(cls, converted_value)
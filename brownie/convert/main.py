@@ -10,7 +10,6 @@ from brownie._c_constants import Decimal, HexBytes
 from .datatypes import EthAddress, Fixed, HexString, Wei
 from .utils import get_int_bounds
 
-
 is_hex: Final = faster_eth_utils.is_hex
 to_text: Final = faster_eth_utils.to_text
 
@@ -21,7 +20,8 @@ def to_uint(value: Any, type_str: str = "uint256") -> Wei:
     """Convert a value to an unsigned integer"""
     wei: Wei = Wei(value)
     lower, upper = get_int_bounds(type_str)
-    if wei < lower or wei > upper:
+    # compared as an int, `Wei` comparisons convert the bounds on every call
+    if not lower <= int(wei) <= upper:
         raise OverflowError(f"{value} is outside allowable range for {type_str}")
     return wei
 
@@ -30,7 +30,8 @@ def to_int(value: Any, type_str: str = "int256") -> Wei:
     """Convert a value to a signed integer"""
     wei = Wei(value)
     lower, upper = get_int_bounds(type_str)
-    if wei < lower or wei > upper:
+    # compared as an int, `Wei` comparisons convert the bounds on every call
+    if not lower <= int(wei) <= upper:
         raise OverflowError(f"{value} is outside allowable range for {type_str}")
     return wei
 
@@ -1,6 +1,6 @@
 #!/usr/bin/python3
 
-from typing import Any, Final, List, Optional, Sequence, Tuple, cast
+from typing import Any, Callable, Dict, Final, List, Optional, Sequence, Tuple, cast
 
 from eth_event.main import DecodedEvent, NonDecodedEvent
 from eth_typing import ABIComponent, ABIFunction
@@ -13,6 +13,7 @@ from .main import to_bool, to_decimal, to_int, to_string, to_uint
 from .utils import get_type_strings
 
 AnyListOrTuple = List[Any] | Tuple[Any, ...]
+Formatter = Callable[[Any], Any]
 
 # Internal C constants
 
@@ -20,25 +21,57 @@ _TupleType: Final = TupleType
 
 _parse: Final = parse
 
+# compiled formatters, keyed by the tuple type string of the ABI parameters
+_formatters: Final[Dict[str, Formatter]] = {}
+
 
 def format_input(abi: ABIFunction, inputs: AnyListOrTuple) -> List[Any]:
     """Format contract inputs based on ABI types."""
-    abi_inputs = abi["inputs"]
-    if len(inputs) and not len(abi_inputs):
-        raise TypeError(f"{abi['name']} requires no arguments")
-    abi_types = _get_abi_types(abi_inputs)
-    try:
-        return _format_tuple(abi_types, inputs)
-    except Exception as e:
-        raise type(e)(f"{abi['name']} {e}") from None
+    return get_input_formatter(abi)(inputs)
 
 
 def format_output(abi: ABIFunction, outputs: AnyListOrTuple) -> ReturnValue:
     """Format contract outputs based on ABI types."""
+    return get_output_formatter(abi)(outputs)
+
+
+def get_input_formatter(abi: ABIFunction) -> Callable[[AnyListOrTuple], List[Any]]:
+    """
+    Returns a function that formats contract inputs in the same way as `format_input`.
+
+    The ABI types are parsed once, and the formatters for each type are reused by
+    every call to the returned function.
+    """
+    name = abi["name"]
+    abi_inputs = abi["inputs"]
+    format_tuple = _get_tuple_formatter(abi_inputs)
+    no_inputs = not len(abi_inputs)
+
+    def format_input(inputs: AnyListOrTuple) -> List[Any]:
+        if no_inputs and len(inputs):
+            raise TypeError(f"{name} requires no arguments")
+        try:
+            return format_tuple(inputs)
+        except Exception as e:
+            raise type(e)(f"{name} {e}") from None
+
+    return format_input
+
+
+def get_output_formatter(abi: ABIFunction) -> Callable[[AnyListOrTuple], ReturnValue]:
+    """
+    Returns a function that formats contract outputs in the same way as `format_output`.
+
+    The ABI types are parsed once, and the formatters for each type are reused by
+    every call to the returned function.
+    """
     abi_outputs = abi["outputs"]
-    abi_types = _get_abi_types(abi_outputs)
-    result = _format_tuple(abi_types, outputs)
-    return ReturnValue(result, abi_outputs)
+    format_tuple = _get_tuple_formatter(abi_outputs)
+
+    def format_output(outputs: AnyListOrTuple) -> ReturnValue:
+        return ReturnValue(format_tuple(outputs), abi_outputs)
+
+    return format_output
 
 
 def format_event(event: DecodedEvent | NonDecodedEvent) -> FormattedEvent:
@@ -60,45 +93,79 @@ def format_event(event: DecodedEvent | NonDecodedEvent) -> FormattedEvent:
         if not e["decoded"]:
             e["type"] = "bytes32"
             e["name"] += " (indexed)"
-    abi_types = _get_abi_types(cast(Sequence[ABIComponent], data))
+    format_tuple = _get_tuple_formatter(cast(Sequence[ABIComponent], data))
     event_values = [i["value"] for i in data]
-    values = ReturnValue(
-        _format_tuple(abi_types, event_values),
-        cast(Sequence[ABIComponent], data),
-    )
+    values = ReturnValue(format_tuple(event_values), cast(Sequence[ABIComponent], data))
     for e, value in zip(data, values):
         e["value"] = value
     return cast(FormattedEvent, event)
 
 
-def _format_tuple(abi_types: Sequence[ABIType], values: AnyListOrTuple) -> List[Any]:
-    result = []
-    _check_array(values, len(abi_types))
-    for type_, value in zip(abi_types, values):
-        try:
-            if type_.is_array:
-                result.append(_format_array(type_, value))
-            elif isinstance(type_, _TupleType):
-                result.append(_format_tuple(type_.components, value))
-            else:
-                result.append(_format_single(type_.to_type_str(), value))
-        except Exception as e:
-            raise type(e)(f"'{value}' - {e}") from None
-    return result
+def _get_tuple_formatter(abi_params: Sequence[ABIComponent]) -> Formatter:
+    # formatters are compiled once for each distinct tuple of ABI types
+    type_str = f"({','.join(get_type_strings(abi_params))})"
+    formatter = _formatters.get(type_str)
+    if formatter is None:
+        formatter = _formatters[type_str] = _compile_tuple(_get_abi_types(abi_params))
+    return formatter
 
 
-def _format_array(abi_type: ABIType, values: AnyListOrTuple) -> List[Any]:
+def _compile(abi_type: ABIType) -> Formatter:
+    # returns a function that formats a value of `abi_type`, resolving the type once
+    if abi_type.is_array:
+        return _compile_array(abi_type)
+    if isinstance(abi_type, _TupleType):
+        return _compile_tuple(abi_type.components)
+    return _compile_single(abi_type.to_type_str())
+
+
+def _compile_tuple(abi_types: Sequence[ABIType]) -> Formatter:
+    formatters = [_compile(i) for i in abi_types]
+    length = len(formatters)
+
+    def format_tuple(values: AnyListOrTuple) -> List[Any]:
+        _check_array(values, length)
+        result = []
+        for formatter, value in zip(formatters, values):
+            try:
+                result.append(formatter(value))
+            except Exception as e:
+                raise type(e)(f"'{value}' - {e}") from None
+        return result
+
+    return format_tuple
+
+
+def _compile_array(abi_type: ABIType) -> Formatter:
     arrlist = cast(Tuple[Tuple[int, ...], ...], abi_type.arrlist)
     arrlast = arrlist[-1]
-    _check_array(values, arrlast[0] if arrlast else None)
-    item_type = abi_type.item_type
-    if item_type.is_array:
-        return [_format_array(item_type, i) for i in values]
-    elif isinstance(item_type, _TupleType):
-        item_type_components = item_type.components
-        return [_format_tuple(item_type_components, i) for i in values]
-    item_type_str = item_type.to_type_str()
-    return [_format_single(item_type_str, i) for i in values]
+    length = arrlast[0] if arrlast else None
+    format_item = _compile(abi_type.item_type)
+
+    def format_array(values: AnyListOrTuple) -> List[Any]:
+        _check_array(values, length)
+        return [format_item(i) for i in values]
+
+    return format_array
+
+
+def _compile_single(type_str: str) -> Formatter:
+    if "uint" in type_str:
+        return lambda value: to_uint(value, type_str)
+    elif "int" in type_str:
+        return lambda value: to_int(value, type_str)
+    elif type_str == "fixed168x10":
+        return to_decimal
+    elif type_str == "bool":
+        return to_bool
+    elif type_str == "address":
+        return EthAddress
+    elif "byte" in type_str:
+        return lambda value: HexString(value, type_str)
+    elif "string" in type_str:
+        return to_string
+    # unknown types only raise when a value is formatted
+    return lambda value: _format_single(type_str, value)
 
 
 def _format_single(type_str: str, value: Any) -> Any:
@@ -1,13 +1,16 @@
 #!/usr/bin/python3
 
+import copy
 import sys
 import threading
 import time
+from collections import OrderedDict
 from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from getpass import getpass
 from importlib.metadata import version
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import eth_account
 import eth_keys
@@ -35,9 +38,11 @@ from brownie.exceptions import (
 from brownie.utils import bytes_to_hexstring, color
 from brownie.utils._color import bright_blue, bright_cyan
 
+from .confirmations import confirmation_tracker
+from .fees import fee_oracle
 from .gas.bases import GasABC
 from .rpc import Rpc
-from .state import Chain, TxHistory, _revert_register
+from .state import Chain, TxHistory, _active_multicall, _revert_register
 from .transaction import TransactionReceipt
 from .web3 import _resolve_address, web3
 
@@ -53,6 +58,11 @@ rpc = Rpc()
 eth_account.Account.enable_unaudited_hdwallet_features()
 _marker = deque("-/|\\-/|\\")
 
+# keyword arguments of `transfer` that can be given for each transaction in a batch
+_BATCH_KEYS = frozenset(
+    ("to", "amount", "gas_limit", "gas_buffer", "gas_price", "max_fee", "priority_fee", "data")
+)
+
 
 class Accounts(metaclass=_Singleton):
     """
@@ -381,6 +391,8 @@ class PublicKeyAccount:
 
     def balance(self) -> Wei:
         """Returns the current balance at the address, in wei."""
+        if multicall := _active_multicall.get():
+            return multicall._get_eth_balance(self.address)
         balance = web3.eth.get_balance(self.address)
         return Wei(balance)
 
@@ -413,28 +425,187 @@ class PublicKeyAccount:
         return EthAddress(deployment_address)
 
 
+class _NonceManager:
+    """
+    Allocates the nonces of transactions sent from one account.
+
+    The next nonce is read from the node on first use, and afterwards advanced
+    locally so that concurrent transactions can be prepared and broadcast without
+    querying the node or waiting on each other. It is read again after the chain
+    is reverted or reset, a transaction is dropped, or a broadcast fails.
+    """
+
+    def __init__(self, account: "_PrivateKeyAccount") -> None:
+        self._account = account
+        self._lock = threading.Lock()
+        self._next: Optional[int] = None
+        _revert_register(self)
+
+    def allocate(self) -> int:
+        """Returns the next nonce and advances the local counter."""
+        with self._lock:
+            if self._next is None:
+                self._next = self._account._pending_nonce()
+            nonce = self._next
+            self._next += 1
+            return nonce
+
+    def observe(self, nonce: int) -> None:
+        """Advances the local counter past a nonce that was given explicitly."""
+        with self._lock:
+            if self._next is not None and nonce >= self._next:
+                self._next = nonce + 1
+
+    def release(self, nonce: int) -> None:
+        """Returns a nonce that was allocated for a transaction that was not broadcast."""
+        with self._lock:
+            if self._next is not None and nonce == self._next - 1:
+                self._next = nonce
+            else:
+                # a later nonce is already in use, resync to fill the gap
+                self._next = None
+
+    def reset(self) -> None:
+        """Discards the local counter, so the next nonce is read from the node."""
+        with self._lock:
+            self._next = None
+
+    def _revert(self, height: BlockNumber) -> None:
+        self.reset()
+
+    def _reset(self) -> None:
+        self.reset()
+
+
+class _GasEstimateCache:
+    """
+    Caches gas estimates and revert checks, if enabled with the `gas_estimate_cache`
+    network setting.
+
+    On development networks a result is only reused for an identical transaction
+    against the same state, identified by the height of the chain and the time offset
+    set by `chain.sleep`. Results for blocks above the height are discarded when the
+    chain is reverted, and reverting to a snapshot restores the height and time offset,
+    so results are reused in every test that starts from the snapshot.
+
+    On live networks an estimate is reused for transactions calling the same function
+    with calldata of the same length, for `gas_estimate_ttl` seconds, multiplied by
+    `gas_estimate_margin`. Revert checks are not cached on live networks.
+    """
+
+    # maximum number of results retained for development networks
+    MAX_SIZE = 4096
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # (kind, block number, time offset, transaction) -> (block number, estimate or exception)
+        self._exact: OrderedDict[Tuple, Tuple[int, Any]] = OrderedDict()
+        # (network, sender, receiver, selector, calldata length, has value) -> (time, estimate)
+        self._recent: Dict[Tuple, Tuple[float, int]] = {}
+        self.lookups: Dict[str, int] = {"estimate": 0, "revert_check": 0}
+        self.hits: Dict[str, int] = {"estimate": 0, "revert_check": 0}
+        _revert_register(self)
+
+    def estimate(self, tx: Dict, estimate_gas: Callable[[], int]) -> int:
+        """Returns the gas estimate for `tx`, calling `estimate_gas` on a cache miss."""
+        settings = CONFIG.active_network["settings"]
+        if not settings.get("gas_estimate_cache"):
+            return estimate_gas()
+        if CONFIG.network_type == "development":
+            return self._get_exact("estimate", tx, estimate_gas)
+
+        key = (
+            CONFIG.active_network["id"],
+            tx["from"],
+            tx["to"],
+            bytes(tx["data"][:4]),
+            len(tx["data"]),
+            bool(tx["value"]),
+        )
+        with self._lock:
+            self.lookups["estimate"] += 1
+            cached = self._recent.get(key)
+            if cached is not None and time.time() - cached[0] <= settings["gas_estimate_ttl"]:
+                self.hits["estimate"] += 1
+                return int(cached[1] * settings["gas_estimate_margin"])
+        gas = estimate_gas()
+        with self._lock:
+            self._recent[key] = (time.time(), gas)
+        return gas
+
+    def check(self, tx: Dict, call: Callable[[], Any]) -> None:
+        """Raises if `tx` reverts, calling `call` on a cache miss."""
+        if (
+            not CONFIG.active_network["settings"].get("gas_estimate_cache")
+            or CONFIG.network_type != "development"
+        ):
+            call()
+            return
+
+        def check_call() -> Optional[ValueError]:
+            try:
+                call()
+            except ValueError as exc:
+                # only the exception itself is kept, without the frames it was raised in
+                return exc.with_traceback(None)
+            return None
+
+        exc = self._get_exact("revert_check", tx, check_call)
+        if exc is not None:
+            # a new copy is raised each time, so tracebacks do not accumulate on the cached one
+            raise copy.copy(exc)
+
+    def _get_exact(self, kind: str, tx: Dict, fn: Callable[[], Any]) -> Any:
+        chain = Chain()
+        height = chain.height
+        key = (
+            kind,
+            height,
+            chain._time_offset,
+            tuple(sorted((k, str(v)) for k, v in tx.items() if k != "nonce")),
+        )
+        with self._lock:
+            self.lookups[kind] += 1
+            if key in self._exact:
+                self.hits[kind] += 1
+                self._exact.move_to_end(key)
+                return self._exact[key][1]
+        value = fn()
+        with self._lock:
+            self._exact[key] = (height, value)
+            while len(self._exact) > self.MAX_SIZE:
+                self._exact.popitem(last=False)
+        return value
+
+    def _revert(self, height: BlockNumber) -> None:
+        # results for blocks above the new height can never be reused
+        with self._lock:
+            for key in [k for k, v in self._exact.items() if v[0] > height]:
+                del self._exact[key]
+
+    def _reset(self) -> None:
+        with self._lock:
+            self._exact.clear()
+            self._recent.clear()
+
+
+_gas_cache = _GasEstimateCache()
+
+
 class _PrivateKeyAccount(PublicKeyAccount):
     """Base class for Account and LocalAccount"""
 
     def __init__(self, addr: str) -> None:
-        self._lock = threading.Lock()
         super().__init__(addr)
+        self._nonces = _NonceManager(self)
 
     def _pending_nonce(self) -> int:
-        tx_from_sender = sorted(history.from_sender(self.address), key=lambda k: k.nonce)
-        if len(tx_from_sender) == 0:
-            return self.nonce
-
-        last_tx = tx_from_sender[-1]
-        if last_tx.status == -1:
-            return last_tx.nonce + 1
-
-        nonce = self.nonce
-        while nonce == last_tx.nonce:
+        # next nonce according to the node, including transactions in the mempool
+        nonce = web3.eth.get_transaction_count(self.address, "pending")
+        last_tx = history._last_from_sender(self.address)
+        if last_tx is not None and last_tx.status != -1 and nonce <= last_tx.nonce:
             # ganache does not always immediately increment the nonce
-            time.sleep(0.5)
-            nonce = self.nonce
-
+            return last_tx.nonce + 1
         return nonce
 
     def _gas_limit(
@@ -478,7 +649,7 @@ class _PrivateKeyAccount(PublicKeyAccount):
             return gas_price, None, None
 
         if isinstance(gas_price, bool) or gas_price in (None, "auto"):
-            return web3.eth.generate_gas_price(), None, None
+            return fee_oracle.gas_price, None, None
 
         return Wei(gas_price), None, None
 
@@ -487,7 +658,8 @@ class _PrivateKeyAccount(PublicKeyAccount):
             # remove gas price related values to avoid issues post-EIP1559
             # https://github.com/ethereum/go-ethereum/pull/23027
             skip_keys = {"gasPrice", "maxFeePerGas", "maxPriorityFeePerGas"}
-            web3.eth.call({k: v for k, v in tx.items() if k not in skip_keys and v})
+            call_tx = {k: v for k, v in tx.items() if k not in skip_keys and v}
+            _gas_cache.check(call_tx, lambda: web3.eth.call(call_tx))
         except ValueError as exc:
             exc = VirtualMachineError(exc)
             raise ValueError(
@@ -617,7 +789,7 @@ class _PrivateKeyAccount(PublicKeyAccount):
         if gas_price is not None:
             tx["gasPrice"] = web3.to_hex(gas_price)
         try:
-            return web3.eth.estimate_gas(tx)
+            return _gas_cache.estimate(tx, lambda: web3.eth.estimate_gas(tx))
         except ValueError as exc:
             revert_gas_limit = CONFIG.active_network["settings"]["reverting_tx_gas_limit"]
             if revert_gas_limit == "max":
@@ -707,6 +879,103 @@ class _PrivateKeyAccount(PublicKeyAccount):
         receipt._raise_if_reverted(exc)
         return receipt
 
+    def send_batch(
+        self,
+        transactions: Sequence[Dict[str, Any]],
+        required_confs: int = 1,
+        concurrency: int = 8,
+        on_error: str = "raise",
+        allow_revert: Optional[bool] = None,
+        silent: Optional[bool] = None,
+    ) -> List[Union[TransactionReceipt, Exception]]:
+        """
+        Broadcast many transactions from this account, back-to-back.
+
+        The gas limit and fees of every transaction (and, unless reverts are allowed,
+        the check for a revert) are resolved concurrently against the current state.
+        The transactions are then broadcast in order with consecutive nonces, without
+        waiting for each other to confirm.
+
+        Kwargs:
+            transactions: Sequence of dicts with the keyword arguments of `transfer`:
+                          `to`, `amount`, `gas_limit`, `gas_buffer`, `gas_price`,
+                          `max_fee`, `priority_fee` and `data`.
+            required_confs: Number of confirmations to wait for each transaction.
+            concurrency: Maximum number of transactions prepared or awaited at once.
+            on_error: "raise" to stop broadcasting and raise when a transaction cannot be
+                      prepared or broadcast, or reverts. "skip" to return the exception
+                      in its place (or the reverted receipt) and continue.
+            allow_revert: Allow transactions that are expected to revert.
+            silent: Toggles console verbosity.
+
+        Returns:
+            List of TransactionReceipt objects, in the order the transactions were given
+        """
+        if on_error not in ("raise", "skip"):
+            raise ValueError("on_error must be 'raise' or 'skip'")
+        items = [dict(i) for i in transactions]
+        for item in items:
+            if unknown := set(item).difference(_BATCH_KEYS):
+                raise TypeError(f"Unexpected transaction parameters: {', '.join(sorted(unknown))}")
+        if silent is None:
+            silent = bool(CONFIG.mode == "test" or CONFIG.argv["silent"])
+        if allow_revert is None:
+            allow_revert = bool(CONFIG.network_type == "development")
+
+        def prepare(item: Dict[str, Any]) -> Dict:
+            tx = self._prepare_transaction(
+                item.get("to"),
+                item.get("amount", 0),
+                item.get("gas_limit"),
+                item.get("gas_buffer"),
+                item.get("gas_price"),
+                item.get("max_fee"),
+                item.get("priority_fee"),
+                item.get("data") or "",
+            )[0]
+            if not allow_revert:
+                self._check_for_revert(tx)
+            return tx
+
+        results: List[Any] = [None] * len(items)
+        sent: List[Tuple[int, Optional[Exception], Future]] = []
+        with ThreadPoolExecutor(concurrency) as executor:
+            prepared = [executor.submit(prepare, i) for i in items]
+            for idx, future in enumerate(prepared):
+                try:
+                    tx = future.result()
+                    txid, exc, revert_data = self._broadcast(tx, None, True, True)
+                except Exception as e:
+                    if on_error == "raise":
+                        for i in prepared[idx + 1 :]:
+                            i.cancel()
+                        raise
+                    results[idx] = e
+                    continue
+                receipt = executor.submit(
+                    self._await_mempool, tx, txid, "", required_confs, True, revert_data, True
+                )
+                sent.append((idx, exc, receipt))
+            if not silent:
+                print(f"Batch sent: {bright_blue}{len(sent)}{color} transactions")
+
+            for idx, exc, future in sent:
+                receipt = self._await_confirmation(future.result(), required_confs, None, None)
+                results[idx] = receipt
+                if receipt.status == 0 and on_error == "raise":
+                    # the node may return a txid for a reverted tx without an error
+                    receipt._raise_if_reverted(exc or _revert_error(receipt))
+
+        if rpc.is_active():
+            undo_thread = threading.Thread(
+                target=_add_batch_to_undo_buffer,
+                args=([(results[i], self.transfer, items[i]) for i, _, _ in sent],),
+                daemon=True,
+            )
+            undo_thread.start()
+
+        return results
+
     def _make_transaction(
         self,
         to: Optional["Account"],
@@ -724,11 +993,38 @@ class _PrivateKeyAccount(PublicKeyAccount):
         silent: Optional[bool],
     ) -> Tuple[TransactionReceipt, Optional[Exception]]:
         # shared logic for `transfer` and `deploy`
-        if gas_limit and gas_buffer:
-            raise ValueError("Cannot set gas_limit and gas_buffer together")
         if silent is None:
             silent = bool(CONFIG.mode == "test" or CONFIG.argv["silent"])
 
+        tx, gas_strategy, gas_iter = self._prepare_transaction(
+            to, amount, gas_limit, gas_buffer, gas_price, max_fee, priority_fee, data
+        )
+        txid, exc, revert_data = self._broadcast(tx, nonce, allow_revert, silent)
+        receipt = self._await_mempool(
+            tx, txid, fn_name, required_confs, allow_revert, revert_data, silent
+        )
+
+        receipt = self._await_confirmation(receipt, required_confs, gas_strategy, gas_iter)
+        if receipt.status != 1 and exc is None:
+            exc = _revert_error(receipt)
+
+        return receipt, exc
+
+    def _prepare_transaction(
+        self,
+        to: Optional["Account"],
+        amount: int,
+        gas_limit: Optional[int],
+        gas_buffer: Optional[float],
+        gas_price: Optional[int],
+        max_fee: Optional[int],
+        priority_fee: Optional[int],
+        data: str,
+    ) -> Tuple[Dict, Optional[GasABC], Optional[Iterator]]:
+        # returns the transaction without a nonce, the gas strategy and gas price iterator
+        if gas_limit and gas_buffer:
+            raise ValueError("Cannot set gas_limit and gas_buffer together")
+
         if gas_price is None:
             # if gas price is not explicitly set, load the default max fee and priority fee
             if max_fee is None:
@@ -756,72 +1052,86 @@ class _PrivateKeyAccount(PublicKeyAccount):
         except ValueError as e:
             raise VirtualMachineError(e) from None
 
-        with self._lock:
-            # we use a lock here to prevent nonce issues when sending many tx's at once
-            tx = {
-                "from": self.address,
-                "value": Wei(amount),
-                "nonce": nonce if nonce is not None else self._pending_nonce(),
-                "gas": web3.to_hex(gas_limit),
-                "data": HexBytes(data),
-            }
-            if to:
-                tx["to"] = to_address(str(to))
-            tx = _apply_fee_to_tx(tx, gas_price, max_fee, priority_fee)
-            txid = None
-            while True:
-                try:
-                    response = self._transact(tx, allow_revert)
-                    exc, revert_data = None, None
-                    if txid is None:
-                        txid = bytes_to_hexstring(response)
-                        if not silent:
-                            print(f"\rTransaction sent: {bright_blue}{txid}{color}")
-                except ValueError as e:
-                    if txid is None:
-                        exc = VirtualMachineError(e)
-                        if not hasattr(exc, "txid"):
-                            raise exc from None
-                        txid = exc.txid
-                        print(f"\rTransaction sent: {bright_blue}{txid}{color}")
-                        revert_data = (exc.revert_msg, exc.pc, exc.revert_type)
-                try:
-                    receipt = TransactionReceipt(
-                        txid,
-                        self,
-                        silent=silent,
-                        required_confs=required_confs,
-                        is_blocking=False,
-                        name=fn_name,
-                        revert_data=revert_data,
-                    )
-                    break
-                except (TransactionNotFound, ValueError):
-                    if not silent:
-                        sys.stdout.write(f"  Awaiting transaction in the mempool... {_marker[0]}\r")
-                        sys.stdout.flush()
-                        _marker.rotate(1)
-                    time.sleep(1)
-
-        receipt = self._await_confirmation(receipt, required_confs, gas_strategy, gas_iter)
-        if receipt.status != 1 and exc is None:
-            error_data = {
-                "message": (
-                    f"VM Exception while processing transaction: revert {receipt.revert_msg}"
-                ),
-                "code": -32000,
-                "data": {
-                    receipt.txid: {
-                        "error": "revert",
-                        "program_counter": receipt._revert_pc,
-                        "return": receipt.return_value,
-                        "reason": receipt.revert_msg,
-                    },
-                },
-            }
-            exc = VirtualMachineError(ValueError(error_data))
-
-        return receipt, exc
+        tx = {
+            "from": self.address,
+            "value": Wei(amount),
+            "gas": web3.to_hex(gas_limit),
+            "data": HexBytes(data),
+        }
+        if to:
+            tx["to"] = to_address(str(to))
+        return _apply_fee_to_tx(tx, gas_price, max_fee, priority_fee), gas_strategy, gas_iter
+
+    def _broadcast(
+        self, tx: Dict, nonce: Optional[int], allow_revert: Optional[bool], silent: bool
+    ) -> Tuple[str, Optional[VirtualMachineError], Optional[Tuple[str, int, str]]]:
+        # sets the nonce and broadcasts, returns the txid, exception and revert data
+        allocated = nonce is None
+        if allocated:
+            # nonces are allocated locally, so that many tx's can be sent at once
+            tx["nonce"] = self._nonces.allocate()
+        else:
+            tx["nonce"] = nonce
+            self._nonces.observe(nonce)  # type: ignore [arg-type]
+        retried = False
+        while True:
+            try:
+                response = self._transact(tx, allow_revert)  # type: ignore [arg-type]
+            except ValueError as e:
+                exc = VirtualMachineError(e)
+                if hasattr(exc, "txid"):
+                    print(f"\rTransaction sent: {bright_blue}{exc.txid}{color}")
+                    return exc.txid, exc, (exc.revert_msg, exc.pc, exc.revert_type)
+                if allocated and not retried and _is_nonce_error(e):
+                    # the local nonce is stale, e.g. a tx was sent from elsewhere
+                    self._nonces.reset()
+                    tx["nonce"] = self._nonces.allocate()
+                    retried = True
+                    continue
+                if allocated:
+                    self._nonces.release(tx["nonce"])
+                raise exc from None
+            except BaseException:
+                if allocated:
+                    self._nonces.release(tx["nonce"])
+                raise
+            txid = bytes_to_hexstring(response)
+            if not silent:
+                print(f"\rTransaction sent: {bright_blue}{txid}{color}")
+            return txid, None, None
+
+    def _await_mempool(
+        self,
+        tx: Dict,
+        txid: str,
+        fn_name: str,
+        required_confs: int,
+        allow_revert: Optional[bool],
+        revert_data: Optional[Tuple[str, int, str]],
+        silent: bool,
+    ) -> TransactionReceipt:
+        # returns the receipt once the node has the tx, rebroadcasting while it does not
+        while True:
+            try:
+                return TransactionReceipt(
+                    txid,
+                    self,
+                    silent=silent,
+                    required_confs=required_confs,
+                    is_blocking=False,
+                    name=fn_name,
+                    revert_data=revert_data,
+                )
+            except (TransactionNotFound, ValueError):
+                if not silent:
+                    sys.stdout.write(f"  Awaiting transaction in the mempool... {_marker[0]}\r")
+                    sys.stdout.flush()
+                    _marker.rotate(1)
+                time.sleep(1)
+            try:
+                self._transact(tx, allow_revert)  # type: ignore [arg-type]
+            except ValueError:
+                pass
 
     def _await_confirmation(
         self,
@@ -843,7 +1153,7 @@ class _PrivateKeyAccount(PublicKeyAccount):
             return receipt
 
         try:
-            receipt._confirmed.wait()
+            receipt._wait_for_confirmation(receipt._confirmed, required_confs)
         except KeyboardInterrupt as exc:
             # set related transactions as silent
             receipt._silent = True
@@ -862,6 +1172,7 @@ class _PrivateKeyAccount(PublicKeyAccount):
         )
         while True:
             if not replacements:
+                self._nonces.reset()
                 raise TransactionError(f"Tx dropped without known replacement: {receipt.txid}")
             if len(replacements) > 1:
                 # in case we have multiple tx's where the status is still unresolved
@@ -869,7 +1180,9 @@ class _PrivateKeyAccount(PublicKeyAccount):
                 time.sleep(0.5)
             else:
                 receipt = replacements[0]
-                receipt._await_confirmation(required_confs=required_confs)
+                receipt._wait_for_confirmation(
+                    confirmation_tracker.wait_for(receipt, required_confs), required_confs
+                )
                 return receipt
 
 
@@ -1045,6 +1358,37 @@ class ClefAccount(_PrivateKeyAccount):
         return web3.eth.send_raw_transaction(response["result"]["raw"])
 
 
+def _add_batch_to_undo_buffer(entries: List[Tuple[TransactionReceipt, Callable, Dict]]) -> None:
+    chain = Chain()
+    for receipt, fn, kwargs in entries:
+        chain._add_to_undo_buffer(receipt, fn, (), kwargs)
+
+
+def _revert_error(receipt: TransactionReceipt) -> VirtualMachineError:
+    # builds the exception for a reverted tx from its receipt, when broadcasting it
+    # did not raise
+    error_data = {
+        "message": f"VM Exception while processing transaction: revert {receipt.revert_msg}",
+        "code": -32000,
+        "data": {
+            receipt.txid: {
+                "error": "revert",
+                "program_counter": receipt._revert_pc,
+                "return": receipt.return_value,
+                "reason": receipt.revert_msg,
+            },
+        },
+    }
+    return VirtualMachineError(ValueError(error_data))
+
+
+def _is_nonce_error(exc: ValueError) -> bool:
+    # checks if a node rejected a transaction because the nonce was already used
+    data = exc.args[0] if exc.args else None
+    message = str(data.get("message", "") if isinstance(data, dict) else exc).lower()
+    return "nonce too low" in message or "correct nonce" in message
+
+
 def _apply_fee_to_tx(
     tx: Dict,
     gas_price: Optional[int] = None,
@@ -0,0 +1,359 @@
+#!/usr/bin/python3
+
+import sys
+import threading
+import time
+from queue import Empty
+from typing import TYPE_CHECKING, Dict, Final, List, Optional, Tuple
+
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
+from web3.exceptions import MethodUnavailable, TransactionNotFound
+
+from brownie._c_constants import HexBytes
+from brownie._singleton import _Singleton
+from brownie.utils import color
+from brownie.utils._color import bright_yellow, red
+
+from .head import Block, Reorg, head_tracker
+from .web3 import web3
+
+if TYPE_CHECKING:
+    from .transaction import TransactionReceipt
+
+# maximum delay between checks for a new block while transactions are pending, in seconds
+POLL_INTERVAL: Final = 1.0
+# delay without a new block after which every pending receipt is queried directly, in seconds
+FALLBACK_INTERVAL = 15.0
+
+
+class _Entry:
+    """A receipt watched by the confirmation tracker."""
+
+    def __init__(self, receipt: "TransactionReceipt", required_confs: Optional[int]) -> None:
+        self.receipt: Final = receipt
+        # the receipt is finalized once it has this many confirmations, None if it
+        # was already finalized when the entry was created
+        self.required_confs = required_confs
+        # (confirmations, event) pairs of callers waiting on this receipt
+        self.waiters: List[Tuple[int, threading.Event]] = []
+        # the number and hash of the block including the transaction, and its receipt
+        self.block_number: Optional[int] = None
+        self.block_hash: Optional[bytes] = None
+        self.data: Optional[AttributeDict] = None
+        # set once the receipt was checked against a block, or queried directly
+        self.checked = False
+        # last number of confirmations written to the console
+        self.shown = 0
+
+    def set_mined(self, data: AttributeDict) -> None:
+        self.block_number = data["blockNumber"]
+        self.block_hash = bytes(HexBytes(data["blockHash"]))
+        self.data = data
+
+    @property
+    def target(self) -> int:
+        # number of confirmations required before the entry can be discarded
+        confs = [i[0] for i in self.waiters]
+        if self.required_confs is not None:
+            confs.append(max(self.required_confs, 1))
+        return max(confs, default=0)
+
+
+class ConfirmationTracker(metaclass=_Singleton):
+    """
+    Tracks the confirmation of every pending transaction receipt from one thread.
+
+    The tracker wakes on each new block from the head tracker. Transactions included
+    in the block are found from its transaction hashes, and their receipts are queried
+    together with `eth_getBlockReceipts` where the client supports it. For pending
+    transactions that were not included, the nonce of each sender is checked once per
+    block: if the nonce was used without a receipt for the transaction, it was dropped
+    or replaced. The receipt of a newly tracked transaction is queried once, in case it
+    was included in a block that was already processed. If no new block arrives within
+    `FALLBACK_INTERVAL`, the receipt of each pending transaction is queried directly.
+    Confirmations are counted from the block number, and a transaction in a block
+    orphaned by a reorg is returned to pending.
+    """
+
+    def __init__(self) -> None:
+        self._lock: Final = threading.Lock()
+        self._entries: Final[Dict[bytes, _Entry]] = {}
+        self._thread: Optional[threading.Thread] = None
+        # does the client support `eth_getBlockReceipts`? None until it was tried
+        self._block_receipts: Optional[bool] = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def track(
+        self,
+        receipt: "TransactionReceipt",
+        required_confs: int,
+        data: Optional[AttributeDict] = None,
+    ) -> None:
+        """
+        Finalizes `receipt` once it has `required_confs` confirmations, or marks it as
+        dropped. `receipt._confirmed` is set in either case.
+
+        Args:
+            receipt: Pending transaction receipt.
+            required_confs: Confirmations required before finalizing the receipt.
+            data: Transaction receipt from the node, if the transaction was mined.
+        """
+        with self._lock:
+            entry = self._entries.get(_key(receipt.txid))
+            if entry is None:
+                entry = self._add(receipt, required_confs)
+            elif entry.required_confs is None:
+                entry.required_confs = required_confs
+            if data is not None:
+                entry.set_mined(data)
+                entry.checked = True
+
+    def wait_for(self, receipt: "TransactionReceipt", required_confs: int) -> threading.Event:
+        """
+        Returns an event which is set once `receipt` has `required_confs` confirmations,
+        or was dropped.
+        """
+        event = threading.Event()
+        if receipt.status == -2 or (
+            receipt.status >= 0 and receipt.confirmations >= required_confs
+        ):
+            event.set()
+            return event
+        with self._lock:
+            entry = self._entries.get(_key(receipt.txid))
+            if entry is None:
+                if receipt.status == -1:
+                    entry = self._add(receipt, required_confs)
+                else:
+                    entry = self._add(receipt, None)
+                    entry.block_number = receipt.block_number
+                    entry.checked = True
+            entry.waiters.append((required_confs, event))
+        return event
+
+    def _add(self, receipt: "TransactionReceipt", required_confs: Optional[int]) -> _Entry:
+        # must be called while holding the lock
+        entry = _Entry(receipt, required_confs)
+        self._entries[_key(receipt.txid)] = entry
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+        return entry
+
+    def _loop(self) -> None:
+        try:
+            with head_tracker.subscribe(POLL_INTERVAL) as subscription:
+                last_checked = time.monotonic()
+                while True:
+                    with self._lock:
+                        if not self._entries:
+                            self._thread = None
+                            return
+                    try:
+                        event = subscription.get(timeout=POLL_INTERVAL)
+                    except Empty:
+                        if time.monotonic() - last_checked >= FALLBACK_INTERVAL:
+                            self._check_pending()
+                            last_checked = time.monotonic()
+                        else:
+                            self._check_unchecked()
+                        continue
+                    last_checked = time.monotonic()
+                    if isinstance(event, Reorg):
+                        self._reorg(event)
+                    else:
+                        self._process_block(event)
+        except Exception as exc:
+            self._fail(exc)
+
+    def _process_block(self, block: Block) -> None:
+        entries = self._snapshot()
+        pending = [i for i in entries if i.block_number is None]
+        hashes = {bytes(HexBytes(i)) for i in block.get("transactions", [])}
+        included = [i for i in pending if _key(i.receipt.txid) in hashes]
+        if included:
+            for entry, data in zip(included, self._get_receipts(block["number"], included)):
+                if data is not None:
+                    self._mined(entry, data)
+
+        self._check_nonces([i for i in pending if i.block_number is None])
+        for entry in entries:
+            entry.checked = True
+        self._update(entries, block["number"])
+
+    def _check_unchecked(self) -> None:
+        # a transaction may have been included in a block that was processed before
+        # its receipt was registered, so the receipt of each new entry is queried once
+        entries = self._snapshot()
+        unchecked = [i for i in entries if not i.checked]
+        if not unchecked:
+            return
+        self._query_receipts(unchecked)
+        self._update(entries, web3.eth.block_number)
+
+    def _check_pending(self) -> None:
+        # no new block arrived within the fallback interval. the receipt of each pending
+        # transaction is queried directly, so that confirmations do not rely on the head
+        # tracker delivering every block. dropped transactions are only detected from
+        # the nonces checked on each new block.
+        entries = self._snapshot()
+        if not entries:
+            return
+        self._query_receipts(entries)
+        self._update(entries, web3.eth.block_number)
+
+    def _query_receipts(self, entries: List[_Entry]) -> None:
+        for entry in entries:
+            if entry.block_number is None and entry.receipt.status != -2:
+                data = _get_receipt(entry.receipt.txid)
+                if data is not None:
+                    self._mined(entry, data)
+            entry.checked = True
+
+    def _check_nonces(self, pending: List[_Entry]) -> None:
+        # the nonce is queried before the receipt. in the other order, the transaction
+        # could confirm after the receipt was checked but before the nonce was queried
+        nonces: Dict[str, int] = {}
+        for entry in pending:
+            receipt = entry.receipt
+            if receipt.status == -2:
+                continue
+            sender = str(receipt.sender)
+            if sender not in nonces:
+                nonces[sender] = web3.eth.get_transaction_count(sender)
+            if nonces[sender] > receipt.nonce:  # type: ignore [operator]
+                data = _get_receipt(receipt.txid)
+                if data is None:
+                    self._dropped(entry)
+                else:
+                    self._mined(entry, data)
+
+    def _get_receipts(self, number: int, entries: List[_Entry]) -> List[Optional[AttributeDict]]:
+        if len(entries) > 1 and self._block_receipts is not False:
+            try:
+                result = web3.manager.request_blocking("eth_getBlockReceipts", [hex(number)])
+            except (ValueError, MethodUnavailable):
+                self._block_receipts = False
+            else:
+                self._block_receipts = True
+                receipts = {}
+                for data in result or []:
+                    data = AttributeDict.recursive(receipt_formatter(data))
+                    receipts[bytes(HexBytes(data["transactionHash"]))] = data
+                return [receipts.get(_key(i.receipt.txid)) for i in entries]
+        return [_get_receipt(i.receipt.txid) for i in entries]
+
+    def _mined(self, entry: _Entry, data: AttributeDict) -> None:
+        entry.set_mined(data)
+        receipt = entry.receipt
+        if receipt.status != -1:
+            return
+        receipt.block_number = data["blockNumber"]
+        from .state import TxHistory
+
+        # silence other dropped tx's immediately after confirmation to avoid output weirdness
+        for dropped_tx in TxHistory().filter(
+            sender=receipt.sender, nonce=receipt.nonce, key=lambda k: k != receipt
+        ):
+            dropped_tx._silent = True
+
+    def _dropped(self, entry: _Entry) -> None:
+        receipt = entry.receipt
+        if receipt.status == -1:
+            receipt._set_status(-2)
+        receipt._confirmed.set()
+        for _, event in entry.waiters:
+            event.set()
+        self._remove(entry)
+
+    def _reorg(self, reorg: Reorg) -> None:
+        orphaned = {bytes(HexBytes(i["hash"])) for i in reorg.orphaned}
+        for entry in self._snapshot():
+            if entry.block_hash not in orphaned:
+                continue
+            entry.block_number = None
+            entry.block_hash = None
+            entry.data = None
+            entry.shown = 0
+            receipt = entry.receipt
+            if receipt.status == -1:
+                receipt.block_number = None
+            if not receipt._silent:
+                sys.stdout.write(f"\r{red}Transaction was lost...{color}{' ' * 8}")
+                sys.stdout.flush()
+
+    def _update(self, entries: List[_Entry], height: int) -> None:
+        for entry in entries:
+            receipt = entry.receipt
+            if receipt.status == -2:
+                # dropped because another transaction with the same nonce confirmed
+                self._dropped(entry)
+                continue
+            if entry.block_number is None:
+                continue
+
+            confirmations = height - entry.block_number + 1
+            target = entry.target
+            if target > 1 and not receipt._silent and confirmations != entry.shown:
+                entry.shown = confirmations
+                sys.stdout.write(
+                    f"\rRequired confirmations: {bright_yellow}{min(confirmations, target)}/"
+                    f"{target}{color}  "
+                )
+                if confirmations >= target:
+                    sys.stdout.write("\n")
+                sys.stdout.flush()
+
+            if entry.required_confs is not None and confirmations >= max(entry.required_confs, 1):
+                receipt._confirm(entry.data, entry.required_confs)  # type: ignore [arg-type]
+                entry.required_confs = None
+            for waiter in [i for i in entry.waiters if confirmations >= i[0]]:
+                waiter[1].set()
+                entry.waiters.remove(waiter)
+            if entry.required_confs is None and not entry.waiters:
+                self._remove(entry)
+
+    def _fail(self, exc: Exception) -> None:
+        # the receipts can no longer be confirmed, the exception is raised to the waiters
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            self._thread = None
+        for entry in entries:
+            entry.receipt._confirm_exc = exc
+            entry.receipt._confirmed.set()
+            for _, event in entry.waiters:
+                event.set()
+
+    def _snapshot(self) -> List[_Entry]:
+        with self._lock:
+            return list(self._entries.values())
+
+    def _remove(self, entry: _Entry) -> None:
+        with self._lock:
+            key = _key(entry.receipt.txid)
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+
+
+def _key(txid: str) -> bytes:
+    return bytes(HexBytes(txid))
+
+
+def _get_receipt(txid: str) -> Optional[AttributeDict]:
+    try:
+        receipt = web3.eth.get_transaction_receipt(HexBytes(txid))
+    except TransactionNotFound:
+        return None
+    # the null blockHash check is required for older versions of Parity
+    # taken from `web3._utils.transactions.wait_for_transaction_receipt`
+    if receipt["blockHash"] is None:
+        return None
+    return receipt  # type: ignore [return-value]
+
+
+confirmation_tracker: Final = ConfirmationTracker()
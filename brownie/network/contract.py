@@ -3,14 +3,19 @@
 import asyncio
 import io
 import os
+import threading
 import time
 import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import cached_property
 from pathlib import Path
 from textwrap import TextWrapper
-from threading import get_ident  # noqa
 from typing import (
     TYPE_CHECKING,
     Any,
+    AsyncIterator,
     Callable,
     Coroutine,
     Dict,
@@ -19,6 +24,7 @@ from typing import (
     List,
     Match,
     Optional,
+    Sequence,
     Set,
     Tuple,
     Union,
@@ -29,6 +35,8 @@ import solcx
 from eth_typing import ABIConstructor, ABIElement, ABIFunction, ChecksumAddress, HexAddress, HexStr
 from faster_eth_abi import decode as decode_abi
 from faster_eth_abi import encode as encode_abi
+from faster_eth_abi.decoding import ContextFramesBytesIO
+from faster_eth_abi.registry import registry as abi_registry
 from faster_eth_utils import combomethod
 from vvm import get_installable_vyper_versions
 from vvm.utils.convert import to_vyper_version
@@ -39,15 +47,22 @@ from web3.types import LogReceipt
 from brownie._c_constants import (
     HexBytes,
     Version,
+    deepcopy,
     regex_findall,
     ujson_dump,
     ujson_dumps,
     ujson_load,
     ujson_loads,
 )
-from brownie._config import BROWNIE_FOLDER, CONFIG, REQUEST_HEADERS, _load_project_compiler_config
-from brownie.convert.datatypes import Wei
-from brownie.convert.normalize import format_input, format_output
+from brownie._config import (
+    BROWNIE_FOLDER,
+    CONFIG,
+    REQUEST_HEADERS,
+    _get_data_folder,
+    _load_project_compiler_config,
+)
+from brownie.convert.datatypes import ReturnValue, Wei
+from brownie.convert.normalize import format_input, get_input_formatter, get_output_formatter
 from brownie.convert.utils import (
     build_function_selector,
     build_function_signature,
@@ -75,20 +90,18 @@ from brownie.typing import (
     TransactionReceiptType,
 )
 from brownie.utils import color, hexbytes_to_hexstring
-from brownie.utils._color import (
-    bright_blue,
-    bright_green,
-    bright_magenta,
-    bright_red,
-)
+from brownie.utils._color import bright_blue, bright_green, bright_magenta, bright_red
+from brownie.utils.sql import Cursor
 
-from . import accounts, chain
-from .event import _add_deployment_topics, _get_topics, event_watcher
+from . import accounts, chain, logs
+from .event import _add_deployment_topics, _get_topic_map, event_watcher
 from .state import (
+    _active_multicall,
     _add_contract,
     _add_deployment,
     _find_contract,
     _get_deployment,
+    _get_deployments,
     _remove_contract,
     _remove_deployment,
     _revert_register,
@@ -102,6 +115,86 @@ AnyContractMethod = Union["ContractCall", "ContractTx", "OverloadedMethod"]
 
 _unverified_addresses: Final[Set[ChecksumAddress]] = set()
 
+# maximum number of contract templates kept in memory
+TEMPLATE_CACHE_SIZE: Final = 256
+
+# default block explorer API, used when the `explorer.url` setting is not given
+EXPLORER_URL: Final = "https://api.etherscan.io/v2/api"
+# maximum number of contracts compiled from explorer sources kept in memory
+EXPLORER_BUILD_CACHE_SIZE: Final = 32
+
+
+class _ContractTemplate:
+    """
+    Data derived from a contract ABI, shared by all contract objects with that ABI.
+
+    Contract objects create their methods from the template on first access, so the
+    cost of creating an object does not depend on the size of its ABI.
+    """
+
+    def __init__(self, abi: List[ABIElement]) -> None:
+        self.abi: Final = abi
+        self.topic_map: Final = _get_topic_map(abi)
+        self.topics: Final = {v["name"]: k for k, v in self.topic_map.items()}
+        fn_abis: List[ABIFunction] = [
+            i for i in abi if i["type"] == "function"  # type: ignore [misc]
+        ]
+        self.selectors: Final[Dict[Selector, FunctionName]] = {
+            build_function_selector(i): FunctionName(i["name"]) for i in fn_abis
+        }
+        # this isn't fully accurate because of overloaded methods - will be removed in `v2.0.0`
+        self.signatures: Final[Dict[FunctionName, Selector]] = {
+            v: k for k, v in self.selectors.items()
+        }
+        # ABIs of the functions sharing each name, in ABI order
+        self.functions: Final[Dict[str, List[ABIFunction]]] = {}
+        for abi_fn in fn_abis:
+            self.functions.setdefault(abi_fn["name"], []).append(abi_fn)
+        self._hidden: Final[Dict[type, Tuple[str, ...]]] = {}
+        parse_errors_from_abi(abi)
+
+    def hidden(self, contract: "_DeployedContractBase") -> Tuple[str, ...]:
+        """Returns the names of functions that collide with members of a contract object."""
+        cls = type(contract)
+        hidden = self._hidden.get(cls)
+        if hidden is None:
+            # the members of an object are the same for every object of the same class
+            attrs = object.__getattribute__(contract, "__dict__")
+            hidden = self._hidden[cls] = tuple(
+                i for i in self.functions if i == "events" or i in attrs or hasattr(cls, i)
+            )
+        return hidden
+
+
+_templates: Final["OrderedDict[str, _ContractTemplate]"] = OrderedDict()
+_templates_by_id: Final["OrderedDict[int, Tuple[List[ABIElement], _ContractTemplate]]"] = (
+    OrderedDict()
+)
+_templates_lock: Final = threading.Lock()
+
+
+def _get_template(abi: List[ABIElement]) -> _ContractTemplate:
+    # the ABI is matched by identity first, and then by content
+    with _templates_lock:
+        cached = _templates_by_id.get(id(abi))
+        if cached is not None and cached[0] is abi:
+            _templates_by_id.move_to_end(id(abi))
+            return cached[1]
+        key = ujson_dumps(abi)
+        template = _templates.get(key)
+        if template is None:
+            template = _ContractTemplate(abi)
+            _templates[key] = template
+            if len(_templates) > TEMPLATE_CACHE_SIZE:
+                _templates.popitem(last=False)
+        else:
+            _templates.move_to_end(key)
+        # the ABI is kept with its template, so that its id is not reused
+        _templates_by_id[id(abi)] = (abi, template)
+        if len(_templates_by_id) > TEMPLATE_CACHE_SIZE:
+            _templates_by_id.popitem(last=False)
+        return template
+
 
 class _ContractBase:
     _dir_color: Final = "bright magenta"
@@ -116,18 +209,11 @@ class _ContractBase:
         self._build: Final = build.copy()
         self._sources: Final = sources
 
-        abi = self.abi
-        self.topics: Final = _get_topics(abi)
-        self.selectors: Final[Dict[Selector, FunctionName]] = {
-            build_function_selector(i): FunctionName(i["name"])
-            for i in abi
-            if i["type"] == "function"
-        }
-        # this isn't fully accurate because of overloaded methods - will be removed in `v2.0.0`
-        self.signatures: Final[Dict[FunctionName, Selector]] = {
-            v: k for k, v in self.selectors.items()
-        }
-        parse_errors_from_abi(abi)
+        # topics, selectors and signatures are shared by objects with the same ABI
+        self._template: Final = _get_template(self.abi)
+        self.topics: Final = self._template.topics
+        self.selectors: Final = self._template.selectors
+        self.signatures: Final = self._template.signatures
 
     @property
     def abi(self) -> List[ABIElement]:
@@ -715,7 +801,7 @@ class _DeployedContractBase(_ContractBase):
     """Methods for interacting with a deployed contract.
 
     Each public contract method is available as a ContractCall or ContractTx
-    instance, created when this class is instantiated.
+    instance, created from the contract template on first access.
 
     Attributes:
         bytecode: Bytecode of the deployed contract, including constructor args.
@@ -741,34 +827,31 @@ class _DeployedContractBase(_ContractBase):
         self._owner: Final = owner
         self.tx: Final = tx
         self.address: Final = address
-        self.events = ContractEvents(self)
-        _add_deployment_topics(address, self.abi)
+        _add_deployment_topics(address, self._template.topic_map)
 
-        fn_abis = [abi for abi in self.abi if abi["type"] == "function"]
-        fn_names = [abi["name"] for abi in fn_abis]
-
-        contract_name = self._name
-        contract_natspec: dict = self._build.get("natspec") or {}
-        methods_natspec: dict = contract_natspec.get("methods") or {}
-        for abi, abi_name in zip(fn_abis, fn_names):
-            name = f"{contract_name}.{abi_name}"
-            sig = build_function_signature(abi)
-            natspec = methods_natspec.get(sig, {})
-
-            if fn_names.count(abi_name) == 1:
-                fn = _get_method_object(address, abi, name, owner, natspec)
-                self._check_and_set(abi_name, fn)
-                continue
-
-            # special logic to handle function overloading
-            if not hasattr(self, abi_name):
-                overloaded = OverloadedMethod(address, name, owner)
-                self._check_and_set(abi_name, overloaded)
-            getattr(self, abi_name)._add_fn(abi, natspec)
+        # functions colliding with a member are handled now, others are created on first access
+        for name in self._template.hidden(self):
+            self._check_and_set(name)
 
         self._initialized = True
 
-    def _check_and_set(self, name: str, obj: Any) -> None:
+    def _get_method(self, name: str) -> AnyContractMethod:
+        abis = self._template.functions[name]
+        contract_natspec: dict = self._build.get("natspec") or {}
+        methods_natspec: dict = contract_natspec.get("methods") or {}
+        full_name = f"{self._name}.{name}"
+        if len(abis) == 1:
+            natspec = methods_natspec.get(build_function_signature(abis[0]), {})
+            return _get_method_object(self.address, abis[0], full_name, self._owner, natspec)
+
+        # special logic to handle function overloading
+        overloaded = OverloadedMethod(self.address, full_name, self._owner)
+        for abi in abis:
+            overloaded._add_fn(abi, methods_natspec.get(build_function_signature(abi), {}))
+        return overloaded
+
+    def _check_and_set(self, name: str) -> None:
+        # handles a function with the same name as a member of the object
         if name == "balance":
             warnings.warn(
                 f"'{self._name}' defines a 'balance' function, "
@@ -776,15 +859,14 @@ class _DeployedContractBase(_ContractBase):
                 BrownieEnvironmentWarning,
             )
             setattr(self, "wei_balance", self.balance)
-        elif hasattr(self, name):
-            warnings.warn(
-                "Namespace collision between contract function and "
-                f"brownie `Contract` class member: '{self._name}.{name}'\n"
-                f"The {name} function will not be available when interacting with {self._name}",
-                BrownieEnvironmentWarning,
-            )
+            setattr(self, name, self._get_method(name))
             return
-        setattr(self, name, obj)
+        warnings.warn(
+            "Namespace collision between contract function and "
+            f"brownie `Contract` class member: '{self._name}.{name}'\n"
+            f"The {name} function will not be available when interacting with {self._name}",
+            BrownieEnvironmentWarning,
+        )
 
     def __hash__(self) -> int:
         return hash(f"{self._name}{self.address}{self._project}")
@@ -817,6 +899,25 @@ class _DeployedContractBase(_ContractBase):
         except AttributeError:
             raise AttributeError(f"Contract '{self._name}' object has no attribute '{name}'")
 
+    def __getattr__(self, name: str) -> Any:
+        # only called when `name` is not set: creates events and methods on first access
+        attrs = object.__getattribute__(self, "__dict__")
+        template = attrs.get("_template")
+        if template is not None:
+            if name == "events":
+                return attrs.setdefault(name, ContractEvents(self))
+            if name in template.functions and name not in template.hidden(self):
+                return attrs.setdefault(name, self._get_method(name))
+            raise AttributeError(f"Contract '{self._name}' object has no attribute '{name}'")
+        # the object is not initialized, e.g. while it is copied
+        raise AttributeError(name)
+
+    def __dir__(self) -> List[str]:
+        template = self._template
+        hidden = template.hidden(self)
+        names = {i for i in template.functions if i not in hidden}
+        return sorted(set(super().__dir__()) | names | {"events"})
+
     def __setattr__(self, name: str, value: Any) -> None:
         if self._initialized and isinstance(getattr(self, name, None), _ContractMethod):
             raise AttributeError(
@@ -838,6 +939,8 @@ class _DeployedContractBase(_ContractBase):
 
     def balance(self) -> Wei:
         """Returns the current ether balance of the contract, in wei."""
+        if multicall := _active_multicall.get():
+            return multicall._get_eth_balance(self.address)
         balance = web3.eth.get_balance(self.address)
         return Wei(balance)
 
@@ -955,6 +1058,43 @@ class Contract(_DeployedContractBase):
         _ContractBase.__init__(self, None, build, {})
         _DeployedContractBase.__init__(self, address, owner, None)
 
+    @classmethod
+    def many(
+        cls,
+        addresses_or_aliases: Sequence[HexAddress | ContractName],
+        owner: Optional[AccountsType] = None,
+    ) -> List["Contract"]:
+        """
+        Recreate many `Contract` objects from the local database at once.
+
+        The deployments are read with a few bulk queries, which is much faster
+        than creating each object individually when loading many contracts.
+
+        Arguments
+        ---------
+        addresses_or_aliases : Sequence[str]
+            Addresses or user-defined aliases of the deployments.
+        owner : Account, optional
+            Contract owner. If set, transactions without a `from` field
+            will be performed using this account.
+
+        Returns
+        -------
+        List of `Contract` objects, in the same order as `addresses_or_aliases`.
+        """
+        values = [i.strip() for i in addresses_or_aliases]
+        contracts = []
+        for value, (build, sources) in zip(values, _get_deployments(values)):
+            if build is None or sources is None:
+                # not stored locally, fall back to the explorer if it is enabled
+                contracts.append(cls(value, owner=owner))
+                continue
+            self = cls.__new__(cls)
+            _ContractBase.__init__(self, None, build, sources)
+            _DeployedContractBase.__init__(self, build["address"], owner)
+            contracts.append(self)
+        return contracts
+
     @classmethod
     def from_abi(
         cls,
@@ -1125,40 +1265,9 @@ class Contract(_DeployedContractBase):
 
         source_str = "\n".join(data["result"][0]["SourceCode"].splitlines())
         try:
-            if source_str.startswith("{{"):
-                # source was verified using compiler standard JSON
-                input_json = ujson_loads(source_str[1:-1])
-                sources = {k: v["content"] for k, v in input_json["sources"].items()}
-                evm_version = input_json["settings"].get("evmVersion", evm_version)
-                remappings = input_json["settings"].get("remappings", [])
-
-                compiler.set_solc_version(str(version))
-                input_json.update(
-                    compiler.generate_input_json(
-                        sources, optimizer=optimizer, evm_version=evm_version, remappings=remappings
-                    )
-                )
-                output_json = compiler.compile_from_input_json(input_json)
-                build_json = compiler.generate_build_json(input_json, output_json)
-            else:
-                if source_str.startswith("{"):
-                    # source was submitted as multiple files
-                    sources = {k: v["content"] for k, v in ujson_loads(source_str).items()}
-                else:
-                    # source was submitted as a single file
-                    if compiler_str.startswith("vyper"):
-                        path_str = f"{name}.vy"
-                    else:
-                        path_str = f"{name}-flattened.sol"
-                    sources = {path_str: source_str}
-
-                build_json = compiler.compile_and_format(
-                    sources,
-                    solc_version=str(version),
-                    vyper_version=str(version),
-                    optimizer=optimizer,
-                    evm_version=evm_version,
-                )
+            build_json, sources = _compile_explorer_source(
+                name, compiler_str, version, optimizer, evm_version, source_str
+            )
         except Exception as e:
             if not silent:
                 warnings.warn(
@@ -1168,7 +1277,8 @@ class Contract(_DeployedContractBase):
                 )
             return cls.from_abi(name, address, abi, owner)
 
-        build_json = build_json[name]
+        # the build is shared by contracts compiled from the same source
+        build_json = deepcopy(build_json[name])
         if as_proxy_for is not None:
             build_json.update(abi=abi, natspec=implementation_contract._build.get("natspec"))
 
@@ -1189,6 +1299,51 @@ class Contract(_DeployedContractBase):
             _add_deployment(self)
         return self
 
+    @classmethod
+    def from_explorer_many(
+        cls,
+        addresses: Sequence[HexAddress],
+        owner: Optional[AccountsType] = None,
+        silent: bool = False,
+        persist: bool = True,
+    ) -> List["Contract"]:
+        """
+        Create many `Contract` objects with source code queried from a block explorer.
+
+        The explorer responses are fetched concurrently, using up to
+        `explorer.max_workers` threads within the `explorer.requests_per_second`
+        rate limit. The contracts are then created in order. Contracts which share
+        the same verified source are compiled once.
+
+        Arguments
+        ---------
+        addresses : Sequence[str]
+            Addresses where the contracts are deployed.
+        owner : Account, optional
+            Contract owner. If set, transactions without a `from` field will be
+            performed using this account.
+
+        Returns
+        -------
+        List of `Contract` objects, in the same order as `addresses`.
+        """
+        resolved = [_resolve_address(i) for i in addresses]
+        unique = list(dict.fromkeys(resolved))
+        if not silent:
+            if os.getenv("ETHERSCAN_TOKEN") is None:
+                _warn_explorer_token()
+            print(
+                f"Fetching source of {bright_blue}{len(unique)}{color} contracts from Etherscan..."
+            )
+        max_workers = _explorer_settings().get("max_workers") or 1
+        with _explorer_cache.hold():
+            with ThreadPoolExecutor(max_workers) as executor:
+                list(executor.map(_prefetch_from_explorer, unique))
+            contracts = {
+                i: cls.from_explorer(i, owner=owner, silent=silent, persist=persist) for i in unique
+            }
+        return [contracts[i] for i in resolved]
+
     @classmethod
     def get_solc_version(cls, compiler_str: str, address: str) -> Version:
         """
@@ -1340,13 +1495,42 @@ class ContractEvents(_ContractEvents):
             if isinstance(event_type, str):
                 # If 'event_type' is a string, search for an event with a name matching it.
                 event_type: ContractEvent = self.__getitem__(event_type)
-            return self._retrieve_contract_events(event_type, from_block, to_block)
+            return self._get_event_sequences([event_type], from_block, to_block)[
+                event_type.event_name
+            ]
 
         return AttributeDict(
-            (event.event_name, self._retrieve_contract_events(event, from_block, to_block))
-            for event in ContractEvents.__iter__(self)
+            self._get_event_sequences(list(ContractEvents.__iter__(self)), from_block, to_block)
         )
 
+    def _get_event_sequences(
+        self, event_types: List[ContractEvent], from_block: int, to_block: int
+    ) -> Dict[str, List[AttributeDict]]:
+        """
+        Retrieves the logs of several event types between 'from_block' and 'to_block'.
+
+        All non-anonymous events are fetched together, with a single `eth_getLogs`
+        request per block range, and decoded according to their topic. When the range
+        is covered by the local event index the logs are read from it instead. Anonymous
+        events cannot be matched by topic and are retrieved individually.
+        """
+        abis = [event._get_event_abi() for event in event_types]
+        topic_abis = [abi for abi in abis if not abi.get("anonymous")]
+        sequences: Dict[str, List[AttributeDict]] = {}
+        if topic_abis:
+            topics = [logs.get_topic(abi) for abi in topic_abis]
+            if logs.event_index.covers(self.address, from_block, to_block):
+                raw_logs = logs.event_index.get_logs(self.address, topics, from_block, to_block)
+            else:
+                raw_logs = logs.get_logs(self.address, topics, from_block, to_block)
+            sequences.update(logs.decode_logs(raw_logs, topic_abis))
+        for event, abi in zip(event_types, abis):
+            if abi.get("anonymous"):
+                sequences[event.event_name] = self._retrieve_contract_events(
+                    event, from_block, to_block
+                )
+        return {event.event_name: sequences[event.event_name] for event in event_types}
+
     def listen(self, event_name: str, timeout: float = 0) -> Coroutine:
         """
         Creates a listening Coroutine object ending whenever an event matching
@@ -1367,37 +1551,75 @@ class ContractEvents(_ContractEvents):
         Returns:
             Coroutine: Awaitable object listening for the event matching 'event_name'.
         """
-        _triggered: bool = False
-        _received_data: Union[AttributeDict, None] = None
+        # validate the event name and fix the starting block before the coroutine is awaited
+        self.__getitem__(event_name)
+        from_block = web3.eth.block_number + 1
+        end_time = time.time() + timeout
 
-        def _event_callback(event_data: AttributeDict) -> None:
-            """
-            Fills the nonlocal variable '_received_data' with the received
-            argument 'event_data' and sets the nonlocal '_triggered' variable to True
-            """
-            nonlocal _triggered, _received_data
-            _received_data = event_data
-            _triggered = True
+        async def _listening_task() -> AttributeDict:
+            """Generates and returns a coroutine listening for an event"""
+            stream = self.stream(event_name, from_block=from_block, delay=0.2)
+            try:
+                if timeout > 0:
+                    wait_time = max(end_time - time.time(), 0)
+                    event_data = await asyncio.wait_for(stream.__anext__(), wait_time)
+                else:
+                    event_data = await stream.__anext__()
+            except asyncio.TimeoutError:
+                return AttributeDict({"event_data": None, "timed_out": True})
+            finally:
+                await stream.aclose()
+            return AttributeDict({"event_data": event_data, "timed_out": False})
 
-        _listener_end_time = time.time() + timeout
+        return _listening_task()
 
-        async def _listening_task(is_timeout: bool, end_time: float) -> AttributeDict:
-            """Generates and returns a coroutine listening for an event"""
-            nonlocal _triggered, _received_data
-            timed_out: bool = False
+    async def stream(
+        self,
+        event_name: str,
+        from_block: Optional[int] = None,
+        delay: float = 2.0,
+        buffer_size: int = logs.DEFAULT_STREAM_BUFFER,
+    ) -> AsyncIterator[AttributeDict]:
+        """
+        Asynchronous generator yielding each occurrence of the event matching
+        'event_name', in the order the events occurred.
 
-            while not _triggered:
-                if is_timeout and end_time <= time.time():
-                    timed_out = True
-                    break
-                await asyncio.sleep(0.05)
-            return AttributeDict({"event_data": _received_data, "timed_out": timed_out})
+        Streams do not use threads or filters. Every stream within an event loop
+        is served by a single log poller, which fetches new logs for all of them
+        with one eth_getLogs request per poll. Logs are fetched at most
+        'buffer_size' events ahead of the consumer.
 
-        target_event: ContractEvent = self.__getitem__(event_name)
-        event_watcher.add_event_callback(
-            event=target_event, callback=_event_callback, delay=0.2, repeat=False
+        Args:
+            event_name (str): Name of the event to be streamed.
+            from_block (int, optional): The block from which to stream events. If not
+            specified, only events in blocks mined after the stream starts are yielded.
+            Defaults to None.
+            delay (float, optional): Delay between each check for new events. Defaults to 2.0.
+            buffer_size (int, optional): Maximum number of events fetched ahead of the
+            consumer. Defaults to 256.
+
+        Yields:
+            AttributeDict: The event log receipt of each occurrence.
+        """
+        abi = self.__getitem__(event_name)._get_event_abi()
+        decoder = logs.get_decoder(abi)
+        anonymous = abi.get("anonymous", False)
+        topic = None if anonymous else logs.get_topic(abi)
+        log_stream = logs.stream_logs(
+            self.linked_contract.address, topic, from_block, delay, buffer_size
         )
-        return _listening_task(timeout > 0, _listener_end_time)
+        try:
+            async for log in log_stream:
+                try:
+                    event_data = decoder(log)
+                except Exception:
+                    if anonymous:
+                        # an anonymous event may match any log emitted by the contract
+                        continue
+                    raise
+                yield event_data
+        finally:
+            await log_stream.aclose()
 
     @combomethod
     def _retrieve_contract_events(
@@ -1460,15 +1682,23 @@ class OverloadedMethod:
         return len(self.methods)
 
     def __call__(
-        self, *args: Any, block_identifier: Union[int, str, bytes] = None, override: Dict = None
+        self,
+        *args: Any,
+        block_identifier: Union[int, str, bytes] = None,
+        override: Dict = None,
+        raw: bool = False,
     ) -> Any:
         fn = self._get_fn_from_args(args)
-        kwargs = {"block_identifier": block_identifier, "override": override}
+        kwargs = {"block_identifier": block_identifier, "override": override, "raw": raw or None}
         kwargs = {k: v for k, v in kwargs.items() if v is not None}
         return fn(*args, **kwargs)
 
     def call(
-        self, *args: Any, block_identifier: Union[int, str, bytes] = None, override: Dict = None
+        self,
+        *args: Any,
+        block_identifier: Union[int, str, bytes] = None,
+        override: Dict = None,
+        raw: bool = False,
     ) -> Any:
         """
         Call the contract method without broadcasting a transaction.
@@ -1489,13 +1719,17 @@ class OverloadedMethod:
         override : dict, optional
             A mapping from addresses to balance, nonce, code, state, stateDiff
             overrides for the context of the call.
+        raw : bool, optional
+            If True, the return values are the plain values decoded by `eth_abi`,
+            e.g. `int`, `bytes` and lowercase address strings, without conversion
+            to brownie types.
 
         Returns
         -------
             Contract method return value(s).
         """
         fn = self._get_fn_from_args(args)
-        return fn.call(*args, block_identifier=block_identifier, override=override)
+        return fn.call(*args, block_identifier=block_identifier, override=override, raw=raw)
 
     def transact(self, *args: Any) -> TransactionReceiptType:
         """
@@ -1589,6 +1823,36 @@ class OverloadedMethod:
         _print_natspec(self.natspec)
 
 
+class _MethodCodec:
+    """
+    ABI encoder, decoders and formatters of a contract method.
+
+    The ABI types of the inputs and outputs are resolved once, so encoding the
+    arguments and decoding the result of each call only does the conversion itself.
+    """
+
+    def __init__(self, abi: ABIFunction) -> None:
+        input_types = get_type_strings(abi["inputs"])
+        output_types = get_type_strings(abi["outputs"])
+        self.format_input: Final = get_input_formatter(abi)
+        self.format_output: Final = get_output_formatter(abi)
+        self.encoder: Final = abi_registry.get_tuple_encoder(*input_types)
+        self.input_decoder: Final = abi_registry.get_tuple_decoder(*input_types, strict=True)
+        self.output_decoder: Final = abi_registry.get_tuple_decoder(*output_types, strict=True)
+
+    def encode_input(self, args: Tuple[Any, ...]) -> bytes:
+        return self.encoder.encode(self.format_input(args))
+
+    def decode_input(self, data: bytes) -> List[Any]:
+        return self.format_input(self.input_decoder(ContextFramesBytesIO(data)))
+
+    def decode_output(self, data: bytes) -> ReturnValue:
+        return self.format_output(self.decode_raw_output(data))
+
+    def decode_raw_output(self, data: bytes) -> Tuple[Any, ...]:
+        return self.output_decoder(ContextFramesBytesIO(data))
+
+
 class _ContractMethod:
     _dir_color: Final = "bright magenta"
 
@@ -1608,6 +1872,11 @@ class _ContractMethod:
         self._input_sig: Final = build_function_signature(abi)
         self.natspec: Final[Dict[str, Any]] = natspec or {}
 
+    @cached_property
+    def _codec(self) -> _MethodCodec:
+        # created on first use, as most methods of a contract are never called
+        return _MethodCodec(self.abi)
+
     def __repr__(self) -> str:
         pay = "payable " if self.payable else ""
         return f"<{type(self).__name__} {pay}'{self.abi['name']}({_inputs(self.abi)})'>"
@@ -1636,7 +1905,11 @@ class _ContractMethod:
         _print_natspec(self.natspec)
 
     def call(
-        self, *args: Any, block_identifier: Union[int, str, bytes] = None, override: Dict = None
+        self,
+        *args: Any,
+        block_identifier: Union[int, str, bytes] = None,
+        override: Dict = None,
+        raw: bool = False,
     ) -> Any:
         """
         Call the contract method without broadcasting a transaction.
@@ -1653,6 +1926,10 @@ class _ContractMethod:
         override : dict, optional
             A mapping from addresses to balance, nonce, code, state, stateDiff
             overrides for the context of the call.
+        raw : bool, optional
+            If True, the return values are the plain values decoded by `eth_abi`,
+            e.g. `int`, `bytes` and lowercase address strings, without conversion
+            to brownie types.
 
         Returns
         -------
@@ -1673,7 +1950,7 @@ class _ContractMethod:
         if self.abi["outputs"] and not data:
             raise ValueError("No data was returned - the call likely reverted")
         try:
-            return self.decode_output(data)
+            return self.decode_output(data, raw=raw)
         except Exception:
             raise ValueError(f"Call reverted: {decode_typed_error(data)}") from None
 
@@ -1728,10 +2005,7 @@ class _ContractMethod:
         -------
         Decoded values
         """
-        abi = self.abi
-        types_list = get_type_strings(abi["inputs"])
-        result = decode_abi(types_list, HexBytes(hexstr)[4:])
-        return format_input(abi, result)
+        return self._codec.decode_input(HexBytes(hexstr)[4:])
 
     def encode_input(self, *args: Any) -> str:
         """
@@ -1747,12 +2021,9 @@ class _ContractMethod:
         str
             Hexstring of encoded ABI data
         """
-        abi = self.abi
-        data = format_input(abi, args)
-        types_list = get_type_strings(abi["inputs"])
-        return self.signature + encode_abi(types_list, data).hex()
+        return self.signature + self._codec.encode_input(args).hex()
 
-    def decode_output(self, hexstr: str) -> Tuple:
+    def decode_output(self, hexstr: str, raw: bool = False) -> Tuple:
         """
         Decode hexstring data returned by this method.
 
@@ -1760,17 +2031,21 @@ class _ContractMethod:
         ---------
         hexstr : str
             Hexstring of returned call data
+        raw : bool, optional
+            If True, returns the values decoded by `eth_abi` without conversion
+            to brownie types.
 
         Returns
         -------
         Decoded values
         """
-        abi = self.abi
-        types_list = get_type_strings(abi["outputs"])
-        result = decode_abi(types_list, HexBytes(hexstr))
-        result = format_output(abi, result)
+        codec = self._codec
+        if raw:
+            result = codec.decode_raw_output(HexBytes(hexstr))
+        else:
+            result = codec.decode_output(HexBytes(hexstr))
         if len(result) == 1:
-            result = result[0]
+            return result[0]
         return result
 
     def estimate_gas(self, *args: Any) -> int:
@@ -1847,7 +2122,11 @@ class ContractCall(_ContractMethod):
     """
 
     def __call__(
-        self, *args: Any, block_identifier: Union[int, str, bytes] = None, override: Dict = None
+        self,
+        *args: Any,
+        block_identifier: Union[int, str, bytes] = None,
+        override: Dict = None,
+        raw: bool = False,
     ) -> Any:
         """
         Call the contract method without broadcasting a transaction.
@@ -1864,14 +2143,22 @@ class ContractCall(_ContractMethod):
         override : dict, optional
             A mapping from addresses to balance, nonce, code, state, stateDiff
             overrides for the context of the call.
+        raw : bool, optional
+            If True, the return values are the plain values decoded by `eth_abi`,
+            e.g. `int`, `bytes` and lowercase address strings, without conversion
+            to brownie types.
 
         Returns
         -------
             Contract method return value(s).
         """
 
+        if block_identifier is None and override is None:
+            if multicall := _active_multicall.get():
+                return multicall._call_contract(self, *args, raw=raw)
+
         if not CONFIG.argv["always_transact"] or block_identifier is not None:
-            return self.call(*args, block_identifier=block_identifier, override=override)
+            return self.call(*args, block_identifier=block_identifier, override=override, raw=raw)
 
         args, tx = _get_tx(self._owner, args)
         tx.update({"gas_price": 0, "from": self._owner or accounts[0]})
@@ -1887,7 +2174,7 @@ class ContractCall(_ContractMethod):
             pass
 
         try:
-            return self.call(*args)
+            return self.call(*args, raw=raw)
         except VirtualMachineError as exc:
             if pc == exc.pc and revert_msg and exc.revert_msg is None:
                 # in case we miss a dev revert string
@@ -2039,28 +2326,31 @@ def _fetch_from_explorer(address: ChecksumAddress, action: str, silent: bool) ->
     ):
         address = _resolve_address(code[120:160])
 
+    settings = _explorer_settings()
+    url = settings.get("url") or EXPLORER_URL
     params: Dict[str, Any] = {
         "module": "contract",
         "action": action,
         "address": address,
         "chainid": web3.chain_id,
     }
+    key = f"{url}:{params['chainid']}:{action}:{address}"
+    ttl = settings.get("cache_ttl")
+    proxy_ttl = settings.get("proxy_cache_ttl")
+    data = _explorer_cache.get(key, ttl, proxy_ttl)
+    if data is not None:
+        return data
+
     env_key = os.getenv("ETHERSCAN_TOKEN")
     if env_key is not None:
         params["apiKey"] = env_key
     elif not silent:
-        warnings.warn(
-            "No ETHERSCAN_API token set. You may experience issues with rate limiting. "
-            "Visit https://etherscan.io/register to obtain a token, and then store it "
-            "as the environment variable $ETHERSCAN_TOKEN",
-            BrownieEnvironmentWarning,
-        )
+        _warn_explorer_token()
     if not silent:
         print(f"Fetching source of {bright_blue}{address}{color} from Etherscan...")
 
-    response = requests.get(
-        "https://api.etherscan.io/v2/api", params=params, headers=REQUEST_HEADERS
-    )
+    _explorer_rate_limiter.wait(settings.get("requests_per_second"))
+    response = requests.get(url, params=params, headers=REQUEST_HEADERS)
     if response.status_code != 200:
         raise ConnectionError(
             f"Status {response.status_code} when querying Etherscan: {response.text}"
@@ -2069,9 +2359,203 @@ def _fetch_from_explorer(address: ChecksumAddress, action: str, silent: bool) ->
     if int(data["status"]) != 1:
         raise ValueError(f"Failed to retrieve data from API: {data}")
 
+    _explorer_cache.set(key, data, ttl, proxy_ttl)
     return data
 
 
+def _compile_explorer_source(
+    name: str,
+    compiler_str: str,
+    version: Version,
+    optimizer: Dict[str, Any],
+    evm_version: Optional[str],
+    source_str: str,
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    # identical sources, e.g. many instances of one token or pool, are compiled once
+    key = ujson_dumps([name, compiler_str, optimizer, evm_version, source_str])
+    with _explorer_builds_lock:
+        cached = _explorer_builds.get(key)
+        if cached is not None:
+            _explorer_builds.move_to_end(key)
+            return cached
+
+    if source_str.startswith("{{"):
+        # source was verified using compiler standard JSON
+        input_json = ujson_loads(source_str[1:-1])
+        sources = {k: v["content"] for k, v in input_json["sources"].items()}
+        evm_version = input_json["settings"].get("evmVersion", evm_version)
+        remappings = input_json["settings"].get("remappings", [])
+
+        compiler.set_solc_version(str(version))
+        input_json.update(
+            compiler.generate_input_json(
+                sources, optimizer=optimizer, evm_version=evm_version, remappings=remappings
+            )
+        )
+        output_json = compiler.compile_from_input_json(input_json)
+        build_json = compiler.generate_build_json(input_json, output_json)
+    else:
+        if source_str.startswith("{"):
+            # source was submitted as multiple files
+            sources = {k: v["content"] for k, v in ujson_loads(source_str).items()}
+        else:
+            # source was submitted as a single file
+            if compiler_str.startswith("vyper"):
+                path_str = f"{name}.vy"
+            else:
+                path_str = f"{name}-flattened.sol"
+            sources = {path_str: source_str}
+
+        build_json = compiler.compile_and_format(
+            sources,
+            solc_version=str(version),
+            vyper_version=str(version),
+            optimizer=optimizer,
+            evm_version=evm_version,
+        )
+
+    with _explorer_builds_lock:
+        _explorer_builds[key] = (build_json, sources)
+        while len(_explorer_builds) > EXPLORER_BUILD_CACHE_SIZE:
+            _explorer_builds.popitem(last=False)
+    return build_json, sources
+
+
+def _prefetch_from_explorer(address: ChecksumAddress) -> None:
+    # fetches the responses used by `Contract.from_explorer` into the explorer cache.
+    # errors are raised again when the contract is created
+    try:
+        data = _fetch_from_explorer(address, "getsourcecode", True)
+        result = data["result"][0]
+        if not result.get("SourceCode"):
+            _fetch_from_explorer(address, "getabi", True)
+        elif result.get("Implementation"):
+            _fetch_from_explorer(_resolve_address(result["Implementation"]), "getsourcecode", True)
+    except Exception:
+        pass
+
+
+def _warn_explorer_token() -> None:
+    warnings.warn(
+        "No ETHERSCAN_API token set. You may experience issues with rate limiting. "
+        "Visit https://etherscan.io/register to obtain a token, and then store it "
+        "as the environment variable $ETHERSCAN_TOKEN",
+        BrownieEnvironmentWarning,
+    )
+
+
+def _explorer_settings() -> Dict[str, Any]:
+    # block explorer settings, from the `explorer` config section
+    return CONFIG.settings.get("explorer") or {}
+
+
+class _ExplorerCache:
+    """
+    On-disk cache of successful block explorer responses.
+
+    Responses are stored in `explorer.db` within the brownie data folder, which is
+    opened on first use, and are used until they are older than the `cache_ttl`
+    setting. Responses for proxies expire after `proxy_cache_ttl` instead, as the
+    implementation changes on upgrade, and responses for unverified contracts are
+    not stored so that a later verification is picked up. Because SQLite handles
+    locking, the cache may be safely shared by concurrent threads and processes.
+    """
+
+    def __init__(self) -> None:
+        self._cur: Optional[Cursor] = None
+        self._lock: Final = threading.Lock()
+        # responses are also held in memory while `Contract.from_explorer_many` runs,
+        # so that they are available when the cache is disabled
+        self._memory: Final[Dict[str, Dict[str, Any]]] = {}
+        self._holds = 0
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        """Keeps the responses fetched within the context in memory."""
+        with self._lock:
+            self._holds += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._holds -= 1
+                if not self._holds:
+                    self._memory.clear()
+
+    def _connect(self) -> Cursor:
+        with self._lock:
+            if self._cur is None:
+                cur = Cursor(_get_data_folder().joinpath("explorer.db"), wal=True)
+                cur.execute(
+                    "CREATE TABLE IF NOT EXISTS responses (key PRIMARY KEY, data, timestamp)"
+                )
+                self._cur = cur
+            return self._cur
+
+    def get(
+        self, key: str, ttl: Optional[float], proxy_ttl: Optional[float]
+    ) -> Optional[Dict[str, Any]]:
+        """Returns a cached response, or None if it is missing or has expired."""
+        with self._lock:
+            data = self._memory.get(key)
+        if data is not None or not ttl:
+            return data
+        row = self._connect().fetchone("SELECT data, timestamp FROM responses WHERE key=?", (key,))
+        if row is None or time.time() - row[1] > _response_ttl(row[0], ttl, proxy_ttl):
+            return None
+        return row[0]
+
+    def set(
+        self, key: str, data: Dict[str, Any], ttl: Optional[float], proxy_ttl: Optional[float]
+    ) -> None:
+        with self._lock:
+            if self._holds:
+                self._memory[key] = data
+        if ttl and _response_ttl(data, ttl, proxy_ttl):
+            self._connect().insert("responses", key, data, time.time())
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM responses")
+
+
+def _response_ttl(data: Dict[str, Any], ttl: float, proxy_ttl: Optional[float]) -> float:
+    # the number of seconds that an explorer response may be cached for
+    result = data["result"]
+    if not isinstance(result, list):
+        # `getabi` response
+        return ttl
+    if not result[0].get("SourceCode"):
+        return 0
+    if result[0].get("Implementation"):
+        return min(ttl, proxy_ttl or 0)
+    return ttl
+
+
+class _RateLimiter:
+    """Spaces requests evenly so that at most `rate` are made per second, across threads."""
+
+    def __init__(self) -> None:
+        self._lock: Final = threading.Lock()
+        self._next = 0.0
+
+    def wait(self, rate: Optional[float]) -> None:
+        if not rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + 1 / rate
+        if start > now:
+            time.sleep(start - now)
+
+
+_explorer_cache: Final = _ExplorerCache()
+_explorer_rate_limiter: Final = _RateLimiter()
+# (build json, sources) of compiled explorer sources
+_explorer_builds: Final["OrderedDict[str, Tuple[Dict[str, Any], Dict[str, str]]]"] = OrderedDict()
+_explorer_builds_lock: Final = threading.Lock()
+
+
 # console auto-completion logic
 
 
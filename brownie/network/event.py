@@ -1,9 +1,11 @@
 #!/usr/bin/python3
 # mypy: disable-error-code="union-attr"
 
+import re
 import time
 import warnings
 from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
 from threading import Lock, Thread
 from typing import (
@@ -19,6 +21,7 @@ from typing import (
     Mapping,
     Optional,
     Sequence,
+    Set,
     Tuple,
     TypeVar,
     Union,
@@ -30,21 +33,35 @@ from typing import (
 
 import eth_event
 from eth_event import EventError
-from eth_event.main import _TraceStep, DecodedEvent, NonDecodedEvent, TopicMapData
+from eth_event.main import (
+    ABIError,
+    DecodedEvent,
+)
+from eth_event.main import EventData as EventDataItem
+from eth_event.main import NonDecodedEvent, TopicMapData, _TraceStep
 from eth_typing import ABIElement, AnyAddress, ChecksumAddress, HexStr
+from faster_eth_abi import decode as decode_abi
+from faster_eth_abi.exceptions import (
+    InsufficientDataBytes,
+    InvalidPointer,
+    NoEntriesFound,
+    NonEmptyPaddingBytes,
+)
 from ujson import JSONDecodeError
-from web3._utils import filters
 from web3.datastructures import AttributeDict
+from web3.types import LogReceipt
 
-from brownie._c_constants import ujson_dump, ujson_load
+from brownie._c_constants import HexBytes, ujson_dumps, ujson_load
 from brownie._config import _get_data_folder
 from brownie._singleton import _Singleton
-from brownie.convert.datatypes import ReturnValue
+from brownie.convert.datatypes import ReturnValue, checksum_cache
 from brownie.convert.normalize import format_event
 from brownie.exceptions import EventLookupError
 from brownie.typing import FormattedEvent, Selector
 from brownie.utils import hexbytes_to_hexstring
+from brownie.utils.sql import Cursor
 
+from .logs import get_decoder, get_logs, get_topic
 from .web3 import ContractEvent, web3
 
 if TYPE_CHECKING:
@@ -82,18 +99,24 @@ class EventDict:
         ]
         self._ordered: Final = ordered
 
-        _dict: OrderedDict[str, Events]
-        _dict = OrderedDict()
+        # group events by name in a single pass, preserving the order of first occurrence
+        grouped: Dict[str, List[Event]] = {}
         for event in ordered:
             event_name = event.name
-            if event_name not in _dict:
-                events_for_name = [i for i in ordered if i.name == event_name]
-                _dict[event_name] = _EventItem(
-                    event_name,
-                    None,
-                    events_for_name,
-                    tuple(i.pos[0] for i in events_for_name),
-                )
+            if event_name in grouped:
+                grouped[event_name].append(event)
+            else:
+                grouped[event_name] = [event]
+
+        _dict: OrderedDict[str, Events]
+        _dict = OrderedDict()
+        for event_name, events_for_name in grouped.items():
+            _dict[event_name] = _EventItem(
+                event_name,
+                None,
+                events_for_name,
+                tuple(i.pos[0] for i in events_for_name),
+            )
 
         self._dict: Final = _dict
 
@@ -290,21 +313,42 @@ class _EventWatchData:
         self._callbacks_list: List[dict] = []
         self.delay: float = delay
         # Members
-        self._event_filter: Final[filters.LogFilter] = event.create_filter(
-            fromBlock=(web3.eth.block_number - 1)
-        )
-        self._cooldown_time_over: bool = False
+        abi = event._get_event_abi()
+        self.address: Final[ChecksumAddress] = event.address
+        # anonymous events cannot be selected by topic, any log from the address may match
+        self.topic: Final[Optional[HexStr]] = None if abi.get("anonymous") else get_topic(abi)
+        self._decoder: Final = get_decoder(abi)
+        # the first block which has not yet been checked for new events, starting
+        # from the block before the current one as the log filters did previously
+        self.next_block: int = max(web3.eth.block_number - 1, 0)
         self.timer = time.time()
         self.add_callback(callback, repeat)
 
-    def get_new_events(self) -> List["filters.LogReceipt"]:
+    def get_new_events(self, logs: List[LogReceipt], to_block: int) -> List[AttributeDict]:
         """
-        Retrieves and return the events that occurred between now and the last function call.
+        Selects and decodes the logs matching this event from a batch of logs fetched
+        for several events, and marks every block up to 'to_block' as checked.
+
+        Args:
+            logs (List[LogReceipt]): Logs fetched with a single eth_getLogs request.
+            to_block (int): The last block included in the request.
 
         Returns:
-            [List[LogReceipt]]: List of the retrieved events
+            [List[AttributeDict]]: List of the decoded events
         """
-        return self._event_filter.get_new_entries()
+        events: List[AttributeDict] = []
+        for log in logs:
+            if log["blockNumber"] < self.next_block or log["address"] != self.address:
+                continue
+            if self.topic is None:
+                try:
+                    events.append(self._decoder(log))
+                except Exception:
+                    continue
+            elif log["topics"] and hexbytes_to_hexstring(log["topics"][0]) == self.topic:
+                events.append(self._decoder(log))
+        self.next_block = to_block + 1
+        return events
 
     def reset_timer(self) -> None:
         """Resets the 'self.timer' member variable to the current time."""
@@ -323,39 +367,25 @@ class _EventWatchData:
         """
         self.delay = min(self.delay, new_delay)
 
-    def _trigger_callbacks(self, events_data: List[filters.LogReceipt]) -> List[Thread]:
+    def _trigger_callbacks(
+        self, events_data: List[AttributeDict], executor: ThreadPoolExecutor
+    ) -> List[Future]:
         """
-        Given a list of event as a parameter, creates a thread for each callback
-        present in 'self._callbacks_list', stores the thread in a list which is returned.
+        Given a list of event as a parameter, submits a task to 'executor' for each
+        callback present in 'self._callbacks_list' and returns the resulting futures.
         Removes non-repeating callbacks from the callback list
 
         Args:
             events_data (List[AttributeDict]): The list of event to iterate on.
+            executor (ThreadPoolExecutor): The worker pool running the callbacks.
         """
-
-        def _map_callback_on_list(
-            callback: Callable, data_to_map: List[filters.LogReceipt]
-        ) -> None:
-            list(map(callback, data_to_map))
-
-        self.cooldown_time_over = False
-        threads: List[Thread] = []
-        for callback in self._callbacks_list:
-            # Creates a thread for each callback
-            threads.append(
-                Thread(
-                    target=_map_callback_on_list,
-                    args=(
-                        callback["function"],
-                        events_data,
-                    ),
-                    daemon=True,
-                )
-            )
-            threads[-1].start()
+        futures: List[Future] = [
+            executor.submit(_map_callback_on_list, callback["function"], events_data)
+            for callback in self._callbacks_list
+        ]
         # Remove non-repeating callbacks from list
         self._callbacks_list = [cb for cb in self._callbacks_list if cb.get("repeat")]
-        return threads
+        return futures
 
     @property
     def time_left(self) -> float:
@@ -369,27 +399,67 @@ class _EventWatchData:
         return max(0.0, self.delay - (time.time() - self.timer))
 
 
+def _map_callback_on_list(callback: Callable, data_to_map: List[AttributeDict]) -> None:
+    for data in data_to_map:
+        callback(data)
+
+
 class EventWatcher(metaclass=_Singleton):
     """
     Singleton class containing methods to set callbacks on user-specified events.
     This class is multi-threaded :
         - The main thread (original process) activates a sub-thread and can be used
         to add callback instructions on specific events.
-        - The sub-thread looks for new events among the ones with a callback set.
-        When found, calls a method that creates new threads to run the callback
-        instructions with the event(s) data as a parameter.
+        - The sub-thread looks for new events among the ones with a callback set,
+        fetching the logs of every event that is due for a check with a single
+        eth_getLogs request. When found, the callback instructions are submitted
+        to a bounded pool of worker threads with the event(s) data as a parameter.
     """
 
     def __init__(self) -> None:
         self.target_list_lock: Lock = Lock()
         self.target_events_watch_data: Dict[str, _EventWatchData] = {}
+        # maximum number of callbacks executing at once
+        self.max_workers: int = 8
+        # number of queued or running callbacks above which a warning is raised
+        self.backpressure_threshold: int = 64
         self._kill: bool = False
         self._has_started: bool = False
         self._watcher_thread = Thread(target=self._loop, daemon=True)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Set[Future] = set()
+        self._metrics_lock: Final = Lock()
+        self._peak_pending: int = 0
+        self._dispatched: int = 0
+        self._completed: int = 0
+        self._log_requests: int = 0
+        self._backpressure_events: int = 0
+        self._behind: bool = False
 
     def __del__(self) -> None:
         self.stop()
 
+    @property
+    def metrics(self) -> Dict[str, int]:
+        """
+        Backpressure metrics for the watcher.
+
+        Returns:
+            Dict[str, int]: The number of callbacks currently pending (queued or running),
+            the peak number of pending callbacks, the number of callbacks dispatched and
+            completed, the number of eth_getLogs requests made and the number of times
+            pending callbacks exceeded 'backpressure_threshold'.
+        """
+        with self._metrics_lock:
+            return {
+                "pending_callbacks": len(self._pending),
+                "peak_pending_callbacks": self._peak_pending,
+                "dispatched_callbacks": self._dispatched,
+                "completed_callbacks": self._completed,
+                "log_requests": self._log_requests,
+                "backpressure_events": self._backpressure_events,
+            }
+
     def stop(self, wait: bool = True) -> None:
         """
         Stops the running threads. This function does not reset the instance
@@ -402,6 +472,9 @@ class EventWatcher(metaclass=_Singleton):
         self._kill = True
         if wait is True and self._watcher_thread.is_alive():
             self._watcher_thread.join()
+        if not self._watcher_thread.is_alive():
+            # otherwise the executor is shut down when the watcher thread exits
+            self._shutdown_executor()
         self._has_started = False
 
     def reset(self) -> None:
@@ -434,35 +507,43 @@ class EventWatcher(metaclass=_Singleton):
         if not callable(callback):
             raise TypeError("Argument 'callback' argument must be a callable.")
         delay = max(delay, 0.05)
-        self.target_list_lock.acquire()  # lock
-        # Key referring to this specific event (event.address is the address
-        # of the contract to which the event is linked)
-        event_watch_data_key = f"{str(event.address)}+{event.event_name}"
-        if self.target_events_watch_data.get(event_watch_data_key) is None:
-            # If the _EventWatchData for 'event' does not exist, creates it.
-            self.target_events_watch_data[event_watch_data_key] = _EventWatchData(
-                event, callback, delay, repeat
-            )
-        else:
-            # Adds a new callback to the already existing _EventWatchData.
-            self.target_events_watch_data[event_watch_data_key].add_callback(callback, repeat)
-            if repeat is True:
-                # Updates the delay between each check calling the
-                # _EventWatchData.update_delay function
-                self.target_events_watch_data[event_watch_data_key].update_delay(delay)
-        self.target_list_lock.release()  # unlock
+        with self.target_list_lock:
+            # Key referring to this specific event (event.address is the address
+            # of the contract to which the event is linked)
+            event_watch_data_key = f"{str(event.address)}+{event.event_name}"
+            if self.target_events_watch_data.get(event_watch_data_key) is None:
+                # If the _EventWatchData for 'event' does not exist, creates it.
+                self.target_events_watch_data[event_watch_data_key] = _EventWatchData(
+                    event, callback, delay, repeat
+                )
+            else:
+                # Adds a new callback to the already existing _EventWatchData.
+                self.target_events_watch_data[event_watch_data_key].add_callback(callback, repeat)
+                if repeat is True:
+                    # Updates the delay between each check calling the
+                    # _EventWatchData.update_delay function
+                    self.target_events_watch_data[event_watch_data_key].update_delay(delay)
         # Start watch if not done
         if self._has_started is False:
             self._start_watch()
 
     def _setup(self) -> None:
         """Sets up the EventWatcher instance member variables so it is ready to run"""
-        self.target_list_lock.acquire()
-        self.target_events_watch_data.clear()
-        self.target_list_lock.release()
+        with self.target_list_lock:
+            self.target_events_watch_data.clear()
         self._kill = False
         self._has_started = False
         self._watcher_thread = Thread(target=self._loop, daemon=True)
+        self._reset_metrics()
+
+    def _reset_metrics(self) -> None:
+        with self._metrics_lock:
+            self._peak_pending = len(self._pending)
+            self._dispatched = 0
+            self._completed = 0
+            self._log_requests = 0
+            self._backpressure_events = 0
+            self._behind = False
 
     def _start_watch(self) -> None:
         """Starts the thread running the _loop function"""
@@ -473,75 +554,345 @@ class EventWatcher(metaclass=_Singleton):
         """
         Watches for new events. Whenever new events are detected, calls the
         '_EventWatchData._trigger_callbacks' function to run the callbacks instructions
-        (in separate threads) on the detected events data.
+        (on the worker pool) on the detected events data.
         """
-        workers_list: List[Thread] = []
-
         while not self._kill:
-            try:
-                sleep_time: float = 1.0  # Max sleep time.
-                self.target_list_lock.acquire()  # lock
-                for _, elem in self.target_events_watch_data.items():
+            sleep_time: float = 1.0  # Max sleep time.
+            due: List[_EventWatchData] = []
+            with self.target_list_lock:
+                watched = list(self.target_events_watch_data.values())
+                if any(elem.time_left == 0 for elem in watched):
+                    # events that are more than halfway through their cooldown are checked
+                    # early, so that all events converge onto a single request per check
+                    due = [elem for elem in watched if elem.time_left <= elem.delay / 2]
+                for elem in watched:
                     # If cooldown is not over :
                     #   skip and store time left before next check if needed.
-                    time_left = elem.time_left
-                    if time_left > 0:
-                        sleep_time = min(sleep_time, time_left)
-                        continue
-                    # Check for new events & execute callback async if some are found
-                    latest_events = elem.get_new_events()
-                    if len(latest_events) != 0:
-                        workers_list += elem._trigger_callbacks(latest_events)
+                    if elem not in due:
+                        sleep_time = min(sleep_time, elem.time_left)
+
+            # the lock is not held while waiting on the RPC, so callbacks can be added
+            if due:
+                self._check_events(due)
+
+            with self.target_list_lock:
+                for elem in due:
                     elem.reset_timer()
                     # after elem.reset_timer elem.time_left is approximately elem.delay
                     sleep_time = min(sleep_time, elem.time_left)
-            finally:
-                self.target_list_lock.release()  # unlock
-                # Remove dead threads from the workers_list
-                workers_list = list(filter(lambda x: x.is_alive(), workers_list))
-                time.sleep(sleep_time)
-
-        # Join running threads when leaving function.
-        for worker_instance in workers_list:
-            worker_instance.join(timeout=30)
-            if worker_instance.is_alive():
-                worker_name = worker_instance.getName()
-                warnings.warn(
-                    message=f"Callback execution ({worker_name}) could not be joined.",
-                    category=RuntimeWarning,
+            time.sleep(sleep_time)
+
+        self._join_callbacks()
+        self._shutdown_executor()
+
+    def _check_events(self, due: List[_EventWatchData]) -> None:
+        """
+        Fetches the logs for all events which are due for a check with a single
+        eth_getLogs request, and triggers the callbacks of events that occurred.
+        """
+        to_block = web3.eth.block_number
+        from_block = min(elem.next_block for elem in due)
+        if to_block < from_block:
+            # no new blocks since the last check
+            return
+
+        addresses = sorted({elem.address for elem in due})
+        topics: Optional[List[HexStr]] = None
+        if all(elem.topic is not None for elem in due):
+            topics = sorted({cast(HexStr, elem.topic) for elem in due})
+        logs = get_logs(addresses, topics, from_block, to_block)
+        with self._metrics_lock:
+            self._log_requests += 1
+
+        for elem in due:
+            events = elem.get_new_events(logs, to_block)
+            if events:
+                with self.target_list_lock:
+                    futures = elem._trigger_callbacks(events, self._get_executor())
+                self._track(futures)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="EventWatcher")
+        return self._executor
+
+    def _shutdown_executor(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _track(self, futures: List[Future]) -> None:
+        """Records newly dispatched callbacks, warning when callbacks are falling behind."""
+        with self._metrics_lock:
+            self._pending.update(futures)
+            self._dispatched += len(futures)
+            pending = len(self._pending)
+            self._peak_pending = max(self._peak_pending, pending)
+            falling_behind = pending > self.backpressure_threshold and not self._behind
+            if falling_behind:
+                self._backpressure_events += 1
+            self._behind = pending > self.backpressure_threshold
+        if falling_behind:
+            warnings.warn(
+                message=f"EventWatcher callbacks are falling behind: {pending} pending callbacks",
+                category=RuntimeWarning,
+            )
+        for future in futures:
+            future.add_done_callback(self._on_callback_done)
+
+    def _on_callback_done(self, future: Future) -> None:
+        with self._metrics_lock:
+            self._pending.discard(future)
+            self._completed += 1
+            if len(self._pending) <= self.backpressure_threshold:
+                self._behind = False
+        exc = None if future.cancelled() else future.exception()
+        if exc is not None:
+            warnings.warn(
+                message=f"Event callback raised {type(exc).__name__}: {exc}",
+                category=RuntimeWarning,
+            )
+
+    def _join_callbacks(self) -> None:
+        """Waits for the running callbacks when leaving the loop."""
+        with self._metrics_lock:
+            pending = list(self._pending)
+        _, not_done = wait(pending, timeout=30)
+        for _ in not_done:
+            warnings.warn(
+                message="Callback execution could not be joined.",
+                category=RuntimeWarning,
+            )
+
+
+@final
+class _TopicRegistry:
+    """
+    Registry of event topic ABIs, used for decoding events on unknown contracts.
+
+    Topics are stored in `topics.db` within the brownie data folder. The database
+    is opened on first use, and individual topics are read as they are needed and
+    cached in memory. Because SQLite handles locking, the registry may be safely
+    shared by concurrent processes. New topics are inserted rather than rewriting
+    the registry. An existing topic is only replaced when the stored ABI has no
+    indexed inputs.
+    """
+
+    def __init__(self) -> None:
+        self._cur: Optional[Cursor] = None
+        self._cache: Final[TopicMap] = {}
+        self._lock: Final = Lock()
+
+    def _connect(self) -> Cursor:
+        with self._lock:
+            if self._cur is None:
+                data_folder = _get_data_folder()
+                cur = Cursor(data_folder.joinpath("topics.db"))
+                cur.execute("PRAGMA journal_mode=WAL")
+                cur.execute("CREATE TABLE IF NOT EXISTS topics (topic PRIMARY KEY, abi)")
+                _migrate_topics_json(cur, data_folder.joinpath("topics.json"))
+                self._cur = cur
+            return self._cur
+
+    def get(self, topic: HexStr) -> Optional[TopicMapData]:
+        """Returns the ABI for an event topic, or None if the topic is unknown."""
+        abi = self._cache.get(topic)
+        if abi is None:
+            row = self._connect().fetchone("SELECT abi FROM topics WHERE topic=?", (topic,))
+            if row is not None:
+                abi = self._cache[topic] = row[0]
+        return abi
+
+    def subset(self, topics: Iterable[HexStr]) -> TopicMap:
+        """Returns a topic map containing the known topics among `topics`."""
+        topic_map: TopicMap = {}
+        for topic in topics:
+            abi = self.get(topic)
+            if abi is not None:
+                topic_map[topic] = abi
+        return topic_map
+
+    def add(self, topic_map: TopicMap) -> None:
+        """Adds the topics of a topic map which are not already known."""
+        for key, value in topic_map.items():
+            if self._cache.get(key) == value:
+                # existing event topic, nothing has changed
+                continue
+            existing = self.get(key)
+            if existing is None:
+                # new event topic - if another process added it first, its ABI is kept
+                self._connect().execute(
+                    "INSERT OR IGNORE INTO topics VALUES (?,?)", (key, ujson_dumps(value))
                 )
+                self._cache.pop(key, None)
+            elif existing != value and not any(i["indexed"] for i in existing["inputs"]):
+                # existing topic, but the old abi has no indexed events - keep the new one
+                self._connect().insert("topics", key, value)
+                self._cache[key] = value
 
 
-def __get_path() -> Path:
-    return _get_data_folder().joinpath("topics.json")
+def _migrate_topics_json(cur: Cursor, path: Path) -> None:
+    # topics were previously stored as a single JSON file, rewritten on each update
+    try:
+        with path.open() as fp:
+            legacy: TopicMap = ujson_load(fp)
+    except (FileNotFoundError, JSONDecodeError):
+        return
+    cur.executemany(
+        "INSERT OR IGNORE INTO topics VALUES (?,?)",
+        [(k, ujson_dumps(v)) for k, v in legacy.items()],
+    )
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        # already migrated by another process
+        pass
 
 
-def _get_topics(abi: List[ABIElement]) -> Dict[str, HexStr]:
+def _get_topic_map(abi: List[ABIElement]) -> TopicMap:
+    """Returns the topic map of an ABI, adding its events to the topic registry."""
     topic_map = eth_event.get_topic_map(abi)
+    _topics.add(topic_map)
+    return topic_map
 
-    updated_topics = _topics.copy()
 
-    for key, value in topic_map.items():
-        if key not in updated_topics:
-            # new event topic
-            updated_topics[key] = value
-        elif value == updated_topics[key]:
-            # existing event topic, nothing has changed
-            continue
-        elif not any(i["indexed"] for i in updated_topics[key]["inputs"]):
-            # existing topic, but the old abi has no indexed events - keep the new one
-            updated_topics[key] = value
+def _add_deployment_topics(address: ChecksumAddress, topic_map: TopicMap) -> None:
+    _deployment_topics[address] = topic_map
 
-    if updated_topics != _topics:
-        _topics.update(updated_topics)
-        with __get_path().open("w") as fp:
-            ujson_dump(updated_topics, fp, sort_keys=True, indent=2)
 
-    return {v["name"]: k for k, v in topic_map.items()}
+@final
+class _LogDecoder:
+    """
+    Decoder for the logs of a single event signature and indexed layout.
 
+    The ABI types of the indexed and unindexed inputs are resolved once, so that
+    decoding a log only requires the ABI decoding itself.
+    """
+
+    def __init__(self, abi: TopicMapData) -> None:
+        inputs = abi["inputs"]
+        self.name: Final = abi["name"]
+        # (name, type, components, indexed, [type]) for each input, in ABI order
+        self.inputs: Final = [
+            (i["name"], i["type"], i.get("components"), i["indexed"], [i["type"]]) for i in inputs
+        ]
+        self.indexed_count: Final = sum(1 for i in inputs if i["indexed"])
+        try:
+            self.unindexed_types: Final = _params([i for i in inputs if not i["indexed"]])
+            # used when a log has no topics beyond topic0 for an event with indexed inputs
+            self.all_types: Final = _params(inputs)
+        except (KeyError, TypeError) as e:
+            raise ABIError("Invalid ABI") from e
+
+    def decode(self, log: Mapping[str, Any], address: ChecksumAddress) -> DecodedEvent:
+        topics = log["topics"]
+        topics_count = len(topics) - 1
+        from_topics = True
+        if self.indexed_count and not topics_count:
+            # special case - if the ABI has indexed values but the log does not,
+            # we should still be able to decode the data
+            types = self.all_types
+            from_topics = False
+        elif self.indexed_count < topics_count:
+            raise EventError(
+                "Event log does not contain enough topics for the given ABI - this"
+                " is usually because an event argument is not marked as indexed"
+            )
+        elif self.indexed_count > topics_count:
+            raise EventError(
+                "Event log contains more topics than expected for the given ABI - this is"
+                " usually because an event argument is incorrectly marked as indexed"
+            )
+        else:
+            types = self.unindexed_types
+
+        try:
+            decoded = decode_abi(types, HexBytes(log["data"]))
+        except InsufficientDataBytes:
+            raise EventError("Event data has insufficient length")
+        except NonEmptyPaddingBytes:
+            raise EventError("Malformed data field in event log")
+        except InvalidPointer as e:
+            raise EventError(str(e))
+        except OverflowError:
+            raise EventError("Cannot decode event due to overflow error")
+
+        data: List[EventDataItem] = []
+        data_idx = 0
+        topic_idx = 1
+        for name, type_, components, indexed, type_list in self.inputs:
+            element: EventDataItem = {"name": name, "type": type_}
+            if components is not None:
+                element["components"] = components
+
+            if from_topics and indexed:
+                encoded = HexBytes(topics[topic_idx])
+                topic_idx += 1
+                try:
+                    value = decode_abi(type_list, encoded)[0]
+                except (InsufficientDataBytes, NoEntriesFound, OverflowError, InvalidPointer):
+                    # an array or other data type that uses multiple slots
+                    element["value"] = _to_hexstring(encoded)
+                    element["decoded"] = False
+                    data.append(element)
+                    continue
+            else:
+                value = decoded[data_idx]
+                data_idx += 1
+
+            if isinstance(value, bytes):
+                value = _to_hexstring(value)
+
+            element["value"] = value
+            element["decoded"] = True
+            data.append(element)
+
+        event: DecodedEvent = {
+            "name": self.name,
+            "data": data,
+            "decoded": True,
+            "address": address,
+        }
+        _append_additional_log_data(log, event)
+        return event
+
+
+def _to_hexstring(value: Any) -> HexStr:
+    if isinstance(value, bytes):
+        return HexStr(f"0x{value.hex()}")
+    return HexStr(f"0x{HexBytes(value).hex()}")
+
+
+def _params(abi_params: List[Dict[str, Any]]) -> List[str]:
+    # the ABI types of `abi_params`, with tuples expanded to their component types
+    types = []
+    for i in abi_params:
+        tuple_match = _tuple_match(i["type"])
+        if tuple_match:
+            # captures whether this is a tuple array, and the size if it is fixed
+            array, size = tuple_match.group(1, 2)
+            tail = f"[{size}]" if array is not None else ""
+            types.append(f"({','.join(_params(i['components']))}){tail}")
+        else:
+            types.append(i["type"])
+    return types
 
-def _add_deployment_topics(address: ChecksumAddress, abi: List[ABIElement]) -> None:
-    _deployment_topics[address] = eth_event.get_topic_map(abi)
+
+def _append_additional_log_data(
+    log: Mapping[str, Any], event: DecodedEvent | NonDecodedEvent
+) -> None:
+    for key in _LOG_ENTRIES:
+        if key in log:
+            event[key] = log[key]  # type: ignore [literal-required]
+
+
+def _get_log_decoder(topic: HexStr, abi: TopicMapData) -> _LogDecoder:
+    layout = tuple((i["name"], i["type"], i["indexed"]) for i in abi["inputs"])
+    key = (topic, abi["name"], layout)
+    decoder = _log_decoders.get(key)
+    if decoder is None:
+        decoder = _log_decoders[key] = _LogDecoder(abi)
+    return decoder
 
 
 def _decode_logs(
@@ -552,37 +903,59 @@ def _decode_logs(
     if not logs:
         return EventDict()
 
-    idx = 0
     events: List[DecodedEvent | NonDecodedEvent] = []
-    while True:
-        address: ChecksumAddress = logs[idx]["address"]
-        try:
-            new_idx = logs.index(
-                next(i for i in logs[idx:] if i["address"] != address)  # type: ignore [misc]
-            )
-            log_slice = logs[idx:new_idx]
-            idx = new_idx
-        except StopIteration:
-            log_slice = logs[idx:]
-
-        topics_map = _deployment_topics.get(address, _topics)
-        for item in log_slice:
-            if contracts:
-                contract = contracts[address]
-                if contract is not None:
-                    note = _decode_ds_note(item, contract)
-                    if note is not None:
-                        events.append(note)
-                        continue
-            try:
-                events.extend(
-                    eth_event.decode_logs([item], topics_map, allow_undecoded=True)  # type: ignore [call-overload]
-                )
-            except EventError as exc:
-                warnings.warn(f"{address}: {exc}")
+    # decoders and checksummed addresses are resolved once per batch of logs
+    decoders: Dict[Tuple[str, HexStr], Optional[_LogDecoder]] = {}
+    checksummed: Dict[str, ChecksumAddress] = {}
+
+    for item in logs:
+        address: ChecksumAddress = item["address"]
+        if contracts:
+            contract = contracts[address]
+            if contract is not None:
+                note = _decode_ds_note(item, contract)
+                if note is not None:
+                    events.append(note)
+                    continue
+
+        checksum_address = checksummed.get(address)
+        if checksum_address is None:
+            checksum_address = checksummed[address] = checksum_cache.checksum(address)
+
+        topics = item["topics"]
+        decoder: Optional[_LogDecoder] = None
+        if topics:
+            topic0 = _to_hexstring(topics[0])
+            key = (address, topic0)
+            if key in decoders:
+                decoder = decoders[key]
+            else:
+                if address in _deployment_topics:
+                    topic_abi = _deployment_topics[address].get(topic0)
+                else:
+                    topic_abi = _topics.get(topic0)
+                if topic_abi is not None:
+                    decoder = _get_log_decoder(topic0, topic_abi)
+                decoders[key] = decoder
+
+        if decoder is None:
+            event: NonDecodedEvent = {
+                "name": None,
+                "topics": [_to_hexstring(i) for i in topics],
+                "data": _to_hexstring(item["data"]),
+                "decoded": False,
+                "address": checksum_address,
+            }
+            _append_additional_log_data(item, event)
+            events.append(event)
+            continue
 
-        if log_slice[-1] == logs[-1]:
-            break
+        try:
+            events.append(decoder.decode(item, checksum_address))
+        except KeyError:
+            warnings.warn(f"{address}: Invalid event")
+        except EventError as exc:
+            warnings.warn(f"{address}: {exc}")
 
     return EventDict(format_event(event) for event in events)
 
@@ -623,27 +996,34 @@ def _decode_trace(trace: Sequence[_TraceStep], initial_address: AnyAddress) -> E
     if not trace:
         return EventDict()
 
+    trace = trace if type(trace) is list else list(trace)
+    # only the topics emitted within the trace are read from the registry
+    emitted = (
+        _to_hexstring(step["stack"][-3])
+        for step in trace
+        if step["op"] in ("LOG1", "LOG2", "LOG3", "LOG4") and len(step.get("stack", ())) > 2
+    )
     events = eth_event.decode_traceTransaction(
-        trace if type(trace) is list else list(trace),
-        _topics,
+        trace,
+        _topics.subset(emitted),
         allow_undecoded=True,
         initial_address=initial_address,
     )
     return EventDict(format_event(event) for event in events)
 
 
+# log decoders keyed by (topic0, event name, input names, types and indexing)
+# fields copied from each log into its decoded event
+_LOG_ENTRIES: Final = ("logIndex", "blockNumber", "transactionIndex")
+_tuple_match: Final = re.compile(r"tuple(\[(\d*)\])?").match
+
+_log_decoders: Final[Dict[Tuple[HexStr, str, Tuple[Tuple[str, str, bool], ...]], _LogDecoder]] = {}
+
 # dictionary of event topic ABIs specific to a single contract deployment
 _deployment_topics: Final[DeploymentTopics] = {}
 
 # EventWatcher program instance
 event_watcher: Final = EventWatcher()
 
-try:
-    with __get_path().open() as fp:
-        __topics = ujson_load(fp)
-except (FileNotFoundError, JSONDecodeError):
-    __topics = None
-
 # general event topic ABIs for decoding events on unknown contracts
-_topics: Final[TopicMap] = __topics or {}
-del __topics
+_topics: Final = _TopicRegistry()
@@ -0,0 +1,235 @@
+#!/usr/bin/python3
+
+import threading
+import time
+from queue import Empty
+from statistics import median
+from typing import Any, Callable, Dict, Final, Optional
+
+from web3.exceptions import MethodUnavailable
+from web3.types import FeeHistory
+
+from brownie._singleton import _Singleton
+from brownie.convert import Wei
+
+from .head import Block, Reorg, head_tracker
+from .web3 import web3
+
+# number of blocks included in each `eth_feeHistory` request
+HISTORY_BLOCKS: Final = 10
+# reward percentiles requested with the fee history
+REWARD_PERCENTILES: Final = (10, 25, 50, 75, 90)
+# percentile of the rewards used to suggest a priority fee
+PRIORITY_PERCENTILE: Final = 50
+# maximum delay between checks for a new block, in seconds
+MAX_INTERVAL: Final = 5.0
+# the oracle stops following new blocks if it was not used for this many seconds
+IDLE_TIMEOUT: Final = 60.0
+
+
+class FeeOracle(metaclass=_Singleton):
+    """
+    Serves fee data for the latest block to every account and gas strategy.
+
+    While the oracle is in use it follows new heads from the head tracker, and fetches
+    `eth_feeHistory` once for each new block. The base fee, reward percentiles and
+    priority fee suggestion are then served from memory, without any request. When a
+    transaction sent from brownie confirms in a block the oracle has not seen yet, or
+    after the chain is reverted or reset, the data is fetched again on the next access.
+    The oracle stops following new heads when it has not been used for `IDLE_TIMEOUT`
+    seconds.
+    """
+
+    def __init__(self) -> None:
+        self._lock: Final = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._head: Optional[Block] = None
+        self._history: Optional[FeeHistory] = None
+        # does the client support `eth_feeHistory`? None until it was tried
+        self._supported: Optional[bool] = None
+        # number of the block that `_history` was fetched for
+        self._history_block: Optional[int] = None
+        # is the fee history used? it is not fetched for legacy gas prices only
+        self._wants_history = False
+        # values that are not part of the fee history, computed once per block
+        self._memo: Dict[str, Any] = {}
+        self._registered = False
+        self._last_access = 0.0
+        self.upstream_requests = 0
+
+    @property
+    def base_fee(self) -> Wei:
+        """Base fee per gas of the latest block."""
+        return Wei(self._get_head()["baseFeePerGas"])
+
+    @property
+    def next_base_fee(self) -> Wei:
+        """Base fee per gas of the next block."""
+        head = self._get_head()
+        with self._lock:
+            if self._history is None:
+                return Wei(head["baseFeePerGas"])
+            return Wei(self._history["baseFeePerGas"][-1])
+
+    @property
+    def priority_fee(self) -> Wei:
+        """
+        Suggested max priority fee per gas, the median of the rewards paid at
+        `PRIORITY_PERCENTILE` in recent blocks. Falls back to `eth_maxPriorityFeePerGas`
+        if the client does not support `eth_feeHistory`, or recent blocks paid no reward.
+        """
+        self._get_head()
+        with self._lock:
+            fee = self._median_reward(PRIORITY_PERCENTILE) if self._history else 0
+        if fee:
+            return Wei(fee)
+        return self._max_priority_fee()
+
+    @property
+    def max_priority_fee(self) -> Wei:
+        """Max priority fee per gas suggested by `eth_maxPriorityFeePerGas`, once per block."""
+        self._get_head(history=False)
+        return self._max_priority_fee()
+
+    @property
+    def gas_price(self) -> Optional[Wei]:
+        """Legacy gas price generated by the web3 gas price strategy, once per block."""
+        if web3.eth._gas_price_strategy is None:
+            # without a strategy no price is generated, and no request is made
+            return None
+        # does not require the fee history, which legacy chains may not support
+        self._get_head(history=False)
+        return self._memoize("gas_price", web3.eth.generate_gas_price)
+
+    def reward(self, percentile: int) -> Wei:
+        """
+        Returns the median priority fee paid at a percentile of the gas used in each
+        of the last `HISTORY_BLOCKS` blocks.
+
+        Args:
+            percentile: One of `REWARD_PERCENTILES`.
+        """
+        if percentile not in REWARD_PERCENTILES:
+            raise ValueError(f"percentile must be one of {REWARD_PERCENTILES}")
+        self._get_head()
+        with self._lock:
+            if self._history is None:
+                raise ValueError("Fee history is not available from this client")
+            return Wei(self._median_reward(percentile))
+
+    def _median_reward(self, percentile: int) -> int:
+        # must be called while holding the lock
+        idx = REWARD_PERCENTILES.index(percentile)
+        rewards = [i[idx] for i in self._history.get("reward") or [] if i]  # type: ignore
+        return int(median(rewards)) if rewards else 0
+
+    def _max_priority_fee(self) -> Wei:
+        return Wei(self._memoize("max_priority_fee", lambda: web3.eth.max_priority_fee))
+
+    def _memoize(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+        value = fn()
+        with self._lock:
+            self._memo[key] = value
+        return value
+
+    def _get_head(self, history: bool = True) -> Block:
+        # the head is trusted while it is kept up to date by the head tracker
+        with self._lock:
+            self._last_access = time.time()
+            head = self._head
+            if history:
+                self._wants_history = True
+            stale = history and head is not None and self._history_block != head["number"]
+        if head is None:
+            self._register()
+            self._update(web3.eth.get_block("latest"))
+            with self._lock:
+                head = self._head
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._loop, daemon=True)
+                    self._thread.start()
+        elif stale:
+            # only legacy gas prices were used until now
+            self._update(head)
+        return head  # type: ignore [return-value]
+
+    def _register(self) -> None:
+        if self._registered:
+            return
+        from .state import _revert_register
+
+        # registered on first use, the state module cannot be imported at import time
+        _revert_register(self)
+        self._registered = True
+
+    def _observe_block(self, number: int) -> None:
+        """Called when a transaction sent from brownie confirms in block `number`."""
+        with self._lock:
+            if self._head is not None and self._head["number"] < number:
+                # the head tracker has not delivered the block yet
+                self._head = None
+
+    def _update(self, block: Block) -> None:
+        history = None
+        with self._lock:
+            wants_history = self._wants_history
+        if wants_history and self._supported is not False:
+            self.upstream_requests += 1
+            try:
+                history = web3.eth.fee_history(
+                    HISTORY_BLOCKS, block["number"], list(REWARD_PERCENTILES)
+                )
+                self._supported = True
+            except (ValueError, MethodUnavailable):
+                # the client does not support fee history, or the chain does not use EIP-1559
+                self._supported = False
+        with self._lock:
+            self._head = block
+            self._history = history
+            self._history_block = block["number"] if wants_history else None
+            self._memo.clear()
+
+    def _loop(self) -> None:
+        try:
+            with head_tracker.subscribe(MAX_INTERVAL) as subscription:
+                while True:
+                    with self._lock:
+                        if time.time() - self._last_access > IDLE_TIMEOUT:
+                            self._stop()
+                            return
+                        head = self._head
+                    try:
+                        event = subscription.get(timeout=MAX_INTERVAL)
+                    except Empty:
+                        continue
+                    if isinstance(event, Reorg):
+                        continue
+                    if head is None or event["hash"] != head["hash"]:
+                        self._update(event)
+        except Exception:
+            # the tracker stopped, e.g. the network was disconnected
+            with self._lock:
+                self._stop()
+
+    def _stop(self) -> None:
+        # must be called while holding the lock
+        self._thread = None
+        self._head = None
+        self._history = None
+        self._memo.clear()
+
+    def _revert(self, height: int) -> None:
+        with self._lock:
+            self._head = None
+
+    def _reset(self) -> None:
+        with self._lock:
+            self._head = None
+            self._supported = None
+            self._wants_history = False
+
+
+fee_oracle: Final = FeeOracle()
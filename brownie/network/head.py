@@ -0,0 +1,263 @@
+#!/usr/bin/python3
+
+import threading
+import time
+from queue import Queue
+from typing import Any, Dict, Final, List, NamedTuple, Optional, Set, Union
+
+from web3.datastructures import AttributeDict
+from web3.exceptions import MethodUnavailable
+from web3.types import BlockData
+
+from brownie._singleton import _Singleton
+
+from .web3 import web3
+
+# number of recent canonical blocks retained to locate the common ancestor of a reorg
+HISTORY_DEPTH: Final = 64
+# shortest delay between checks for a new head, in seconds
+MIN_POLL_INTERVAL: Final = 0.05
+# the tracker stops after this many consecutive failed requests for a new head
+MAX_FAILURES: Final = 5
+
+Block = Union[BlockData, AttributeDict]
+
+
+class Reorg(NamedTuple):
+    """A chain reorganization, emitted before the blocks of the new canonical chain."""
+
+    # blocks which are no longer part of the canonical chain, in ascending order
+    orphaned: List[Block]
+    # number of the block preceding the first block of the new canonical chain
+    ancestor: int
+
+    @property
+    def depth(self) -> int:
+        return len(self.orphaned)
+
+
+HeadEvent = Union[Block, Reorg, BaseException]
+
+
+class HeadSubscription:
+    """
+    A single consumer of the head tracker. New canonical blocks and reorg events
+    are delivered in order through `get`.
+    """
+
+    def __init__(self, tracker: "HeadTracker", max_interval: float) -> None:
+        self._tracker: Final = tracker
+        self.max_interval: Final = max_interval
+        self._queue: Final[Queue[HeadEvent]] = Queue()
+
+    def __enter__(self) -> "HeadSubscription":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def get(self, timeout: Optional[float] = None) -> Union[Block, Reorg]:
+        """
+        Returns the next block or reorg event, blocking until one is available.
+
+        Raises `queue.Empty` if `timeout` is reached, or the exception which
+        stopped the tracker.
+        """
+        event = self._queue.get(timeout=timeout)
+        if isinstance(event, BaseException):
+            raise event
+        return event
+
+    def close(self) -> None:
+        self._tracker._unsubscribe(self)
+
+    def _put(self, event: HeadEvent) -> None:
+        self._queue.put(event)
+
+
+class HeadTracker(metaclass=_Singleton):
+    """
+    Tracks the head of the chain on behalf of every subscriber, using one upstream
+    source for all of them.
+
+    New heads are read from an `eth_newBlockFilter` filter where the client supports
+    one, otherwise by polling for the latest block. The polling interval adapts to
+    the observed block time. A short history of canonical blocks is kept, so that
+    when the parent of a new head is not the previous head the tracker can walk back
+    to the common ancestor and emit a `Reorg` with the orphaned blocks.
+    """
+
+    def __init__(self) -> None:
+        self._lock: Final = threading.Lock()
+        self._wakeup: Final = threading.Event()
+        self._subscribers: Final[Set[HeadSubscription]] = set()
+        self._thread: Optional[threading.Thread] = None
+        # recent canonical blocks, by number
+        self._history: Final[Dict[int, Block]] = {}
+        self._block_time: float = 0.0
+        self.upstream_requests: int = 0
+
+    @property
+    def head(self) -> Optional[Block]:
+        """The most recent canonical block seen by the tracker."""
+        with self._lock:
+            return self._history[max(self._history)] if self._history else None
+
+    def subscribe(self, max_interval: float = 5.0) -> HeadSubscription:
+        """
+        Subscribes to new heads. The current head is delivered first.
+
+        Args:
+            max_interval: Maximum delay between checks for a new head, in seconds.
+        """
+        subscription = HeadSubscription(self, max_interval)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if self._thread is None:
+                self._history.clear()
+                self._thread = threading.Thread(target=self._loop, daemon=True)
+                self._thread.start()
+            elif self._history:
+                subscription._put(self._history[max(self._history)])
+        self._wakeup.set()
+        return subscription
+
+    def _unsubscribe(self, subscription: HeadSubscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+        self._wakeup.set()
+
+    def _loop(self) -> None:
+        try:
+            self._poll()
+        except Exception as exc:
+            self._stop(exc)
+
+    def _poll(self) -> None:
+        block_filter = _new_filter()
+        interval = MIN_POLL_INTERVAL
+        failures = 0
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+                max_interval = min(i.max_interval for i in self._subscribers)
+
+            try:
+                new_head = self._get_new_head(block_filter)
+            except (AttributeError, ValueError, MethodUnavailable):
+                # the filter has expired, the client stopped supporting filters,
+                # or the request failed - retry with a new filter after a delay
+                failures += 1
+                if failures >= MAX_FAILURES:
+                    raise
+                interval = min(interval * 2, max_interval)
+                time.sleep(interval)
+                block_filter = _new_filter()
+                continue
+            failures = 0
+
+            if new_head is None:
+                interval = min(interval * 2, max_interval)
+            else:
+                self._add_head(new_head)
+                # check again shortly before the next block is expected
+                interval = min(max(self._block_time / 4, MIN_POLL_INTERVAL), max_interval)
+
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+
+    def _get_new_head(self, block_filter: Any) -> Optional[Block]:
+        self.upstream_requests += 1
+        if block_filter is not None:
+            hashes = block_filter.get_new_entries()
+            if not hashes and self._history:
+                return None
+            block = web3.eth.get_block(hashes[-1] if hashes else "latest")
+        else:
+            block = web3.eth.get_block("latest")
+        head = self.head
+        if head is not None and block["hash"] == head["hash"]:
+            return None
+        return block
+
+    def _add_head(self, block: Block) -> None:
+        events: List[Union[Block, Reorg]] = []
+        with self._lock:
+            history = self._history
+            head = history[max(history)] if history else None
+            if head is not None and block["number"] > head["number"]:
+                self._block_time = _estimate_block_time(self._block_time, head, block)
+                if block["number"] - head["number"] > HISTORY_DEPTH:
+                    # too far ahead to fill the gap, start a new history
+                    history.clear()
+
+            # walk back from the new head until reaching a canonical block
+            path = [block]
+            lowest = min(history) if history else None
+            while lowest is not None:
+                parent_number = path[-1]["number"] - 1
+                if parent_number < lowest:
+                    # every retained block was orphaned
+                    break
+                if len(path) > HISTORY_DEPTH:
+                    history.clear()
+                    break
+                parent = history.get(parent_number)
+                if parent is not None and parent["hash"] == path[-1]["parentHash"]:
+                    break
+                path.append(web3.eth.get_block(path[-1]["parentHash"]))
+            path.reverse()
+            while path and _is_canonical(history, path[0]):
+                # e.g. a local chain reverted to an earlier block
+                del path[0]
+
+            first_new = path[0]["number"] if path else block["number"] + 1
+            orphaned = [history.pop(i) for i in sorted(history) if i >= first_new]
+            if orphaned:
+                events.append(Reorg(orphaned, first_new - 1))
+            for i in path:
+                history[i["number"]] = i
+                events.append(i)
+            for i in sorted(history)[:-HISTORY_DEPTH]:
+                del history[i]
+            subscribers = list(self._subscribers)
+
+        for subscription in subscribers:
+            for event in events:
+                subscription._put(event)
+
+    def _stop(self, exc: BaseException) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self._subscribers.clear()
+            self._thread = None
+        for subscription in subscribers:
+            subscription._put(exc)
+
+
+def _new_filter() -> Any:
+    # returns a filter for new blocks if the client is connected and supports filtering
+    try:
+        block_filter = web3.eth.filter("latest")
+        block_filter.get_new_entries()
+        return block_filter
+    except (AttributeError, ValueError, MethodUnavailable):
+        return None
+
+
+def _is_canonical(history: Dict[int, Block], block: Block) -> bool:
+    canonical = history.get(block["number"])
+    return canonical is not None and canonical["hash"] == block["hash"]
+
+
+def _estimate_block_time(estimate: float, previous: Block, block: Block) -> float:
+    block_time = (block["timestamp"] - previous["timestamp"]) / (
+        block["number"] - previous["number"]
+    )
+    # exponential moving average, so that a single slow block does not slow polling
+    return block_time if not estimate else estimate * 0.8 + block_time * 0.2
+
+
+head_tracker: Final = HeadTracker()
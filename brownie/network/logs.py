@@ -0,0 +1,638 @@
+#!/usr/bin/python3
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import RLock
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Final,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
+from weakref import WeakKeyDictionary
+
+from eth_typing import ChecksumAddress, HexStr
+from faster_eth_utils import event_abi_to_log_topic
+from requests import HTTPError, Timeout
+from web3._utils.events import get_event_data
+from web3.datastructures import AttributeDict
+from web3.exceptions import BlockNotFound
+from web3.types import ABIEvent, EventData, LogReceipt
+
+from brownie._c_constants import HexBytes, ujson_dumps, ujson_loads
+from brownie._config import CONFIG, _get_data_folder
+from brownie._singleton import _Singleton
+from brownie.exceptions import BrownieEnvironmentError
+from brownie.utils import hexbytes_to_hexstring
+from brownie.utils.sql import Cursor
+
+from .web3 import _resolve_address, web3
+
+# number of blocks requested in a single `eth_getLogs` call, before any splitting
+DEFAULT_CHUNK_SIZE: Final = 10_000
+# maximum number of `eth_getLogs` requests in flight at once
+DEFAULT_MAX_WORKERS: Final = 4
+
+# fragments of the error messages returned by providers when a query spans too many
+# blocks or returns too many results, e.g. "query returned more than 10000 results"
+RANGE_ERROR_MESSAGES: Final = (
+    "block range",
+    "exceed",
+    "limit",
+    "more than",
+    "range is too large",
+    "response size",
+    "timeout",
+    "too large",
+    "too many",
+)
+
+# default number of logs a stream may fetch ahead of its consumer
+DEFAULT_STREAM_BUFFER: Final = 256
+
+LogDecoder = Callable[[LogReceipt], EventData]
+
+# number of recent block hashes retained per chain for detecting reorgs
+BLOCK_HASH_DEPTH: Final = 256
+
+# decoders keyed by (topic0, names and indexing of the event inputs)
+_decoders: Final[Dict[Tuple[HexStr, Tuple[Tuple[str, bool], ...]], LogDecoder]] = {}
+
+
+def get_topic(event_abi: ABIEvent) -> HexStr:
+    """Returns the hex string topic0 of a non-anonymous event."""
+    return HexStr(f"0x{event_abi_to_log_topic(event_abi).hex()}")  # type: ignore [arg-type]
+
+
+def get_decoder(event_abi: ABIEvent) -> LogDecoder:
+    """
+    Returns a cached decoder for logs of the given event.
+
+    Decoders are shared between all contracts which emit an event with the same
+    signature and the same indexed layout.
+    """
+    layout = tuple((i["name"], i.get("indexed", False)) for i in event_abi["inputs"])
+    key = (get_topic(event_abi), layout)
+    decoder = _decoders.get(key)
+    if decoder is None:
+        decoder = _decoders.setdefault(key, partial(get_event_data, web3.codec, event_abi))
+    return decoder
+
+
+def get_logs(
+    address: Union[ChecksumAddress, Sequence[ChecksumAddress], None],
+    topics: Optional[Sequence[HexStr]],
+    from_block: int,
+    to_block: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> List[LogReceipt]:
+    """
+    Fetches all logs matching any of `topics` between two blocks, inclusive.
+
+    The range is split into chunks of `chunk_size` blocks which are requested
+    concurrently, using one `eth_getLogs` call per chunk for all of the topics.
+    When a provider rejects a chunk because it spans too many blocks or returns
+    too many results, the chunk is halved and retried until it succeeds.
+
+    Args:
+        address: Address or list of addresses that emitted the logs. If `None`,
+            logs from every address are returned.
+        topics: Possible values for topic0. If `None`, all logs are returned.
+        from_block: First block to fetch logs from.
+        to_block: Last block to fetch logs from.
+        chunk_size: Initial number of blocks per `eth_getLogs` request.
+        max_workers: Maximum number of concurrent requests.
+
+    Returns:
+        Raw log receipts, ordered by block number and log index.
+    """
+    if from_block > to_block:
+        return []
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+
+    params: Dict[str, Any] = {}
+    if address is not None:
+        params["address"] = address if isinstance(address, str) else list(address)
+    if topics is not None:
+        params["topics"] = [list(topics)]
+
+    ranges = [
+        (start, min(start + chunk_size - 1, to_block))
+        for start in range(from_block, to_block + 1, chunk_size)
+    ]
+    if len(ranges) == 1 or max_workers < 2:
+        chunks = [_get_logs_in_range(params, *i) for i in ranges]
+    else:
+        with ThreadPoolExecutor(min(max_workers, len(ranges))) as executor:
+            chunks = list(executor.map(lambda i: _get_logs_in_range(params, *i), ranges))
+
+    return [log for chunk in chunks for log in chunk]
+
+
+def decode_logs(
+    logs: Sequence[LogReceipt], event_abis: Sequence[ABIEvent]
+) -> Dict[str, List[EventData]]:
+    """
+    Decodes raw logs against the given events, grouping the results by event name.
+
+    Logs whose topic0 does not match any of the events are ignored.
+    """
+    decoders: Dict[HexStr, Tuple[str, LogDecoder]] = {
+        get_topic(abi): (abi["name"], get_decoder(abi)) for abi in event_abis
+    }
+    result: Dict[str, List[EventData]] = {abi["name"]: [] for abi in event_abis}
+    for log in logs:
+        if not log["topics"]:
+            continue
+        match = decoders.get(hexbytes_to_hexstring(log["topics"][0]))
+        if match is not None:
+            name, decoder = match
+            result[name].append(decoder(log))
+    return result
+
+
+def _get_logs_in_range(params: Dict[str, Any], start: int, stop: int) -> List[LogReceipt]:
+    try:
+        return web3.eth.get_logs({**params, "fromBlock": start, "toBlock": stop})
+    except (ValueError, HTTPError, Timeout) as exc:
+        if start == stop or not _is_range_error(exc):
+            raise
+
+    middle = (start + stop) // 2
+    return _get_logs_in_range(params, start, middle) + _get_logs_in_range(params, middle + 1, stop)
+
+
+def _is_range_error(exc: Exception) -> bool:
+    if isinstance(exc, Timeout):
+        return True
+    if isinstance(exc, HTTPError):
+        # 413 payload too large, or a gateway timing out on a heavy query
+        return exc.response is not None and exc.response.status_code in (413, 502, 503, 504)
+    error = exc.args[0] if exc.args else ""
+    message = error.get("message", "") if isinstance(error, dict) else str(error)
+    message = message.lower()
+    return any(i in message for i in RANGE_ERROR_MESSAGES)
+
+
+class EventIndex(metaclass=_Singleton):
+    """
+    Persistent local index of contract event logs.
+
+    Logs are stored in `events.db` within the brownie data folder, alongside the
+    deployments database, with a separate set of tables for each chain. Each indexed
+    address covers one contiguous range of blocks which is extended by `sync`. Hashes
+    of the most recent synced blocks are stored, so that indexed logs can be rolled
+    back when a chain reorganization is detected.
+
+    The index is only available on persistent networks, i.e. those with a `chainid`.
+    """
+
+    def __init__(self) -> None:
+        self._lock: Final = RLock()
+        self._cur: Optional[Cursor] = None
+        self._tables: Set[str] = set()
+
+    def _get_chain(self) -> str:
+        try:
+            chain_id = CONFIG.active_network["chainid"]
+        except KeyError:
+            raise BrownieEnvironmentError(
+                "Functionality not available in local environment"
+            ) from None
+        if self._cur is None:
+            self._cur = Cursor(_get_data_folder().joinpath("events.db"))
+        chain = f"chain{chain_id}"
+        if chain not in self._tables:
+            self._cur.execute(
+                f"CREATE TABLE IF NOT EXISTS logs_{chain} (address, topic0, block_number INTEGER, "
+                "log_index INTEGER, block_hash, transaction_hash, transaction_index INTEGER, "
+                "topics, data, PRIMARY KEY (block_number, log_index))"
+            )
+            self._cur.execute(
+                f"CREATE INDEX IF NOT EXISTS logs_{chain}_address "
+                f"ON logs_{chain} (address, block_number)"
+            )
+            self._cur.execute(
+                f"CREATE INDEX IF NOT EXISTS logs_{chain}_topic0 "
+                f"ON logs_{chain} (topic0, block_number)"
+            )
+            self._cur.execute(
+                f"CREATE TABLE IF NOT EXISTS synced_{chain} "
+                "(address PRIMARY KEY, from_block INTEGER, to_block INTEGER)"
+            )
+            self._cur.execute(
+                f"CREATE TABLE IF NOT EXISTS blocks_{chain} "
+                "(block_number INTEGER PRIMARY KEY, hash)"
+            )
+            self._tables.add(chain)
+        return chain
+
+    def synced_range(self, address: str) -> Optional[Tuple[int, int]]:
+        """
+        Returns the range of blocks indexed for an address.
+
+        Args:
+            address: Address of the contract.
+
+        Returns:
+            A (from_block, to_block) tuple, inclusive, or `None` if the address
+            has not been indexed.
+        """
+        with self._lock:
+            chain = self._get_chain()
+            row = self._cur.fetchone(
+                f"SELECT from_block, to_block FROM synced_{chain} WHERE address=?",
+                (_resolve_address(address),),
+            )
+        return (row[0], row[1]) if row else None
+
+    def covers(self, address: str, from_block: int, to_block: int) -> bool:
+        """Returns True if logs for an address are indexed over the given range of blocks."""
+        if "chainid" not in CONFIG.active_network:
+            return False
+        synced = self.synced_range(address)
+        return synced is not None and synced[0] <= from_block and to_block <= synced[1]
+
+    def sync(
+        self,
+        address: str,
+        from_block: int = 0,
+        to_block: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> int:
+        """
+        Index the logs emitted by an address.
+
+        Only blocks outside of the already indexed range are fetched. Before fetching,
+        stored block hashes are compared against the chain and any logs from blocks
+        that were reorganized out are removed.
+
+        Args:
+            address: Address of the contract.
+            from_block: First block to index.
+            to_block: Last block to index. Defaults to the latest block.
+            chunk_size: Initial number of blocks per `eth_getLogs` request.
+            max_workers: Maximum number of concurrent requests.
+
+        Returns:
+            The number of logs added to the index.
+        """
+        address = _resolve_address(address)
+        with self._lock:
+            chain = self._get_chain()
+            self._check_reorg(chain)
+
+            latest = web3.eth.block_number
+            to_block = latest if to_block is None else min(to_block, latest)
+            if from_block > to_block:
+                return 0
+
+            ranges = [(from_block, to_block)]
+            synced = self.synced_range(address)
+            if synced is not None:
+                ranges = [
+                    i
+                    for i in ((from_block, synced[0] - 1), (synced[1] + 1, to_block))
+                    if i[0] <= i[1]
+                ]
+                from_block, to_block = min(from_block, synced[0]), max(to_block, synced[1])
+
+            count = 0
+            for start, stop in ranges:
+                logs = get_logs(address, None, start, stop, chunk_size, max_workers)
+                self._insert(chain, logs)
+                count += len(logs)
+
+            block_hash = hexbytes_to_hexstring(web3.eth.get_block(to_block)["hash"])
+            self._cur.insert(f"synced_{chain}", address, from_block, to_block)
+            self._cur.insert(f"blocks_{chain}", to_block, block_hash)
+            self._cur.execute(
+                f"DELETE FROM blocks_{chain} WHERE block_number < ?",
+                (to_block - BLOCK_HASH_DEPTH,),
+            )
+        return count
+
+    def get_logs(
+        self,
+        address: Optional[str] = None,
+        topics: Optional[Sequence[HexStr]] = None,
+        from_block: int = 0,
+        to_block: Optional[int] = None,
+    ) -> List[AttributeDict]:
+        """
+        Query indexed logs.
+
+        Args:
+            address: Address that emitted the logs. If `None`, logs from every
+                indexed address are returned.
+            topics: Possible values for topic0. If `None`, all logs are returned.
+            from_block: First block to return logs from.
+            to_block: Last block to return logs from. Defaults to the last indexed block.
+
+        Returns:
+            Log receipts, ordered by block number and log index.
+        """
+        query = ["block_number >= ?"]
+        args: List[Any] = [from_block]
+        if to_block is not None:
+            query.append("block_number <= ?")
+            args.append(to_block)
+        if address is not None:
+            query.append("address = ?")
+            args.append(_resolve_address(address))
+        if topics is not None:
+            query.append(f"topic0 IN ({','.join('?' * len(topics))})")
+            args.extend(i.lower() for i in topics)
+
+        with self._lock:
+            chain = self._get_chain()
+            rows = self._cur.fetchall(
+                "SELECT address, block_number, log_index, block_hash, transaction_hash, "
+                f"transaction_index, topics, data FROM logs_{chain} "
+                f"WHERE {' AND '.join(query)} ORDER BY block_number, log_index",
+                args,
+            )
+        return [_row_to_log(row) for row in rows]
+
+    def rollback(self, height: int) -> None:
+        """
+        Remove all indexed logs above a block height.
+
+        The indexed range of each address is truncated to end at `height`.
+        """
+        with self._lock:
+            chain = self._get_chain()
+            self._cur.execute(f"DELETE FROM logs_{chain} WHERE block_number > ?", (height,))
+            self._cur.execute(f"DELETE FROM blocks_{chain} WHERE block_number > ?", (height,))
+            self._cur.execute(
+                f"UPDATE synced_{chain} SET to_block = ? WHERE to_block > ?", (height, height)
+            )
+            self._cur.execute(f"DELETE FROM synced_{chain} WHERE to_block < from_block")
+
+    def _check_reorg(self, chain: str) -> None:
+        # walk back through the stored block hashes until one matches the chain,
+        # everything above the matching block is rolled back
+        height = None
+        rows = self._cur.fetchall(
+            f"SELECT block_number, hash FROM blocks_{chain} ORDER BY block_number DESC"
+        )
+        for block_number, block_hash in rows:
+            try:
+                block = web3.eth.get_block(block_number)
+            except BlockNotFound:
+                # the chain is shorter than the stored height. other errors are raised
+                # without touching the index
+                block = None
+            if block is not None and hexbytes_to_hexstring(block["hash"]) == block_hash:
+                if height is not None:
+                    height = block_number
+                break
+            height = block_number - 1
+        if height is not None:
+            self.rollback(height)
+
+    def _insert(self, chain: str, logs: List[LogReceipt]) -> None:
+        rows = []
+        for log in logs:
+            topics = [hexbytes_to_hexstring(i) for i in log["topics"]]
+            rows.append(
+                (
+                    log["address"],
+                    topics[0] if topics else None,
+                    log["blockNumber"],
+                    log["logIndex"],
+                    hexbytes_to_hexstring(log["blockHash"]),
+                    hexbytes_to_hexstring(log["transactionHash"]),
+                    log["transactionIndex"],
+                    ujson_dumps(topics),
+                    hexbytes_to_hexstring(HexBytes(log["data"])),
+                )
+            )
+        if rows:
+            self._cur.executemany(
+                f"INSERT OR REPLACE INTO logs_{chain} VALUES (?,?,?,?,?,?,?,?,?)", rows
+            )
+            # hashes of blocks containing logs are kept to locate the fork point of a reorg
+            self._cur.executemany(
+                f"INSERT OR REPLACE INTO blocks_{chain} VALUES (?,?)", {(i[2], i[4]) for i in rows}
+            )
+
+
+def _row_to_log(row: Tuple) -> AttributeDict:
+    address, block_number, log_index, block_hash, tx_hash, tx_index, topics, data = row
+    return AttributeDict(
+        {
+            "address": address,
+            "blockNumber": block_number,
+            "logIndex": log_index,
+            "blockHash": HexBytes(block_hash),
+            "transactionHash": HexBytes(tx_hash),
+            "transactionIndex": tx_index,
+            "topics": [HexBytes(i) for i in ujson_loads(topics)],
+            "data": HexBytes(data),
+            "removed": False,
+        }
+    )
+
+
+# persistent index of event logs, used by `ContractEvents.get_sequence` when it covers
+# the requested range
+event_index: Final = EventIndex()
+
+
+class _LogStream:
+    """The position and undelivered logs of a single stream."""
+
+    __slots__ = ("address", "topic", "delay", "next_block", "last", "queue", "stalled", "error")
+
+    def __init__(
+        self,
+        address: ChecksumAddress,
+        topic: Optional[HexStr],
+        from_block: int,
+        delay: float,
+        buffer_size: int,
+    ) -> None:
+        self.address = address
+        self.topic = topic
+        self.delay = delay
+        # the first block which has not been fully delivered
+        self.next_block = from_block
+        # (block number, log index) of the last delivered log
+        self.last: Tuple[int, int] = (from_block, -1)
+        self.queue: asyncio.Queue[Optional[LogReceipt]] = asyncio.Queue(buffer_size)
+        self.stalled = False
+        self.error: Optional[BaseException] = None
+
+    def deliver(self, logs: List[LogReceipt], to_block: int) -> None:
+        for log in logs:
+            position = (log["blockNumber"], log["logIndex"])
+            if position <= self.last or log["address"] != self.address:
+                continue
+            if self.topic is not None and (
+                not log["topics"] or hexbytes_to_hexstring(log["topics"][0]) != self.topic
+            ):
+                continue
+            if self.queue.full():
+                # the consumer is behind - resume from this block once it catches up
+                self.next_block = position[0]
+                self.stalled = True
+                return
+            self.queue.put_nowait(log)
+            self.last = position
+        self.next_block = to_block + 1
+
+    def fail(self, exc: BaseException) -> None:
+        self.error = exc
+        if not self.queue.full():
+            # wake the consumer, the error is raised once the queue is drained
+            self.queue.put_nowait(None)
+
+
+class LogPoller:
+    """
+    Polls `eth_getLogs` on behalf of every log stream within an event loop.
+
+    Streams which are waiting on the same block share a single request, and
+    requests run in the loop's default executor so the loop is never blocked.
+    A stream whose buffer is full is skipped until its consumer catches up, so
+    a slow consumer does not hold up other streams or buffer unbounded logs.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop: Final = loop
+        self._streams: Final[Set[_LogStream]] = set()
+        self._wakeup: Final = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # maximum number of blocks fetched for a stream in each poll
+        self.chunk_size: int = DEFAULT_CHUNK_SIZE
+        self.requests: int = 0
+
+    def subscribe(
+        self,
+        address: ChecksumAddress,
+        topic: Optional[HexStr],
+        from_block: int,
+        delay: float,
+        buffer_size: int,
+    ) -> _LogStream:
+        stream = _LogStream(address, topic, from_block, delay, buffer_size)
+        self._streams.add(stream)
+        if self._task is None or self._task.done():
+            self._task = self._loop.create_task(self._run())
+        self.wake()
+        return stream
+
+    def unsubscribe(self, stream: _LogStream) -> None:
+        self._streams.discard(stream)
+
+    def wake(self) -> None:
+        """Polls immediately, instead of waiting for the next scheduled poll."""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while self._streams:
+            self._wakeup.clear()
+            await self._poll()
+            if not self._streams:
+                break
+            try:
+                delay = min(i.delay for i in self._streams)
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self) -> None:
+        try:
+            head: int = await self._loop.run_in_executor(None, lambda: web3.eth.block_number)
+        except Exception as exc:
+            self._fail(list(self._streams), exc)
+            return
+
+        groups: Dict[int, List[_LogStream]] = {}
+        for stream in self._streams:
+            if stream.next_block <= head and not stream.queue.full():
+                groups.setdefault(stream.next_block, []).append(stream)
+
+        for from_block, streams in sorted(groups.items()):
+            to_block = min(head, from_block + self.chunk_size - 1)
+            addresses = sorted({i.address for i in streams})
+            topics: Optional[List[HexStr]] = None
+            if all(i.topic is not None for i in streams):
+                topics = sorted({cast(HexStr, i.topic) for i in streams})
+            try:
+                logs = await self._loop.run_in_executor(
+                    None, get_logs, addresses, topics, from_block, to_block
+                )
+            except Exception as exc:
+                self._fail(streams, exc)
+                continue
+            self.requests += 1
+            for stream in streams:
+                if stream in self._streams:
+                    stream.deliver(logs, to_block)
+
+    def _fail(self, streams: List[_LogStream], exc: Exception) -> None:
+        for stream in streams:
+            self._streams.discard(stream)
+            stream.fail(exc)
+
+
+async def stream_logs(
+    address: ChecksumAddress,
+    topic: Optional[HexStr],
+    from_block: Optional[int] = None,
+    delay: float = 2.0,
+    buffer_size: int = DEFAULT_STREAM_BUFFER,
+) -> AsyncIterator[LogReceipt]:
+    """
+    Asynchronously yields the logs emitted by `address`, in order, as they occur.
+
+    All streams within an event loop are served by one `LogPoller`, so many
+    streams can run concurrently without a thread per stream.
+
+    Args:
+        address: Address that emitted the logs.
+        topic: Value of topic0 to match, or `None` to yield every log from `address`.
+        from_block: First block to yield logs from. If `None`, only logs in blocks
+            mined after the stream is started are yielded.
+        delay: Maximum delay between checks for new logs, in seconds.
+        buffer_size: Maximum number of logs fetched ahead of the consumer.
+    """
+    loop = asyncio.get_running_loop()
+    if from_block is None:
+        from_block = await loop.run_in_executor(None, lambda: web3.eth.block_number) + 1
+    poller = _pollers.get(loop)
+    if poller is None:
+        poller = _pollers[loop] = LogPoller(loop)
+
+    stream = poller.subscribe(address, topic, from_block, delay, buffer_size)
+    try:
+        while True:
+            if stream.error is not None and stream.queue.empty():
+                raise stream.error
+            log = await stream.queue.get()
+            if log is None:
+                raise cast(BaseException, stream.error)
+            if stream.stalled:
+                stream.stalled = False
+                poller.wake()
+            yield log
+    finally:
+        poller.unsubscribe(stream)
+
+
+# log pollers keyed by the event loop they run in
+_pollers: Final["WeakKeyDictionary[asyncio.AbstractEventLoop, LogPoller]"] = WeakKeyDictionary()
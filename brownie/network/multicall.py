@@ -1,8 +1,9 @@
-from collections import defaultdict
-from dataclasses import dataclass
-from threading import Lock, get_ident
-from types import FunctionType, TracebackType
-from typing import Any, Dict, List, Optional, Tuple, Union
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from functools import partial
+from threading import get_ident
+from types import TracebackType
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from lazy_object_proxy import Proxy
 from wrapt import ObjectProxy
@@ -12,22 +13,44 @@ from brownie._config import BROWNIE_FOLDER, CONFIG
 from brownie.exceptions import ContractNotFound
 from brownie.network import accounts, web3
 from brownie.network.contract import Contract, ContractCall
+from brownie.network.state import _active_multicall
 from brownie.project import compile_source
 from brownie.utils import color
 
 DATA_DIR = BROWNIE_FOLDER.joinpath("data")
 MULTICALL2_ABI = ujson_loads(DATA_DIR.joinpath("interfaces", "Multicall2.json").read_text())
 MULTICALL2_SOURCE = DATA_DIR.joinpath("contracts", "Multicall2.sol").read_text()
+MULTICALL3_ABI = ujson_loads(DATA_DIR.joinpath("interfaces", "Multicall3.json").read_text())
+MULTICALL3_SOURCE = DATA_DIR.joinpath("contracts", "Multicall3.sol").read_text()
+
+# selector of `Multicall3.aggregate3`, used to identify the version of a deployment
+AGGREGATE3_SELECTOR = "82ad56cb"
+# the selector is pushed with PUSH4 in the dispatcher, which avoids matching it
+# by chance elsewhere in the bytecode
+AGGREGATE3_DISPATCH = f"63{AGGREGATE3_SELECTOR}"
 
 
 @dataclass
 class Call:
 
     calldata: Tuple[str, bytes]
-    decoder: FunctionType
+    decoder: Callable[[bytes], Any]
     readable: str
 
 
+@dataclass
+class Batch:
+    """Settings and pending calls for a single `with multicall` block."""
+
+    block_number: Union[str, bytes, int, None] = None
+    verbose: Optional[bool] = None
+    address: Optional[str] = None
+    contract: Optional[Contract] = None
+    version: int = 3
+    pending: List["Result"] = field(default_factory=list)
+    tokens: Optional[Tuple[Token, Token]] = None
+
+
 class Result(ObjectProxy):
     """A proxy object to be updated with the result of a multicall."""
 
@@ -42,27 +65,53 @@ class LazyResult(Proxy):
         return repr(self.__wrapped__)
 
 
+# the batch of the `with multicall` block active in the current thread or async task
+_active_batch: ContextVar[Optional[Batch]] = ContextVar("multicall_batch", default=None)
+# settings given via `multicall(...)`, consumed when the context manager is entered
+_next_batch: ContextVar[Optional[Batch]] = ContextVar("multicall_next_batch", default=None)
+
+
 class Multicall:
-    """Context manager for batching multiple calls to constant contract functions."""
+    """Context manager for batching multiple calls to constant contract functions.
 
-    _lock = Lock()
+    Batching state, including the block and multicall contract in use, is held in
+    context variables, so each thread and each asyncio task has its own independent
+    queue of pending calls. `ContractCall.__call__`
+    checks for an active multicall via `brownie.network.state._active_multicall`."""
 
     def __init__(self) -> None:
-        self.address = None
         self.default_verbose = False
-        self._block_number = defaultdict(lambda: None)
-        self._verbose = defaultdict(lambda: None)
-        self._contract = None
-        self._pending_calls: Dict[int, List[Call]] = defaultdict(list)
 
-        setattr(ContractCall, "__original_call_code", ContractCall.__call__.__code__)
-        setattr(ContractCall, "__proxy_call_code", self._proxy_call.__code__)
-        setattr(ContractCall, "__multicall", defaultdict(lambda: None))
-        ContractCall.__call__.__code__ = self._proxy_call.__code__
+    @property
+    def address(self) -> Optional[str]:
+        batch = _active_batch.get() or _next_batch.get()
+        if batch and batch.address:
+            return batch.address
+        # the multicall contract configured or deployed on the active network
+        if CONFIG.network_type is None:
+            return None
+        active_network = CONFIG.active_network
+        return active_network.get("multicall3") or active_network.get("multicall2")
 
     @property
-    def block_number(self) -> int:
-        return self._block_number[get_ident()]
+    def block_number(self) -> Union[str, bytes, int, None]:
+        batch = _active_batch.get() or _next_batch.get()
+        return batch.block_number if batch else None
+
+    @property
+    def _contract(self) -> Optional[Contract]:
+        batch = _active_batch.get()
+        return batch.contract if batch else None
+
+    @property
+    def _version(self) -> Optional[int]:
+        batch = _active_batch.get()
+        return batch.version if batch else None
+
+    @property
+    def _pending_calls(self) -> List[Result]:
+        batch = _active_batch.get()
+        return batch.pending if batch else []
 
     def __call__(
         self,
@@ -70,122 +119,144 @@ class Multicall:
         block_identifier: Union[str, bytes, int, None] = None,
         verbose: Optional[bool] = None,
     ) -> "Multicall":
-        self.address = address
-        self._block_number[get_ident()] = block_identifier
-        self._verbose[get_ident()] = verbose if verbose is not None else self.default_verbose
+        _next_batch.set(Batch(block_identifier, verbose, address))
         return self
 
-    def _flush(self, future_result: Result = None) -> Any:
-        pending_calls = self._pending_calls[get_ident()]
-        self._pending_calls[get_ident()] = []
+    def _flush(self, batch: Batch, future_result: Result = None) -> Any:
+        pending_calls, batch.pending = batch.pending, []
 
         if not pending_calls:
             # either all calls have already been made
             # or this result has already been retrieved
             return future_result
-        with self._lock:
-            if self._verbose.get(get_ident(), self.default_verbose):
-                message = (
-                    "Multicall:"
-                    f"\n  Thread ID: {get_ident()}"
-                    f"\n  Block number: {self._block_number[get_ident()]}"
-                    f"\n  Calls: {len(pending_calls)}"
-                )
-                for c, item in enumerate(pending_calls, start=1):
-                    u = "\u2514" if c == len(pending_calls) else "\u251c"
-                    message = f"{message}\n    {u}\u2500{item.readable}"
-                print(color.highlight(f"{message}\n"))
-
-            ContractCall.__call__.__code__ = getattr(ContractCall, "__original_call_code")
-            try:
-                results = self._contract.tryAggregate(
-                    False,
-                    [_call.calldata for _call in pending_calls],
-                    block_identifier=self._block_number[get_ident()],
-                )
-            finally:
-                ContractCall.__call__.__code__ = getattr(ContractCall, "__proxy_call_code")
-
-        for _call, result in zip(pending_calls, results):
-            _call.__wrapped__ = _call.decoder(result[1]) if result[0] else None
+
+        verbose = self.default_verbose if batch.verbose is None else batch.verbose
+        if verbose:
+            message = (
+                "Multicall:"
+                f"\n  Thread ID: {get_ident()}"
+                f"\n  Block number: {batch.block_number}"
+                f"\n  Calls: {len(pending_calls)}"
+            )
+            for c, item in enumerate(pending_calls, start=1):
+                u = "\u2514" if c == len(pending_calls) else "\u251c"
+                message = f"{message}\n    {u}\u2500{item.readable}"
+            print(color.highlight(f"{message}\n"))
+
+        # identical calls within the same batch share a single slot in the aggregate call
+        slots: Dict[Tuple[str, str], int] = {}
+        for _call in pending_calls:
+            slots.setdefault(_call.calldata, len(slots))
+
+        # `call` is used explicitly, `__call__` would add the aggregate call to the batch
+        if batch.version == 3:
+            results = batch.contract.aggregate3.call(
+                [(target, True, calldata) for target, calldata in slots],
+                block_identifier=batch.block_number,
+            )
+        else:
+            results = batch.contract.tryAggregate.call(
+                False, list(slots), block_identifier=batch.block_number
+            )
+
+        for _call in pending_calls:
+            success, returndata = results[slots[_call.calldata]]
+            _call.__wrapped__ = _call.decoder(returndata) if success else None
 
         return future_result
 
     def flush(self) -> Any:
         """Flush the pending queue of calls, retrieving all the results."""
-        return self._flush()
+        batch = _active_batch.get()
+        if batch is not None:
+            self._flush(batch)
 
-    def _call_contract(self, call: ContractCall, *args: Any, **kwargs: Any) -> Proxy:
+    def _call_contract(self, call: ContractCall, *args: Any, raw: bool = False) -> Proxy:
         """Add a call to the buffer of calls to be made"""
-        calldata = (call._address, call.encode_input(*args, **kwargs))
+        calldata = (call._address, call.encode_input(*args))
         readable = f"{call._name}({', '.join(str(i) for i in args)})"
-        call_obj = Call(calldata, call.decode_output, readable)
+        decoder = partial(call.decode_output, raw=True) if raw else call.decode_output
+        return self._add_call(Call(calldata, decoder, readable))
+
+    def _get_eth_balance(self, address: str) -> Proxy:
+        """Add a `getEthBalance` query to the buffer of calls to be made"""
+        fn = _active_batch.get().contract.getEthBalance
+        calldata = (fn._address, fn.encode_input(address))
+        return self._add_call(Call(calldata, fn.decode_output, f"getEthBalance({address})"))
+
+    def _add_call(self, call_obj: Call) -> Proxy:
+        batch = _active_batch.get()
         # future result
         result = Result(call_obj)
-        self._pending_calls[get_ident()].append(result)
+        batch.pending.append(result)
 
-        return LazyResult(lambda: self._flush(result))
-
-    @staticmethod
-    def _proxy_call(*args: Any, **kwargs: Any) -> Any:
-        """Proxy code which substitutes `ContractCall.__call__"""
-        if self := getattr(ContractCall, "__multicall", {}).get(get_ident()):
-            return self._call_contract(*args, **kwargs)
-
-        # standard call we let pass through
-        ContractCall.__call__.__code__ = getattr(ContractCall, "__original_call_code")
-        try:
-            result = ContractCall.__call__(*args, **kwargs)
-        finally:
-            ContractCall.__call__.__code__ = getattr(ContractCall, "__proxy_call_code")
-        return result
+        return LazyResult(lambda: self._flush(batch, result))
 
     def __enter__(self) -> "Multicall":
-        """Enter the Context Manager and substitute `ContractCall.__call__`"""
-        # we set the code objects on ContractCall class so we can grab them later
+        """Enter the Context Manager and begin batching calls in the current context"""
+        batch = _next_batch.get() or Batch()
+        _next_batch.set(None)
 
         active_network = CONFIG.active_network
 
-        if "multicall2" in active_network:
-            self.address = active_network["multicall2"]
+        if "multicall3" in active_network:
+            batch.address = active_network["multicall3"]
+        elif "multicall2" in active_network:
+            batch.address = active_network["multicall2"]
         elif "cmd" in active_network:
-            deployment = self.deploy({"from": accounts[0]})
-            self.address = deployment.address
-            self._block_number[get_ident()] = deployment.tx.block_number
+            deployment = self.deploy({"from": accounts[0]}, version=3)
+            batch.address = deployment.address
+            batch.block_number = deployment.tx.block_number
 
-        self._block_number[get_ident()] = (
-            self._block_number[get_ident()] or web3.eth.get_block_number()
-        )
+        batch.block_number = batch.block_number or web3.eth.get_block_number()
 
-        if self.address is None:
+        if batch.address is None:
             raise ContractNotFound(
                 "Must set Multicall address via `brownie.multicall(address=...)`"
             )
-        elif not web3.eth.get_code(self.address, block_identifier=self.block_number):
+
+        code = web3.eth.get_code(batch.address, block_identifier=batch.block_number)
+        if not code:
             raise ContractNotFound(
-                f"Multicall at address {self.address} does not exist at block {self.block_number}"
+                f"Multicall at address {batch.address} does not exist at block {batch.block_number}"
             )
 
-        self._contract = Contract.from_abi("Multicall", self.address, MULTICALL2_ABI)
-        getattr(ContractCall, "__multicall")[get_ident()] = self
+        if AGGREGATE3_DISPATCH in code.hex():
+            batch.version = 3
+            batch.contract = Contract.from_abi("Multicall", batch.address, MULTICALL3_ABI)
+        else:
+            batch.version = 2
+            batch.contract = Contract.from_abi("Multicall", batch.address, MULTICALL2_ABI)
 
-    def __exit__(self, exc_type: Exception, exc_val: Any, exc_tb: TracebackType) -> None:
-        """Exit the Context Manager and reattach original `ContractCall.__call__` code"""
-        self.flush()
-        getattr(ContractCall, "__multicall")[get_ident()] = None
+        batch.tokens = (_active_batch.set(batch), _active_multicall.set(self))
+        return self
 
-        self._block_number.pop(get_ident(), None)
-        self._verbose.pop(get_ident(), None)
+    def __exit__(self, exc_type: Exception, exc_val: Any, exc_tb: TracebackType) -> None:
+        """Exit the Context Manager and stop batching calls in the current context"""
+        batch = _active_batch.get()
+        try:
+            self._flush(batch)
+        finally:
+            batch_token, multicall_token = batch.tokens
+            _active_multicall.reset(multicall_token)
+            _active_batch.reset(batch_token)
 
     @staticmethod
-    def deploy(tx_params: Dict) -> Contract:
-        """Deploy an instance of the `Multicall2` contract.
+    def deploy(tx_params: Dict, version: int = 2) -> Contract:
+        """Deploy an instance of the `Multicall2` or `Multicall3` contract.
+
+        The deployment is used for all subsequent multicalls on the active network.
 
         Args:
-            tx_params: parameters passed to the `deploy` method of the `Multicall2` contract
+            tx_params: parameters passed to the `deploy` method of the multicall contract
                 container.
+            version: version of the multicall contract to deploy, either 2 or 3.
         """
-        project = compile_source(MULTICALL2_SOURCE)
-        deployment = project.Multicall2.deploy(tx_params)
-        CONFIG.active_network["multicall2"] = deployment.address
+        if version not in (2, 3):
+            raise ValueError("Multicall version must be 2 or 3")
+        source = MULTICALL3_SOURCE if version == 3 else MULTICALL2_SOURCE
+        project = compile_source(source)
+        deployment = project[f"Multicall{version}"].deploy(tx_params)
+        CONFIG.active_network.pop("multicall3" if version == 2 else "multicall2", None)
+        CONFIG.active_network[f"multicall{version}"] = deployment.address
         return deployment
@@ -1,9 +1,14 @@
 #!/usr/bin/python3
 
-import gc
+import os
+import pickle
+import tempfile
 import threading
 import time
 import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
 from pathlib import Path
 from sqlite3 import OperationalError
 from typing import (
@@ -15,6 +20,7 @@ from typing import (
     Iterator,
     List,
     Optional,
+    Sequence,
     Tuple,
     Union,
     final,
@@ -25,14 +31,14 @@ from web3.datastructures import AttributeDict
 from web3.types import BlockData
 
 import brownie.network.rpc as rpc
-from brownie._c_constants import sha1
+from brownie._c_constants import deque, sha1
 from brownie._config import CONFIG, _get_data_folder
 from brownie._singleton import _Singleton
 from brownie.convert import Wei
 from brownie.exceptions import BrownieEnvironmentError, CompilerError
 from brownie.project.build import DEPLOYMENT_KEYS
 from brownie.typing import ContractBuildJson, ContractName, Count, PCMap, ProgramCounter
-from brownie.utils import bytes_to_hexstring
+from brownie.utils import bytes_to_hexstring, hexbytes_to_hexstring
 from brownie.utils.sql import Cursor
 
 from .transaction import TransactionReceipt
@@ -40,6 +46,8 @@ from .web3 import _resolve_address, web3
 
 if TYPE_CHECKING:
     from .contract import Contract, ProjectContract
+    from .head import Reorg
+    from .multicall import Multicall
 
 PathMap = Dict[str, Tuple[HexStr, str]]
 Deployment = Tuple[ContractBuildJson, Dict[str, Any]]
@@ -47,9 +55,23 @@ Deployment = Tuple[ContractBuildJson, Dict[str, Any]]
 AnyContract = Union["Contract", "ProjectContract"]
 
 _contract_map: Final[Dict[ChecksumAddress, AnyContract]] = {}
-_revert_refs: Final[List[weakref.ReferenceType]] = []
+# objects notified on reverts and resets, keyed by id and removed when they are collected
+_revert_refs: Final[Dict[int, weakref.ReferenceType]] = {}
 
-cur: Final = Cursor(_get_data_folder().joinpath("deployments.db"))
+# multicall that constant calls are batched into within the current thread or async task
+_active_multicall: Final[ContextVar[Optional["Multicall"]]] = ContextVar(
+    "active_multicall", default=None
+)
+
+# maximum number of blocks retained by the block cache
+BLOCK_CACHE_SIZE: Final = 4096
+# on live networks, blocks this far behind the highest known block are assumed final
+REORG_DEPTH: Final = 64
+
+# maximum number of values bound to a single deployments query
+QUERY_CHUNK_SIZE: Final = 500
+
+cur: Final = Cursor(_get_data_folder().joinpath("deployments.db"), wal=True)
 cur.execute("CREATE TABLE IF NOT EXISTS sources (hash PRIMARY KEY, source)")
 
 
@@ -57,49 +79,164 @@ cur.execute("CREATE TABLE IF NOT EXISTS sources (hash PRIMARY KEY, source)")
 class TxHistory(metaclass=_Singleton):
     """List-like singleton container that contains TransactionReceipt objects.
     Whenever a transaction is broadcast, the TransactionReceipt is automatically
-    added to this container."""
+    added to this container.
+
+    Transactions are indexed by hash, sender, receiver, sender and nonce, and
+    status, so that lookups do not scan the whole history. Dropped transactions
+    are removed as soon as they are marked as dropped.
+
+    Memory use is bounded by the `history` config settings: the oldest confirmed
+    receipts beyond `max_receipts` are moved to a local store and loaded again
+    when accessed, and traces are released beyond `max_trace_bytes` or, with
+    `drop_traces`, as soon as they have been expanded."""
 
     def __init__(self) -> None:
         self._list: List[TransactionReceipt] = []
+        self._lock: Final = threading.RLock()
+        self._index: Final = _TxIndex()
+        self._store: Optional[_ReceiptStore] = None
+        # receipts in the history that hold a trace, least recently loaded first
+        self._traces: Final[OrderedDict[str, Tuple[TransactionReceipt, int]]] = OrderedDict()
+        self._trace_bytes: int = 0
         self.gas_profile: Final[Dict[str, Dict[str, int]]] = {}
         _revert_register(self)
 
     def __repr__(self) -> str:
         if CONFIG.argv["cli"] == "console":
-            return str(self._list)
+            return str(self.copy())
         return super().__repr__()
 
-    def __getattribute__(self, name: str) -> Any:
-        # filter dropped transactions prior to attribute access
-        items: List[TransactionReceipt] = super().__getattribute__("_list")
-        items = [i for i in items if i.status != -2]
-        setattr(self, "_list", items)
-        return super().__getattribute__(name)
-
     def __bool__(self) -> bool:
-        return bool(self._list)
+        return bool(self._list) or self._stored() > 0
 
     def __contains__(self, item: Any) -> bool:
-        return item in self._list
+        txid = getattr(item, "txid", None)
+        if txid is None:
+            return False
+        if self._index.txids.get(txid) is item:
+            return True
+        return (
+            self._store is not None
+            and isinstance(item, TransactionReceipt)
+            and (self._store.get(txid) is not None)
+        )
 
     def __iter__(self) -> Iterator[TransactionReceipt]:
-        return iter(self._list)
-
-    def __getitem__(self, key: int) -> TransactionReceipt:
-        return self._list[key]
+        if not self._stored():
+            return iter(self._list)
+        return iter(self.copy())
+
+    def __getitem__(self, key: Union[int, slice]) -> Any:
+        stored = self._stored()
+        if not stored:
+            return self._list[key]
+        if isinstance(key, slice):
+            return [self[i] for i in range(*key.indices(len(self)))]
+        idx = key + len(self) if key < 0 else key
+        if idx < 0:
+            raise IndexError("list index out of range")
+        if idx < stored:
+            return self._store.get_at(idx)  # type: ignore [union-attr]
+        return self._list[idx - stored]
 
     def __len__(self) -> int:
-        return len(self._list)
+        return len(self._list) + self._stored()
+
+    def _stored(self) -> int:
+        return 0 if self._store is None else len(self._store)
 
     def _reset(self) -> None:
-        self._list.clear()
+        if self._store is not None:
+            self._store.clear()
+        self._replace([])
 
     def _revert(self, height: BlockNumber) -> None:
-        self._list = [i for i in self._list if i.block_number <= height]  # type: ignore [operator]
+        if self._store is not None:
+            self._store.revert(height)
+        self._replace(
+            [i for i in self._list if i.block_number <= height]  # type: ignore [operator]
+        )
+
+    def _replace(self, items: List[TransactionReceipt]) -> None:
+        with self._lock:
+            self._index.clear()
+            for tx in items:
+                self._index.add(tx)
+            self._list = items
+            for txid in [i for i in self._traces if i not in self._index.txids]:
+                self._trace_bytes -= self._traces.pop(txid)[1]
 
     def _add_tx(self, tx: TransactionReceipt) -> None:
-        if tx not in self._list:
+        with self._lock:
+            if tx in self or tx.status == -2:
+                return
+            self._index.add(tx)
             self._list.append(tx)
+            self._spill()
+
+    def _update_status(self, tx: TransactionReceipt) -> None:
+        # called by `TransactionReceipt` whenever the status of a transaction changes
+        with self._lock:
+            if self._index.txids.get(tx.txid) is not tx:
+                return
+            if tx.status == -2:
+                self._index.remove(tx)
+                self._list = [i for i in self._list if i is not tx]
+                self._forget_trace(tx)
+            else:
+                self._index.set_status(tx)
+                self._spill()
+
+    def _spill(self) -> None:
+        # move the oldest confirmed receipts to the store, while there are too many in memory
+        max_receipts = _history_settings().get("max_receipts")
+        if max_receipts is None or len(self._list) <= max_receipts:
+            return
+        count = 0
+        for tx in self._list[: len(self._list) - max_receipts]:
+            if tx.status < 0:
+                # receipts are stored in order, a pending receipt blocks those after it
+                break
+            count += 1
+        if not count:
+            return
+        spilled = self._list[:count]
+        if self._store is None:
+            self._store = _ReceiptStore()
+        self._store.add(spilled)
+        for tx in spilled:
+            self._index.remove(tx)
+            self._forget_trace(tx)
+        self._list = self._list[count:]
+
+    def _trace_loaded(self, tx: TransactionReceipt, size: int) -> None:
+        # called by `TransactionReceipt` after querying the trace of a transaction
+        max_bytes = _history_settings().get("max_trace_bytes")
+        with self._lock:
+            if self._index.txids.get(tx.txid) is not tx:
+                return
+            self._forget_trace(tx)
+            self._traces[tx.txid] = (tx, size)
+            self._trace_bytes += size
+            if max_bytes is None:
+                return
+            # release the least recently loaded traces which are not in use
+            for receipt, _ in list(self._traces.values()):
+                if self._trace_bytes <= max_bytes:
+                    break
+                if receipt is not tx and not receipt._trace_users:
+                    receipt._release_trace()
+
+    def _trace_accessed(self, tx: TransactionReceipt) -> None:
+        # called by `TransactionReceipt` after evaluating a trace property or method
+        if not tx._trace_users and tx._trace is not None and _history_settings().get("drop_traces"):
+            tx._release_trace()
+
+    def _forget_trace(self, tx: TransactionReceipt) -> None:
+        with self._lock:
+            item = self._traces.pop(tx.txid, None)
+            if item is not None:
+                self._trace_bytes -= item[1]
 
     def clear(self, only_confirmed: bool = False) -> None:
         """
@@ -110,19 +247,24 @@ class TxHistory(metaclass=_Singleton):
         only_confirmed : bool, optional
             If True, transactions which are still marked as pending will not be removed.
         """
-        if only_confirmed:
-            self._list = [i for i in self._list if i.status == -1]
-        else:
-            self._list.clear()
+        if self._store is not None:
+            self._store.clear()
+        self._replace([i for i in self._list if i.status == -1] if only_confirmed else [])
 
     def copy(self) -> List[TransactionReceipt]:
         """Returns a shallow copy of the object as a list"""
-        return self._list.copy()
+        with self._lock:
+            stored = [] if self._store is None else self._store.lookup({})
+            return stored + self._list
 
     def filter(self, key: Optional[Callable] = None, **kwargs: Any) -> List[TransactionReceipt]:
         """
         Return a filtered list of transactions.
 
+        Filters on `txid`, `sender`, `receiver`, `nonce` (together with `sender`)
+        and `status` are resolved using an index rather than by iterating over
+        every transaction.
+
         Arguments
         ---------
         key : Callable, optional
@@ -139,7 +281,13 @@ class TxHistory(metaclass=_Singleton):
         List
             A filtered list of TransactionReceipt objects.
         """
-        result = (i for i in self._list if all(getattr(i, k) == v for k, v in kwargs.items()))
+        with self._lock:
+            candidates = self._index.lookup(kwargs)
+            if candidates is None:
+                candidates = self._list.copy()
+            if self._store is not None and len(self._store):
+                candidates = self._store.lookup(kwargs) + candidates
+        result = (i for i in candidates if all(getattr(i, k) == v for k, v in kwargs.items()))
         return list(result if key is None else filter(key, result))
 
     def wait(self, key: Optional[Callable] = None, **kwargs: Any) -> None:
@@ -169,15 +317,41 @@ class TxHistory(metaclass=_Singleton):
 
     def from_sender(self, account: str) -> List[TransactionReceipt]:
         """Returns a list of transactions where the sender is account"""
-        return [i for i in self._list if i.sender == account]
+        return self.filter(sender=account)
 
     def to_receiver(self, account: str) -> List[TransactionReceipt]:
         """Returns a list of transactions where the receiver is account"""
-        return [i for i in self._list if i.receiver == account]
+        return self.filter(receiver=account)
 
     def of_address(self, account: str) -> List[TransactionReceipt]:
         """Returns a list of transactions where account is the sender or receiver"""
-        return [i for i in self._list if i.receiver == account or i.sender == account]
+        with self._lock:
+            sent = self._index.lookup({"sender": account})
+            received = self._index.lookup({"receiver": account})
+            if sent is None or received is None:
+                candidates = self._list.copy()
+            else:
+                candidates = self._index.ordered({i.txid: i for i in sent + received})
+            if self._store is not None and len(self._store):
+                candidates = self._store.of_address(account) + candidates
+        return [i for i in candidates if i.receiver == account or i.sender == account]
+
+    def _get(self, txid: str) -> Optional[TransactionReceipt]:
+        # returns the transaction with the given hash, if it is in the history
+        tx = self._index.txids.get(txid)
+        if tx is None and self._store is not None:
+            return self._store.get(txid)
+        return tx
+
+    def _last_from_sender(self, account: str) -> Optional[TransactionReceipt]:
+        # returns the most recent transaction with the highest nonce sent from account
+        with self._lock:
+            tx = self._index.last_nonce(account)
+            if self._store is not None:
+                stored = self._store.last_nonce(account)
+                if stored is not None and (tx is None or stored.nonce > tx.nonce):  # type: ignore
+                    return stored
+            return tx
 
     def _gas(self, fn_name: str, gas_used: int, is_success: bool) -> None:
         gas = self.gas_profile.setdefault(fn_name, {})
@@ -205,6 +379,333 @@ class TxHistory(metaclass=_Singleton):
                 gas["avg_success"] = (avg * count + gas_used) // (count + 1)
 
 
+@final
+class _TxIndex:
+    """
+    Secondary indexes over the transactions in `TxHistory`.
+
+    Every index preserves the order in which transactions were added. Addresses
+    are keyed in lowercase, and a receiver of `None` (a deployment) is keyed as
+    an empty string.
+    """
+
+    def __init__(self) -> None:
+        self.txids: Final[Dict[str, TransactionReceipt]] = {}
+        self._position: Final[Dict[str, int]] = {}
+        self._senders: Final[Dict[str, List[TransactionReceipt]]] = {}
+        self._receivers: Final[Dict[str, List[TransactionReceipt]]] = {}
+        self._nonces: Final[Dict[Tuple[str, int], List[TransactionReceipt]]] = {}
+        self._max_nonce: Final[Dict[str, int]] = {}
+        self._statuses: Final[Dict[int, Dict[str, TransactionReceipt]]] = {}
+        self._count: int = 0
+
+    def clear(self) -> None:
+        self.txids.clear()
+        self._position.clear()
+        self._senders.clear()
+        self._receivers.clear()
+        self._nonces.clear()
+        self._max_nonce.clear()
+        self._statuses.clear()
+
+    def add(self, tx: TransactionReceipt) -> None:
+        self.txids[tx.txid] = tx
+        self._position[tx.txid] = self._count
+        self._count += 1
+        sender = _address_key(tx.sender) or ""
+        self._senders.setdefault(sender, []).append(tx)
+        self._receivers.setdefault(_address_key(tx.receiver) or "", []).append(tx)
+        if tx.nonce is not None:
+            self._nonces.setdefault((sender, tx.nonce), []).append(tx)
+            if tx.nonce >= self._max_nonce.get(sender, -1):
+                self._max_nonce[sender] = tx.nonce
+        self._statuses.setdefault(int(tx.status), {})[tx.txid] = tx
+
+    def remove(self, tx: TransactionReceipt) -> None:
+        del self.txids[tx.txid]
+        del self._position[tx.txid]
+        sender = _address_key(tx.sender) or ""
+        _discard(self._senders, sender, tx)
+        _discard(self._receivers, _address_key(tx.receiver) or "", tx)
+        if tx.nonce is not None:
+            _discard(self._nonces, (sender, tx.nonce), tx)
+            if self._max_nonce.get(sender) == tx.nonce and (sender, tx.nonce) not in self._nonces:
+                # the only transaction with the highest nonce was removed
+                nonces = [i.nonce for i in self._senders.get(sender, []) if i.nonce is not None]
+                if nonces:
+                    self._max_nonce[sender] = max(nonces)
+                else:
+                    del self._max_nonce[sender]
+        for bucket in self._statuses.values():
+            bucket.pop(tx.txid, None)
+
+    def set_status(self, tx: TransactionReceipt) -> None:
+        for bucket in self._statuses.values():
+            bucket.pop(tx.txid, None)
+        self._statuses.setdefault(int(tx.status), {})[tx.txid] = tx
+
+    def lookup(self, kwargs: Dict[str, Any]) -> Optional[List[TransactionReceipt]]:
+        """
+        Returns a superset of the transactions matching `kwargs`, in the order they
+        were added, or `None` if no index applies to the given filters.
+        """
+        candidates: List[Union[List[TransactionReceipt], Dict[str, TransactionReceipt]]] = []
+        if "txid" in kwargs:
+            tx = self.txids.get(kwargs["txid"])
+            candidates.append([] if tx is None else [tx])
+        if "sender" in kwargs and (sender := _address_key(kwargs["sender"])) is not None:
+            nonce = kwargs.get("nonce")
+            if isinstance(nonce, int):
+                candidates.append(self._nonces.get((sender, nonce), []))
+            else:
+                candidates.append(self._senders.get(sender, []))
+        if "receiver" in kwargs and (receiver := _address_key(kwargs["receiver"])) is not None:
+            candidates.append(self._receivers.get(receiver, []))
+        if isinstance(kwargs.get("status"), int):
+            candidates.append(self._statuses.get(int(kwargs["status"]), {}))
+        if not candidates:
+            return None
+        smallest = min(candidates, key=len)
+        if isinstance(smallest, dict):
+            return self.ordered(smallest)
+        return smallest.copy()
+
+    def ordered(self, items: Dict[str, TransactionReceipt]) -> List[TransactionReceipt]:
+        position = self._position
+        return sorted(items.values(), key=lambda tx: position[tx.txid])
+
+    def last_nonce(self, account: str) -> Optional[TransactionReceipt]:
+        sender = _address_key(account)
+        if sender is None or sender not in self._max_nonce:
+            return None
+        return self._nonces[(sender, self._max_nonce[sender])][-1]
+
+
+def _address_key(value: Any) -> Optional[str]:
+    # index key for a sender or receiver, or None if the value cannot be indexed
+    # (e.g. an ENS name, which is only resolved when compared)
+    if value is None:
+        return ""
+    address = str(value)
+    if len(address) != 42 or not address.startswith("0x"):
+        return None
+    return address.lower()
+
+
+def _discard(index: Dict[Any, List[TransactionReceipt]], key: Any, tx: TransactionReceipt) -> None:
+    items = index.get(key)
+    if items is not None and tx in items:
+        items.remove(tx)
+        if not items:
+            del index[key]
+
+
+@final
+class _ReceiptStore:
+    """
+    Receipts spilled from `TxHistory` to a temporary SQLite database, in the order
+    they were added. Loaded receipts are cached for as long as they are referenced,
+    so loading the same receipt twice returns the same object.
+    """
+
+    def __init__(self) -> None:
+        fd, path = tempfile.mkstemp(prefix="brownie-history-", suffix=".db")
+        os.close(fd)
+        self.path: Final = Path(path)
+        self._cur: Final = Cursor(self.path)
+        self._cur.execute("PRAGMA journal_mode=OFF")
+        self._cur.execute("PRAGMA synchronous=OFF")
+        self._cur.execute(
+            "CREATE TABLE receipts (position INTEGER PRIMARY KEY, txid UNIQUE, sender, "
+            "receiver, nonce, status, block_number, data)"
+        )
+        self._cur.execute("CREATE INDEX receipts_sender ON receipts (sender, nonce)")
+        self._cur.execute("CREATE INDEX receipts_receiver ON receipts (receiver)")
+        self._cur.execute("CREATE INDEX receipts_status ON receipts (status)")
+        self._count: int = 0
+        self._loaded: Final[weakref.WeakValueDictionary[str, TransactionReceipt]] = (
+            weakref.WeakValueDictionary()
+        )
+        weakref.finalize(self, _remove_store, self._cur, self.path)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, receipts: List[TransactionReceipt]) -> None:
+        rows = []
+        for tx in receipts:
+            try:
+                data = pickle.dumps(tx, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                # an attribute extracted from the trace cannot be stored, it is
+                # extracted again if it is accessed after the receipt is loaded
+                tx._reset_trace_attributes()
+                data = pickle.dumps(tx, protocol=pickle.HIGHEST_PROTOCOL)
+            sender = _address_key(tx.sender) or ""
+            receiver = _address_key(tx.receiver) or ""
+            rows.append(
+                (tx.txid, sender, receiver, tx.nonce, int(tx.status), tx.block_number, data)
+            )
+        self._cur.executemany(
+            "INSERT INTO receipts (txid, sender, receiver, nonce, status, block_number, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        self._count += len(rows)
+
+    def get(self, txid: str) -> Optional[TransactionReceipt]:
+        rows = self._cur.fetchall("SELECT txid, data FROM receipts WHERE txid = ?", (txid,))
+        return self._load(rows[0]) if rows else None
+
+    def get_at(self, idx: int) -> TransactionReceipt:
+        rows = self._cur.fetchall(
+            "SELECT txid, data FROM receipts ORDER BY position LIMIT 1 OFFSET ?", (idx,)
+        )
+        return self._load(rows[0])
+
+    def lookup(self, kwargs: Dict[str, Any]) -> List[TransactionReceipt]:
+        """
+        Returns the stored receipts which may match `kwargs`, narrowed down using
+        the same attributes as the in-memory index.
+        """
+        where = []
+        args: List[Any] = []
+        if isinstance(kwargs.get("txid"), str):
+            where.append("txid = ?")
+            args.append(kwargs["txid"])
+        if "sender" in kwargs and (sender := _address_key(kwargs["sender"])) is not None:
+            where.append("sender = ?")
+            args.append(sender)
+            if isinstance(kwargs.get("nonce"), int):
+                where.append("nonce = ?")
+                args.append(kwargs["nonce"])
+        if "receiver" in kwargs and (receiver := _address_key(kwargs["receiver"])) is not None:
+            where.append("receiver = ?")
+            args.append(receiver)
+        if isinstance(kwargs.get("status"), int):
+            where.append("status = ?")
+            args.append(int(kwargs["status"]))
+        query = "SELECT txid, data FROM receipts"
+        if where:
+            query += f" WHERE {' AND '.join(where)}"
+        return [self._load(i) for i in self._cur.fetchall(f"{query} ORDER BY position", args)]
+
+    def of_address(self, account: str) -> List[TransactionReceipt]:
+        key = _address_key(account)
+        if key is None:
+            return self.lookup({})
+        rows = self._cur.fetchall(
+            "SELECT txid, data FROM receipts WHERE sender = ? OR receiver = ? ORDER BY position",
+            (key, key),
+        )
+        return [self._load(i) for i in rows]
+
+    def last_nonce(self, account: str) -> Optional[TransactionReceipt]:
+        rows = self._cur.fetchall(
+            "SELECT txid, data FROM receipts WHERE sender = ? AND nonce IS NOT NULL "
+            "ORDER BY nonce DESC, position DESC LIMIT 1",
+            (_address_key(account),),
+        )
+        return self._load(rows[0]) if rows else None
+
+    def revert(self, height: int) -> None:
+        rows = self._cur.fetchall("SELECT txid FROM receipts WHERE block_number > ?", (height,))
+        if not rows:
+            return
+        self._cur.execute("DELETE FROM receipts WHERE block_number > ?", (height,))
+        for (txid,) in rows:
+            self._loaded.pop(txid, None)
+        self._count -= len(rows)
+
+    def clear(self) -> None:
+        self._cur.execute("DELETE FROM receipts")
+        self._loaded.clear()
+        self._count = 0
+
+    def _load(self, row: Tuple[str, bytes]) -> TransactionReceipt:
+        txid, data = row
+        tx = self._loaded.get(txid)
+        if tx is None:
+            tx = pickle.loads(data)
+            self._loaded[txid] = tx
+        return tx
+
+
+def _remove_store(cur: Cursor, path: Path) -> None:
+    cur.close()
+    path.unlink(missing_ok=True)
+
+
+def _history_settings() -> Dict[str, Any]:
+    # retention settings of `TxHistory`, from the `history` config section
+    return CONFIG.settings.get("history") or {}
+
+
+@final
+class _BlockCache:
+    """
+    Thread-safe LRU cache of blocks, keyed by hash and by number.
+
+    Blocks are always retrievable by hash. They are retrievable by number only
+    once they can no longer be reorganized: on development networks (where blocks
+    only change when the chain is reverted, which clears the cache) or when they
+    are at least `REORG_DEPTH` blocks behind the highest known block.
+    """
+
+    def __init__(self, maxsize: int = BLOCK_CACHE_SIZE) -> None:
+        self.maxsize: Final = maxsize
+        self._lock: Final = threading.Lock()
+        # (block hash, full transactions) -> block
+        self._blocks: Final[OrderedDict[Tuple[HexStr, bool], BlockData]] = OrderedDict()
+        # (block number, full transactions) -> block hash
+        self._numbers: Final[Dict[Tuple[int, bool], HexStr]] = {}
+        self.head: int = -1
+
+    def set_head(self, height: int) -> None:
+        if height > self.head:
+            self.head = height
+
+    def get(self, block_id: int | HexStr | bytes, full_transactions: bool) -> Optional[BlockData]:
+        with self._lock:
+            if isinstance(block_id, int):
+                block_hash = self._numbers.get((block_id, full_transactions))
+                if block_hash is None:
+                    return None
+            elif isinstance(block_id, bytes):
+                block_hash = hexbytes_to_hexstring(block_id)
+            else:
+                block_hash = block_id
+            key = (block_hash, full_transactions)
+            block = self._blocks.get(key)
+            if block is not None:
+                self._blocks.move_to_end(key)
+            return block
+
+    def add(self, block: BlockData, full_transactions: bool) -> None:
+        number = block["number"]
+        if number is None:
+            # pending block
+            return
+        block_hash = hexbytes_to_hexstring(block["hash"])
+        self.set_head(number)
+        with self._lock:
+            key = (block_hash, full_transactions)
+            self._blocks[key] = block
+            self._blocks.move_to_end(key)
+            if CONFIG.network_type == "development" or number <= self.head - REORG_DEPTH:
+                self._numbers[(number, full_transactions)] = block_hash
+            while len(self._blocks) > self.maxsize:
+                (old_hash, old_full), old = self._blocks.popitem(last=False)
+                if self._numbers.get((old["number"], old_full)) == old_hash:
+                    del self._numbers[(old["number"], old_full)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._blocks.clear()
+            self._numbers.clear()
+            self.head = -1
+
+
 @final
 class Chain(metaclass=_Singleton):
     """
@@ -218,11 +719,15 @@ class Chain(metaclass=_Singleton):
         self._reset_id: Optional[int | str] = None
         self._current_id: Optional[int | str] = None
         self._undo_lock: Final = threading.Lock()
-        self._undo_buffer: Final[List[Tuple[int | str, Any, Tuple[Any, ...], Dict[str, Any]]]] = []
+        # (snapshot taken before the transaction, if any, fn, args, kwargs)
+        self._undo_buffer: Final[
+            List[Tuple[Optional[int | str], Any, Tuple[Any, ...], Dict[str, Any]]]
+        ] = []
         self._redo_buffer: Final[List[Tuple[Any, Tuple[Any, ...], Dict[str, Any]]]] = []
         self._chainid: Optional[int] = None
         self._block_gas_time: int = -1
         self._block_gas_limit: int = 0
+        self._block_cache: Final = _BlockCache()
 
     def __repr__(self) -> str:
         try:
@@ -254,26 +759,92 @@ class Chain(metaclass=_Singleton):
         """
         if not isinstance(block_number, int):
             raise TypeError("Block height must be given as an integer")
-        if block_number < 0:
-            block_number = web3.eth.block_number + 1 + block_number
-        block: BlockData | AttributeDict = web3.eth.get_block(block_number)
+        if block_number == -1:
+            # the most recent block can be requested directly, without first querying the height
+            block = self._get_block("latest")
+        else:
+            if block_number < 0:
+                block_number = self.height + 1 + block_number
+            block = self._get_block(block_number)
         if block["timestamp"] > self._block_gas_time:
             self._block_gas_limit = block["gasLimit"]
             self._block_gas_time = block["timestamp"]
         return block
 
     def __iter__(self) -> Iterator[BlockData | AttributeDict]:
-        get_block = web3.eth.get_block
-        for i in range(web3.eth.block_number + 1):
-            block: BlockData | AttributeDict = get_block(i)
-            yield block
+        return self.blocks()
+
+    def blocks(
+        self,
+        start: int = 0,
+        stop: Optional[int] = None,
+        full_transactions: bool = False,
+        workers: int = 8,
+    ) -> Iterator[BlockData | AttributeDict]:
+        """
+        Generator for iterating over a range of blocks, in order.
+
+        Blocks are requested concurrently, with a bounded number of requests ahead
+        of the consumer, and are stored in the block cache used by `chain[n]`.
+
+        Arguments
+        ---------
+        start : int, optional
+            First block number. Negative values are relative to the most recently
+            mined block, as with slicing.
+        stop : int, optional
+            Block number to stop before. Defaults to iterating up to and including
+            the most recently mined block.
+        full_transactions : bool, optional
+            If True, blocks include full transaction objects instead of hashes.
+        workers : int, optional
+            Maximum number of concurrent block requests.
+        """
+        start, stop, _ = slice(start, stop).indices(self.height + 1)
+        numbers = iter(range(start, stop))
+        if workers < 2:
+            for block_number in numbers:
+                yield self._get_block(block_number, full_transactions)
+            return
+
+        with ThreadPoolExecutor(workers, thread_name_prefix="ChainBlocks") as executor:
+            pending: deque[Future] = deque(
+                executor.submit(self._get_block, i, full_transactions)
+                for _, i in zip(range(workers * 4), numbers)
+            )
+            try:
+                while pending:
+                    block = pending.popleft().result()
+                    block_number = next(numbers, None)
+                    if block_number is not None:
+                        pending.append(
+                            executor.submit(self._get_block, block_number, full_transactions)
+                        )
+                    yield block
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _get_block(
+        self, block_id: int | HexStr | str, full_transactions: bool = False
+    ) -> BlockData | AttributeDict:
+        if block_id != "latest":
+            block = self._block_cache.get(block_id, full_transactions)  # type: ignore [arg-type]
+            if block is not None:
+                return block
+        block = web3.eth.get_block(block_id, full_transactions)  # type: ignore [arg-type]
+        self._block_cache.add(block, full_transactions)
+        return block
 
     def new_blocks(
-        self, height_buffer: int = 0, poll_interval: int = 5
-    ) -> Iterator[BlockData | AttributeDict]:
+        self, height_buffer: int = 0, poll_interval: int = 5, reorgs: bool = False
+    ) -> Iterator[Union[BlockData, AttributeDict, "Reorg"]]:
         """
         Generator for iterating over new blocks.
 
+        Blocks are read from the shared head tracker, so any number of these
+        generators use a single upstream block filter or poller.
+
         Arguments
         ---------
         height_buffer : int, optional
@@ -281,31 +852,36 @@ class Chain(metaclass=_Singleton):
             more delayed results but less likelihood of uncles.
         poll_interval : int, optional
             Maximum interval between querying for a new block, if the height has
-            not changed. Set this lower to detect uncles more frequently.
+            not changed.
+        reorgs : bool, optional
+            If True, a `Reorg` containing the orphaned blocks is yielded whenever
+            the chain is reorganized, before the blocks of the new canonical chain.
         """
         if height_buffer < 0:
             raise ValueError("Buffer cannot be negative")
 
-        last_block: Optional[BlockData | AttributeDict] = None
-        last_height = 0
-        last_poll = 0.0
-
-        get_block = web3.eth.get_block
-        while True:
-            if last_poll + poll_interval < time.time() or last_height != web3.eth.block_number:
-                last_height = web3.eth.block_number
-                block: BlockData | AttributeDict = get_block(last_height - height_buffer)
-                last_poll = time.time()
+        from .head import Reorg, head_tracker
 
+        last_block: Optional[BlockData | AttributeDict] = None
+        with head_tracker.subscribe(poll_interval) as subscription:
+            while True:
+                event = subscription.get()
+                if isinstance(event, Reorg):
+                    if reorgs:
+                        yield event
+                    continue
+                block = event
+                if height_buffer:
+                    block = self._get_block(event["number"] - height_buffer)
                 if block != last_block:
                     last_block = block
-                    yield last_block
-            else:
-                time.sleep(1)
+                    yield block
 
     @property
     def height(self) -> BlockNumber:
-        return web3.eth.block_number
+        height = web3.eth.block_number
+        self._block_cache.set_head(height)
+        return height
 
     @property
     def id(self) -> int:
@@ -323,14 +899,18 @@ class Chain(metaclass=_Singleton):
 
     @property
     def base_fee(self) -> Wei:
-        block: BlockData | AttributeDict = web3.eth.get_block("latest")
-        return Wei(block["baseFeePerGas"])
+        from .fees import fee_oracle
+
+        return fee_oracle.base_fee
 
     @property
     def priority_fee(self) -> Wei:
-        return Wei(web3.eth.max_priority_fee)
+        from .fees import fee_oracle
+
+        return fee_oracle.max_priority_fee
 
     def _revert(self, id_: int | str) -> int | str:
+        self._block_cache.clear()
         rpc_client = rpc.Rpc()
         if web3.isConnected() and not web3.eth.block_number and not self._time_offset:
             _notify_registry(0)  # type: ignore [arg-type]
@@ -349,17 +929,30 @@ class Chain(metaclass=_Singleton):
     ) -> None:
         with self._undo_lock:
             tx._confirmed.wait()
-            self._undo_buffer.append((self._current_id, fn, args, kwargs))  # type: ignore [arg-type]
+            undo_buffer = self._undo_buffer
+            undo_buffer.append((self._current_id, fn, args, kwargs))
             redo_buffer = self._redo_buffer
             if redo_buffer and (fn, args, kwargs) == redo_buffer[-1]:
                 redo_buffer.pop()
             else:
                 redo_buffer.clear()
-            self._current_id = rpc.Rpc().snapshot()
-            # ensure the local time offset is correct, in case it was modified by the transaction
-            self.sleep(0)
+
+            interval = _undo_snapshot_interval()
+            since_snapshot = 1
+            for entry in reversed(undo_buffer):
+                if entry[0] is not None:
+                    break
+                since_snapshot += 1
+            if interval and since_snapshot >= interval:
+                self._current_id = rpc.Rpc().snapshot()
+                # ensure the local time offset is correct, in case the transaction modified it
+                self.sleep(0)
+            else:
+                # no snapshot of the current state, `undo` reverts to an earlier one
+                self._current_id = None
 
     def _network_connected(self) -> None:
+        self._block_cache.clear()
         self._reset_id = None
         try:
             self.reset()
@@ -368,6 +961,7 @@ class Chain(metaclass=_Singleton):
             _notify_registry(0)  # type: ignore [arg-type]
 
     def _network_disconnected(self) -> None:
+        self._block_cache.clear()
         self._undo_buffer.clear()
         self._redo_buffer.clear()
         self._snapshot_id = None
@@ -382,7 +976,7 @@ class Chain(metaclass=_Singleton):
         """
         if not isinstance(txid, str):
             txid = bytes_to_hexstring(txid)
-        tx = next((i for i in TxHistory() if i.txid == txid), None)
+        tx = TxHistory()._get(txid)
         return tx or TransactionReceipt(txid, silent=True, required_confs=0)
 
     def time(self) -> int:
@@ -510,6 +1104,11 @@ class Chain(metaclass=_Singleton):
         """
         Undo one or more transactions.
 
+        The chain is reverted to the nearest snapshot taken at or before the
+        target state, which may undo more than `num` transactions when snapshots
+        are only taken every `undo_snapshot_interval` transactions. Every undone
+        transaction can be repeated with `redo`.
+
         Arguments
         ---------
         num : int, optional
@@ -528,11 +1127,17 @@ class Chain(metaclass=_Singleton):
             if num > len(self._undo_buffer):
                 raise ValueError(f"Undo buffer contains {len(self._undo_buffer)} items")
 
-            for _ in range(num):
-                id_, fn, args, kwargs = self._undo_buffer.pop()
+            undo_buffer = self._undo_buffer
+            target = len(undo_buffer) - num
+            # the most recent snapshot taken at or before the target state
+            while target > 0 and undo_buffer[target][0] is None:
+                target -= 1
+
+            while len(undo_buffer) > target:
+                id_, fn, args, kwargs = undo_buffer.pop()
                 self._redo_buffer.append((fn, args, kwargs))
 
-            self._current_id = self._revert(id_)
+            self._current_id = self._revert(id_)  # type: ignore [arg-type]
             return web3.eth.block_number
 
     def redo(self, num: int = 1) -> BlockNumber:
@@ -564,22 +1169,44 @@ class Chain(metaclass=_Singleton):
             return web3.eth.block_number
 
 
+def _undo_snapshot_interval() -> int:
+    # number of transactions between undo buffer snapshots, zero if they are only taken lazily
+    interval: Optional[int] = CONFIG.settings.get("undo_snapshot_interval")
+    if interval is None:
+        return 0 if CONFIG.argv["cli"] == "test" else 1
+    return interval
+
+
 # objects that will update whenever the RPC is reset or reverted must register
 # by calling to this function. The must also include _revert and _reset methods
 # to receive notifications from this object
 def _revert_register(obj: object) -> None:
-    _revert_refs.append(weakref.ref(obj))
+    key = id(obj)
+    _revert_refs[key] = weakref.ref(obj, lambda ref: _discard_revert_ref(key, ref))
+
+
+def _revert_unregister(obj: object) -> None:
+    # objects that are discarded while still referenced (e.g. a closed project)
+    # must unregister explicitly to stop receiving notifications
+    ref = _revert_refs.get(id(obj))
+    if ref is not None and ref() is obj:
+        del _revert_refs[id(obj)]
+
+
+def _discard_revert_ref(key: int, ref: weakref.ReferenceType) -> None:
+    # the id may already have been reused by a newly registered object
+    if _revert_refs.get(key) is ref:
+        del _revert_refs[key]
 
 
 def _notify_registry(height: Optional[BlockNumber] = None) -> None:
-    gc.collect()
     if height is None:
         height = web3.eth.block_number
-    for ref in _revert_refs.copy():
+    for ref in list(_revert_refs.values()):
         obj = ref()
         if obj is None:
-            _revert_refs.remove(ref)
-        elif height:
+            continue
+        if height:
             obj._revert(height)
         else:
             obj._reset()
@@ -618,6 +1245,13 @@ def _remove_contract(contract: AnyContract) -> None:
     _contract_map.pop(contract.address, None)
 
 
+def _deployment_table() -> str:
+    try:
+        return f"chain{CONFIG.active_network['chainid']}"
+    except KeyError:
+        raise BrownieEnvironmentError("Functionality not available in local environment") from None
+
+
 def _get_deployment(
     address: Optional[HexAddress] = None,
     alias: Optional[ContractName] = None,
@@ -626,36 +1260,101 @@ def _get_deployment(
         raise ValueError("Passed both params address and alias, should be only one!")
     if address:
         address = _resolve_address(address)
-        query = f"address='{address}'"
+        column, value = "address", address
     elif alias:
-        query = f"alias='{alias}'"
+        column, value = "alias", alias
 
+    name = _deployment_table()
     try:
-        name = f"chain{CONFIG.active_network['chainid']}"
-    except KeyError:
-        raise BrownieEnvironmentError("Functionality not available in local environment") from None
-    try:
-        row = cur.fetchone(f"SELECT * FROM {name} WHERE {query}")
+        row = cur.fetchone(f"SELECT * FROM {name} WHERE {column}=?", (value,))
     except OperationalError:
         row = None
     if not row:
         return None, None
+    return _build_deployments([row])[0]
+
 
-    keys = ("address", "alias", "paths") + DEPLOYMENT_KEYS
-    build_json: ContractBuildJson = dict(zip(keys, row))  # type: ignore [assignment]
-    # when we json.dump the path map, the tuples are encoded as lists so we need to make them tuples again.
-    path_map: PathMap = {k: tuple(v) for k, v in build_json.pop("paths", {}).items()}  # type: ignore [typeddict-item]
-    sources: Dict[str, Any] = {
-        i[1]: cur.fetchone("SELECT source FROM sources WHERE hash=?", (i[0],))[0]  # type: ignore [index]
-        for i in path_map.values()
-    }
+def _get_deployments(
+    addresses_or_aliases: Sequence[HexAddress | ContractName],
+) -> List[Deployment | Tuple[None, None]]:
+    """
+    Fetches many deployments at once, matching each value by address or by alias.
 
-    build_json["allSourcePaths"] = {k: path_map[k][1] for k in path_map}
-    pc_map: Optional[Dict[int | str, ProgramCounter]] = build_json.get("pcMap")  # type: ignore [assignment]
-    if isinstance(pc_map, dict):
-        build_json["pcMap"] = PCMap({Count(int(k)): pc_map[k] for k in pc_map})
+    The deployments and their sources are read with a few bulk queries instead of
+    several queries per deployment. The result is in the same order as the values,
+    with `(None, None)` for each value that is not stored.
+    """
+    name = _deployment_table()
+    keys = []
+    columns: Dict[str, Dict[str, None]] = {"address": {}, "alias": {}}
+    for value in addresses_or_aliases:
+        try:
+            key = _resolve_address(value)
+            columns["address"][key] = None
+        except Exception:
+            key = value
+            columns["alias"][key] = None
+        keys.append(key)
+
+    rows: Dict[str, Tuple[Any, ...]] = {}
+    for column, values in columns.items():
+        # querying each column separately allows sqlite to use its index
+        unique = list(values)
+        for i in range(0, len(unique), QUERY_CHUNK_SIZE):
+            chunk = unique[i : i + QUERY_CHUNK_SIZE]
+            try:
+                result = cur.fetchrows(
+                    f"SELECT * FROM {name} WHERE {column} IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+            except OperationalError:
+                # the table does not exist, nothing was deployed on this chain
+                return [(None, None)] * len(keys)
+            for row in result:
+                rows[row[0] if column == "address" else row[1]] = row
+
+    deployments = iter(_build_deployments([rows[i] for i in keys if i in rows]))
+    return [next(deployments) if i in rows else (None, None) for i in keys]
+
+
+def _build_deployments(rows: List[Tuple[Any, ...]]) -> List[Deployment]:
+    # builds the build json and sources of each row, querying all sources at once
+    keys = ("address", "alias") + DEPLOYMENT_KEYS
+    builds = []
+    hashes = set()
+    for row in rows:
+        # the path map is the third column, and is not part of the build json
+        build_json: ContractBuildJson = dict(  # type: ignore [assignment]
+            zip(keys, row[:2] + row[3:])
+        )
+        # when we json.dump the path map, the tuples are encoded as lists
+        # so we need to make them tuples again.
+        paths: Dict[str, list] = row[2] or {}
+        path_map: PathMap = {k: tuple(v) for k, v in paths.items()}
+        hashes.update(i[0] for i in path_map.values())
+        builds.append((build_json, path_map))
+
+    sources_by_hash = {}
+    unique = list(hashes)
+    for i in range(0, len(unique), QUERY_CHUNK_SIZE):
+        chunk = unique[i : i + QUERY_CHUNK_SIZE]
+        sources_by_hash.update(
+            cur.fetchall(
+                f"SELECT hash, source FROM sources WHERE hash IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+        )
 
-    return build_json, sources
+    deployments: List[Deployment] = []
+    for build_json, path_map in builds:
+        sources: Dict[str, Any] = {i[1]: sources_by_hash[i[0]] for i in path_map.values()}
+        build_json["allSourcePaths"] = {k: path_map[k][1] for k in path_map}
+        pc_map: Optional[Dict[int | str, ProgramCounter]]
+        pc_map = build_json.get("pcMap")  # type: ignore [assignment]
+        if isinstance(pc_map, dict):
+            build_json["pcMap"] = PCMap({Count(int(k)): pc_map[k] for k in pc_map})
+        deployments.append((build_json, sources))
+    return deployments
 
 
 def _add_deployment(
@@ -704,18 +1403,15 @@ def _remove_deployment(
         raise ValueError("Passed both params address and alias, should be only one!")
     if address:
         address = _resolve_address(address)
-        query = f"address='{address}'"
+        column, value = "address", address
     elif alias:
-        query = f"alias='{alias}'"
+        column, value = "alias", alias
 
-    try:
-        name = f"chain{CONFIG.active_network['chainid']}"
-    except KeyError:
-        raise BrownieEnvironmentError("Functionality not available in local environment") from None
+    name = _deployment_table()
 
     deployment = _get_deployment(address, alias)
     # delete entry from chain{n}
-    cur.execute(f"DELETE FROM {name} WHERE {query}")
+    cur.execute(f"DELETE FROM {name} WHERE {column}=?", (value,))
     # delete all entries from sources matching the contract's source hashes
     if contract := _find_contract(address):
         for key, path in contract._build.get("allSourcePaths", {}).items():
@@ -723,6 +1419,6 @@ def _remove_deployment(
             if source is None:
                 source = Path(path).read_text()
             hash_ = sha1(source.encode()).hexdigest()
-            cur.execute(f"DELETE FROM sources WHERE hash='{hash_}'")
+            cur.execute("DELETE FROM sources WHERE hash=?", (hash_,))
 
     return deployment
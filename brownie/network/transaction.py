@@ -3,7 +3,6 @@
 import functools
 import sys
 import threading
-import time
 from enum import IntEnum
 from pathlib import Path
 from typing import (
@@ -44,12 +43,13 @@ from brownie.utils._color import (
     bright_red,
     bright_yellow,
     dark_white,
-    red,
 )
 from brownie.utils.output import build_tree
 
 from . import state
+from .confirmations import confirmation_tracker
 from .event import EventDict, _decode_logs, _decode_trace
+from .fees import fee_oracle
 from .web3 import web3
 
 _T = TypeVar("_T")
@@ -67,6 +67,7 @@ def trace_property(fn: Callable[["TransactionReceipt"], _T]) -> "property[_T]":
             return None
         if self._trace_exc is not None:
             raise self._trace_exc
+        self._trace_users += 1
         try:
             return fn(self)
         except RPCRequestError as exc:
@@ -78,6 +79,9 @@ def trace_property(fn: Callable[["TransactionReceipt"], _T]) -> "property[_T]":
                 "transaction requires the `debug_traceTransaction` RPC endpoint, but the node "
                 "client does not support it or has not made it available."
             ) from None
+        finally:
+            self._trace_users -= 1
+            state.TxHistory()._trace_accessed(self)
 
     return wrapper
 
@@ -92,7 +96,12 @@ def trace_inspection(
             )
         if self.input == "0x" and self.gas_used == 21000:
             return None
-        return fn(self, *args, **kwargs)
+        self._trace_users += 1
+        try:
+            return fn(self, *args, **kwargs)
+        finally:
+            self._trace_users -= 1
+            state.TxHistory()._trace_accessed(self)
 
     functools.update_wrapper(wrapper, fn)
     return wrapper
@@ -189,9 +198,15 @@ class TransactionReceipt:
         # internal attributes
         self._call_cost = 0
         self._trace_exc: Optional[Exception] = None
+        # set if the confirmation tracker failed while awaiting this transaction
+        self._confirm_exc: Optional[Exception] = None
         self._trace_origin: Optional[str] = None
         self._raw_trace: Optional[List] = None
         self._trace: Optional[List] = None
+        # set when the trace was released after its attributes were extracted
+        self._trace_released = False
+        # number of trace properties and inspection methods currently being evaluated
+        self._trace_users = 0
         self._events: Optional[EventDict] = None
         self._return_value: Any = None
         self._revert_msg: Optional[str] = None
@@ -238,16 +253,11 @@ class TransactionReceipt:
                 f"   Nonce: {bright_blue}{self.nonce}{color}"
             )
 
-        # await confirmation of tx in a separate thread which is blocking if
-        # required_confs > 0 or tx has already confirmed (`blockNumber` != None)
-        confirm_thread = threading.Thread(
-            target=self._await_confirmation,
-            args=(tx.get("blockNumber"), required_confs),
-            daemon=True,
-        )
-        confirm_thread.start()
-        if is_blocking and (required_confs > 0 or tx.get("blockNumber")):
-            confirm_thread.join()
+        # confirmation is awaited by the shared confirmation tracker, blocking if
+        # required_confs > 0
+        self._await_confirmation(tx.get("blockNumber"), required_confs)
+        if is_blocking and required_confs > 0:
+            self._wait_for_confirmation(self._confirmed, required_confs)
 
     def __repr__(self) -> str:
         color_str = {-2: "dark white", -1: "bright yellow", 0: "bright red", 1: ""}[self.status]
@@ -256,6 +266,29 @@ class TransactionReceipt:
     def __hash__(self) -> int:
         return hash(self.txid)
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # used when `TxHistory` spills receipts to disk. the trace is not stored, it is
+        # queried again if it is required after the receipt is loaded
+        data = self.__dict__.copy()
+        for key in ("_confirmed", "_confirm_exc", "_raw_trace", "_trace", "_events", "_trace_exc"):
+            data.pop(key, None)
+        data["_trace_users"] = 0
+        if self.sender is not None:
+            data["sender"] = EthAddress(str(self.sender))
+        data["_trace_released"] = self._trace_released or bool(self._raw_trace)
+        return data
+
+    def __setstate__(self, data: Dict[str, Any]) -> None:
+        self.__dict__.update(data)
+        self._confirmed = threading.Event()
+        if self.status >= 0:
+            self._confirmed.set()
+        self._raw_trace = None
+        self._trace = None
+        self._events = None
+        self._trace_exc = None
+        self._confirm_exc = None
+
     @trace_property
     def events(self) -> EventDict:
         if self._events is None:
@@ -265,6 +298,7 @@ class TransactionReceipt:
                 contracts = {addr: state._find_contract(addr) for addr in addrs}
                 self._events = _decode_logs(self.logs, contracts=contracts)
             else:
+                self._reload_trace()
                 self._get_trace()
                 # get events from the trace - handled lazily so that other
                 # trace operations are not blocked in case of a decoding error
@@ -430,25 +464,9 @@ class TransactionReceipt:
             print(f"This transaction already has {self.confirmations} confirmations.")
             return
 
-        if self.nonce is not None:
-            # if we know the transaction nonce, it's more efficient to watch the tx count
-            # this (i hope) also fixes a longstanding bug that sometimes gave an incorrect
-            # "tx dropped without known replacement" error due to a race condition
-            while web3.eth.get_transaction_count(str(self.sender)) <= self.nonce:
-                time.sleep(1)
-
-        while True:
-            try:
-                tx: Dict = web3.eth.get_transaction(self.txid)
-                break
-            except TransactionNotFound:
-                if self.nonce is not None:
-                    self.status = Status(-2)
-                    self._confirmed.set()
-                    return
-                time.sleep(1)
-
-        self._await_confirmation(tx["blockNumber"], required_confs)
+        self._wait_for_confirmation(
+            confirmation_tracker.wait_for(self, required_confs), required_confs
+        )
 
     def _raise_if_reverted(self, exc: Any) -> None:
         if self.status or CONFIG.mode == "console":
@@ -478,36 +496,25 @@ class TransactionReceipt:
         )
 
     def _await_confirmation(self, block_number: int = None, required_confs: int = 1) -> None:
-        # await first confirmation
-        block_number = block_number or self.block_number
-        nonce_time = 0.0
-        sender_nonce = 0
-        while True:
-            # every 15 seconds, check if the nonce increased without a confirmation of
-            # this specific transaction. if this happens, the tx has likely dropped
-            # and we should stop waiting.
-            if time.time() - nonce_time > 15:
-                sender_nonce = web3.eth.get_transaction_count(str(self.sender))
-                nonce_time = time.time()
-
+        if block_number is not None:
+            # the transaction has already confirmed, avoid waiting for the next block
             try:
                 receipt = web3.eth.get_transaction_receipt(HexBytes(self.txid))
             except TransactionNotFound:
                 receipt = None
-            # the null blockHash check is required for older versions of Parity
-            # taken from `web3._utils.transactions.wait_for_transaction_receipt`
             if receipt is not None and receipt["blockHash"] is not None:
-                break
-
-            # continuation of the nonce logic 2 sections prior. we must check the receipt
-            # after querying the nonce, because in the other order there is a chance that
-            # the tx would confirm after checking the receipt but before checking the nonce
-            if sender_nonce > self.nonce:
-                self.status = Status(-2)
-                self._confirmed.set()
+                self.block_number = receipt["blockNumber"]
+                if required_confs <= 1 or self.confirmations >= required_confs:
+                    self._confirm(receipt, required_confs)
+                    return
+                confirmation_tracker.track(self, required_confs, receipt)  # type: ignore [arg-type]
                 return
+        confirmation_tracker.track(self, required_confs)
 
-            if not block_number and not self._silent and required_confs > 0:
+    def _wait_for_confirmation(self, event: threading.Event, required_confs: int) -> None:
+        # blocks until the event is set by the confirmation tracker
+        while not event.wait(1):
+            if not self._silent and not self.block_number and required_confs > 0:
                 if required_confs == 1:
                     sys.stdout.write(f"  Waiting for confirmation... {_marker[0]}\r")
                 else:
@@ -517,43 +524,11 @@ class TransactionReceipt:
                     )
                 _marker.rotate(1)
                 sys.stdout.flush()
+        if self._confirm_exc is not None:
+            raise self._confirm_exc
 
-            time.sleep(1)
-
-        # silence other dropped tx's immediately after confirmation to avoid output weirdness
-        for dropped_tx in state.TxHistory().filter(
-            sender=self.sender, nonce=self.nonce, key=lambda k: k != self
-        ):
-            dropped_tx._silent = True
-
-        self.block_number = receipt["blockNumber"]
-        # wait for more confirmations if required and handle uncle blocks
-        remaining_confs = required_confs
-        while remaining_confs > 0 and required_confs > 1:
-            try:
-                receipt = web3.eth.get_transaction_receipt(self.txid)
-                self.block_number = receipt["blockNumber"]
-            except TransactionNotFound:
-                if not self._silent:
-                    sys.stdout.write(f"\r{red}Transaction was lost...{color}{' ' * 8}")
-                    sys.stdout.flush()
-                # check if tx is still in mempool, this will raise otherwise
-                tx = web3.eth.get_transaction(self.txid)
-                self.block_number = None
-                return self._await_confirmation(tx.get("blockNumber"), required_confs)
-            if required_confs - self.confirmations != remaining_confs:
-                remaining_confs = required_confs - self.confirmations
-                if not self._silent:
-                    sys.stdout.write(
-                        f"\rRequired confirmations: {bright_yellow}{self.confirmations}/"
-                        f"{required_confs}{color}  "
-                    )
-                    if remaining_confs == 0:
-                        sys.stdout.write("\n")
-                    sys.stdout.flush()
-            if remaining_confs > 0:
-                time.sleep(1)
-
+    def _confirm(self, receipt: TxReceipt, required_confs: int) -> None:
+        # called once the transaction has the required number of confirmations
         self._set_from_receipt(receipt)
         # if coverage evaluation is active, evaluate the trace
         if (
@@ -562,17 +537,26 @@ class TransactionReceipt:
             and self.trace
         ):
             self._expand_trace()
+            state.TxHistory()._trace_accessed(self)
         if not self._silent and required_confs > 0:
             print(self._confirm_output())
 
+        # fee data for an older block must not be used for the next transaction
+        fee_oracle._observe_block(self.block_number)  # type: ignore [arg-type]
+
         # set the confirmation event and mark other tx's with the same nonce as dropped
         self._confirmed.set()
         for dropped_tx in state.TxHistory().filter(
             sender=self.sender, nonce=self.nonce, key=lambda k: k != self
         ):
-            dropped_tx.status = Status(-2)
+            dropped_tx._set_status(-2)
             dropped_tx._confirmed.set()
 
+    def _set_status(self, status: int) -> None:
+        self.status = Status(status)
+        # keep the status index of the transaction history in sync
+        state.TxHistory()._update_status(self)
+
     def _set_from_tx(self, tx: Dict) -> None:
         if not self.sender:
             self.sender = EthAddress(tx["from"])
@@ -607,7 +591,7 @@ class TransactionReceipt:
         self.txindex = receipt["transactionIndex"]
         self.gas_used = receipt["gasUsed"]
         self.logs = receipt["logs"]
-        self.status = Status(receipt["status"])
+        self._set_status(receipt["status"])
         if "effectiveGasPrice" in receipt:
             self.gas_price = receipt["effectiveGasPrice"]
 
@@ -650,7 +634,7 @@ class TransactionReceipt:
         """
 
         # check if trace has already been retrieved, or the tx warrants it
-        if self._raw_trace is not None:
+        if self._raw_trace is not None or self._trace_released:
             return
         self._raw_trace = []
         if self.input == "0x" and self.gas_used == 21000:
@@ -679,6 +663,7 @@ class TransactionReceipt:
             raise self._trace_exc
 
         self._raw_trace = trace = trace["result"]["structLogs"]
+        state.TxHistory()._trace_loaded(self, _trace_size(trace))
         if not trace:
             self._modified_state = False
             return
@@ -827,6 +812,33 @@ class TransactionReceipt:
         op = next((i["op"] for i in trace[::-1] if i["op"] in ("REVERT", "INVALID")), None)
         self._revert_msg = "invalid opcode" if op == "INVALID" else ""
 
+    def _release_trace(self) -> None:
+        """Releases the stack trace to free memory. Attributes that were already
+        extracted from the trace are kept, it is queried again if it is needed."""
+        if not self._raw_trace:
+            return
+        self._raw_trace = None
+        self._trace = None
+        self._trace_released = True
+        state.TxHistory()._forget_trace(self)
+
+    def _reset_trace_attributes(self) -> None:
+        """Discards the trace and every attribute extracted from it."""
+        self._raw_trace = None
+        self._trace = None
+        self._trace_released = False
+        self._return_value = None
+        self._modified_state = None
+        self._new_contracts = None
+        self._internal_transfers = None
+        self._subcalls = None
+        state.TxHistory()._forget_trace(self)
+
+    def _reload_trace(self) -> None:
+        if self._trace_released:
+            self._trace_released = False
+            self._get_trace()
+
     def _expand_trace(self) -> None:
         """Adds the following attributes to each step of the stack trace:
 
@@ -840,6 +852,7 @@ class TransactionReceipt:
             offset: Start and end offset associated source code
         }
         """
+        self._reload_trace()
         if self._raw_trace is None:
             self._get_trace()
         if self._trace is not None:
@@ -1437,6 +1450,12 @@ def _step_external(
     return build_tree([result], multiline_pad=0).rstrip()
 
 
+def _trace_size(trace: Sequence) -> int:
+    # approximate memory used by a trace, in bytes
+    words = sum(len(i["stack"]) + len(i.get("memory") or ()) for i in trace)
+    return len(trace) * 700 + words * 115
+
+
 def _get_memory(step: Dict, idx: int) -> HexBytes:
     offset = int(step["stack"][idx], 16)
     length = int(step["stack"][idx - 1], 16)
@@ -57,7 +57,12 @@ from brownie.network.contract import (
     InterfaceContainer,
     ProjectContract,
 )
-from brownie.network.state import _add_contract, _remove_contract, _revert_register
+from brownie.network.state import (
+    _add_contract,
+    _remove_contract,
+    _revert_register,
+    _revert_unregister,
+)
 from brownie.project import compiler
 from brownie.project.build import BUILD_KEYS, INTERFACE_KEYS, Build
 from brownie.project.sources import Sources, get_pragma_spec
@@ -554,7 +559,9 @@ class Project(_ProjectBase):
             for contract in container._contracts:
                 _remove_contract(contract)
             container._contracts.clear()
+            _revert_unregister(container)
         self._containers.clear()
+        _revert_unregister(self)
 
         # undo black-magic
         self._remove_from_main_namespace()
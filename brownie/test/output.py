@@ -7,6 +7,7 @@ from typing import Any, Dict, Final, List, Optional, Set, Tuple
 from brownie._c_constants import Path, ujson_dump, ujson_dumps, ujson_loads
 from brownie._config import CONFIG
 from brownie.exceptions import BrownieConfigWarning
+from brownie.network.account import _gas_cache
 from brownie.network.state import TxHistory
 from brownie.project import get_loaded_projects
 from brownie.project.build import Build
@@ -124,6 +125,16 @@ def _build_gas_profile_output() -> List[str]:
                 f" {padded['avg_success']}  low: {padded['low']}  high: {padded['high']}"
             )
 
+    # hit rates of the gas estimate cache, if it was used
+    cache_stats = []
+    for key, name in (("estimate", "estimates"), ("revert_check", "revert checks")):
+        lookups = _gas_cache.lookups[key]
+        if lookups:
+            hits = _gas_cache.hits[key]
+            cache_stats.append(f"{name}: {hits}/{lookups} hits ({hits / lookups:.0%})")
+    if cache_stats:
+        lines.append(f"{bright_magenta}Gas estimate cache{color} - {'  '.join(cache_stats)}")
+
     return lines + [""]
 
 
@@ -3,25 +3,58 @@
 import sqlite3
 import threading
 from pathlib import Path
-from typing import Any, Final, Optional, Tuple, final
+from typing import Any, Final, Iterable, List, Optional, Sequence, Tuple, final
 
 from brownie._c_constants import ujson_dumps, ujson_loads
 
 
 @final
 class Cursor:
-    __slots__ = "_lock", "_db", "_cur", "_execute", "_fetchone", "_fetchall"
+    """
+    Thread-safe wrapper around an SQLite connection, encoding dicts and lists as JSON.
 
-    def __init__(self, filename: Path) -> None:
+    Writes are serialized on a single connection. With `wal=True` the database uses
+    write-ahead logging, and reads are made on a pool of separate connections so that
+    they do not wait on each other or on a write in progress.
+    """
+
+    __slots__ = (
+        "_lock",
+        "_pool_lock",
+        "_filename",
+        "_generation",
+        "_wal",
+        "_readers",
+        "_db",
+        "_cur",
+        "_execute",
+        "_executemany",
+        "_fetchone",
+        "_fetchall",
+    )
+
+    def __init__(self, filename: Path, wal: bool = False) -> None:
         self._lock: Final = threading.Lock()
+        # guards the reader pool, separately so reads never wait on a write
+        self._pool_lock: Final = threading.Lock()
+        self._wal: Final = wal
+        # idle read connections, only used with write-ahead logging, each tagged
+        # with the generation of the file it was opened for
+        self._readers: Final[List[Tuple[int, sqlite3.Connection]]] = []
+        self._generation = 0
         self.connect(filename)
 
     def connect(self, filename: Path) -> None:
-        self._db = sqlite3.connect(str(filename), isolation_level=None, check_same_thread=False)
+        self._close_readers()
+        self._filename = str(filename)
+        self._db = sqlite3.connect(self._filename, isolation_level=None, check_same_thread=False)
         self._cur = self._db.cursor()
         self._execute = self._cur.execute
+        self._executemany = self._cur.executemany
         self._fetchone = self._cur.fetchone
         self._fetchall = self._cur.fetchall
+        if self._wal:
+            self._execute("PRAGMA journal_mode=WAL")
 
     def insert(self, table: str, *values: Any) -> None:
         encoded = [ujson_dumps(i) if isinstance(i, (dict, list)) else i for i in values]
@@ -34,18 +67,72 @@ class Cursor:
         with self._lock:
             self._execute(cmd, *args)
 
-    def fetchone(self, cmd: str, *args: Any) -> Optional[Tuple[Any, ...]]:
+    def executemany(self, cmd: str, rows: Iterable[Sequence[Any]]) -> None:
+        """Execute a statement once per row, within a single transaction."""
         with self._lock:
-            self._execute(cmd, *args)
-            if result := self._fetchone():
-                return tuple(ujson_loads(i) if str(i).startswith(("[", "{")) else i for i in result)
-            return None
+            self._execute("BEGIN")
+            try:
+                self._executemany(cmd, rows)
+            except BaseException:
+                self._execute("ROLLBACK")
+                raise
+            self._execute("COMMIT")
+
+    def fetchone(self, cmd: str, *args: Any) -> Optional[Tuple[Any, ...]]:
+        if self._wal:
+            result = self._read(cmd, args, False)
+        else:
+            with self._lock:
+                self._execute(cmd, *args)
+                result = self._fetchone()
+        if result:
+            return _decode(result)
+        return None
 
     def fetchall(self, cmd: str, *args: Any) -> Any:
+        if self._wal:
+            return self._read(cmd, args, True)
         with self._lock:
             self._execute(cmd, *args)
             return self._fetchall()
 
+    def fetchrows(self, cmd: str, *args: Any) -> List[Tuple[Any, ...]]:
+        """Like `fetchall`, with JSON values decoded in the same way as `fetchone`."""
+        return [_decode(i) for i in self.fetchall(cmd, *args)]
+
+    def _read(self, cmd: str, args: Tuple[Any, ...], fetch_all: bool) -> Any:
+        with self._pool_lock:
+            if self._readers:
+                generation, db = self._readers.pop()
+            else:
+                generation = self._generation
+                db = sqlite3.connect(self._filename, isolation_level=None, check_same_thread=False)
+        try:
+            cur = db.execute(cmd, *args)
+            return cur.fetchall() if fetch_all else cur.fetchone()
+        finally:
+            with self._pool_lock:
+                # the cursor was connected to another file while this read was made
+                stale = generation != self._generation
+                if not stale:
+                    self._readers.append((generation, db))
+            if stale:
+                db.close()
+
+    def _close_readers(self) -> None:
+        # idle read connections are closed, and those in use are closed when checked in
+        with self._pool_lock:
+            self._generation += 1
+            readers = self._readers[:]
+            self._readers.clear()
+        for _, db in readers:
+            db.close()
+
     def close(self) -> None:
+        self._close_readers()
         self._cur.close()
         self._db.close()
+
+
+def _decode(row: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    return tuple(ujson_loads(i) if str(i).startswith(("[", "{")) else i for i in row)
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""
+Benchmark for address checksumming while decoding logs and traces.
+
+Decodes a synthetic receipt containing `Transfer` logs between a few hundred
+accounts, and builds the subcall and internal transfer entries of a trace which
+calls the same contracts repeatedly. Every address is checksummed when the logs
+and trace steps are formatted. The checksum cache hit rate is reported with the
+time taken by each workload.
+
+Usage: python tests/benchmarks/bench_checksum.py [NUMBER_OF_ITEMS]
+"""
+
+import sys
+import time
+
+import eth_event
+from faster_eth_abi import encode
+from hexbytes import HexBytes
+
+from brownie.convert import EthAddress, Wei
+from brownie.convert.datatypes import checksum_cache
+from brownie.network.event import _decode_logs, _topics
+
+ACCOUNTS = [f"{i * 7919:040x}" for i in range(1, 301)]
+
+TRANSFER_ABI = {
+    "anonymous": False,
+    "inputs": [
+        {"indexed": True, "name": "from", "type": "address"},
+        {"indexed": True, "name": "to", "type": "address"},
+        {"indexed": False, "name": "value", "type": "uint256"},
+    ],
+    "name": "Transfer",
+    "type": "event",
+}
+
+
+def build_logs(count: int) -> list:
+    topic_map = eth_event.get_topic_map([TRANSFER_ABI])
+    _topics.add(topic_map)
+    topic0 = HexBytes(next(iter(topic_map)))
+    tokens = [f"0x{i:040x}" for i in range(1, 6)]
+    return [
+        {
+            "address": tokens[i % len(tokens)],
+            "topics": [
+                topic0,
+                HexBytes(bytes(12) + bytes.fromhex(ACCOUNTS[i % 300])),
+                HexBytes(bytes(12) + bytes.fromhex(ACCOUNTS[(i * 31) % 300])),
+            ],
+            "data": HexBytes(encode(["uint256"], [i * 10**18])),
+            "logIndex": i,
+            "blockNumber": 1,
+            "transactionIndex": 0,
+        }
+        for i in range(count)
+    ]
+
+
+def expand_trace(count: int) -> list:
+    # as done for each subcall and value transfer in `TransactionReceipt._expand_trace`
+    subcalls = []
+    for i in range(count):
+        sender = f"0x{ACCOUNTS[i % 300]}"
+        receiver = ACCOUNTS[(i * 31) % 300]
+        subcalls.append({"from": sender, "to": EthAddress(receiver), "op": "CALL"})
+        subcalls.append({"from": EthAddress(sender), "to": EthAddress(receiver), "value": Wei(i)})
+    return subcalls
+
+
+def _run(name: str, fn, count: int) -> None:  # type: ignore [no-untyped-def]
+    checksum_cache.clear()
+    start = time.perf_counter()
+    fn(count)
+    elapsed = time.perf_counter() - start
+    lookups = checksum_cache.hits + checksum_cache.misses
+    hit_rate = checksum_cache.hits / lookups if lookups else 0
+    print(f"{name}: {count} items in {elapsed:.3f}s, {hit_rate:.0%} checksum cache hits")
+
+
+def main(count: int) -> None:
+    logs = build_logs(count)
+    _decode_logs(logs[:10])  # warm up decoder caches
+    _run("decode logs", lambda n: _decode_logs(logs), count)
+    _run("expand trace", expand_trace, count)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
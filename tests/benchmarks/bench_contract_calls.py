@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""
+Benchmark for the Python-side cost of contract calls.
+
+Each case encodes the inputs and decodes the return data of a view method, as is done
+for every call to a `ContractCall`, without any RPC requests. The result is reported
+in calls per second for methods with simple, array and tuple types, with and without
+`raw=True`.
+
+Usage: python tests/benchmarks/bench_contract_calls.py [NUMBER_OF_CALLS]
+"""
+
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+from faster_eth_abi import encode
+
+from brownie.network.contract import ContractCall
+
+ADDRESS = "0x" + "11" * 20
+OWNER = "0x" + "22" * 20
+
+
+def _param(name: str, type_: str, components: List[Dict] = None) -> Dict:
+    param: Dict[str, Any] = {"name": name, "type": type_}
+    if components:
+        param["components"] = components
+    return param
+
+
+def _method(name: str, inputs: List[Dict], outputs: List[Dict]) -> ContractCall:
+    abi = {
+        "type": "function",
+        "name": name,
+        "inputs": inputs,
+        "outputs": outputs,
+        "stateMutability": "view",
+    }
+    return ContractCall(ADDRESS, abi, f"Bench.{name}", None)  # type: ignore [arg-type]
+
+
+def cases() -> List[Tuple[ContractCall, Tuple, bytes]]:
+    position = [_param("owner", "address"), _param("liquidity", "uint128")]
+    return [
+        (
+            _method("balanceOf", [_param("owner", "address")], [_param("", "uint256")]),
+            (OWNER,),
+            encode(["uint256"], [10**18]),
+        ),
+        (
+            _method(
+                "getReserves",
+                [],
+                [_param("r0", "uint112"), _param("r1", "uint112"), _param("ts", "uint32")],
+            ),
+            (),
+            encode(["uint112", "uint112", "uint32"], [10**20, 10**21, 1700000000]),
+        ),
+        (
+            _method(
+                "getAmountsOut",
+                [_param("amountIn", "uint256"), _param("path", "address[]")],
+                [_param("amounts", "uint256[]")],
+            ),
+            (10**18, [OWNER, ADDRESS, OWNER]),
+            encode(["uint256[]"], [[10**18, 2 * 10**18, 3 * 10**18]]),
+        ),
+        (
+            _method(
+                "positions",
+                [_param("ids", "uint256[]")],
+                [_param("", "tuple[]", position)],
+            ),
+            ([1, 2, 3, 4],),
+            encode(["(address,uint128)[]"], [[(OWNER, i) for i in range(4)]]),
+        ),
+    ]
+
+
+def _rate(method: ContractCall, args: Tuple, output: bytes, count: int, raw: bool) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        method.encode_input(*args)
+        method.decode_output(output, raw=raw)
+    return count / (time.perf_counter() - start)
+
+
+def main(count: int) -> None:
+    for method, args, output in cases():
+        # the first call resolves the ABI types of the method
+        method.encode_input(*args)
+        method.decode_output(output)
+        formatted = _rate(method, args, output, count, False)
+        raw = _rate(method, args, output, count, True)
+        print(f"{method.abi['name']:>14}: {formatted:>9,.0f} calls/s, {raw:>9,.0f} calls/s raw")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+Benchmark for decoding the logs of a transaction receipt.
+
+Decodes a synthetic receipt containing 10,000 `Transfer` logs, emitted by a
+handful of token contracts, as in a batch settlement transaction.
+
+Usage: python tests/benchmarks/bench_decode_logs.py [NUMBER_OF_LOGS]
+"""
+
+import sys
+import time
+
+import eth_event
+from faster_eth_abi import encode
+from hexbytes import HexBytes
+
+from brownie.network.event import _decode_logs, _topics
+
+TRANSFER_ABI = {
+    "anonymous": False,
+    "inputs": [
+        {"indexed": True, "name": "from", "type": "address"},
+        {"indexed": True, "name": "to", "type": "address"},
+        {"indexed": False, "name": "value", "type": "uint256"},
+    ],
+    "name": "Transfer",
+    "type": "event",
+}
+
+
+def build_receipt_logs(count: int) -> list:
+    topic_map = eth_event.get_topic_map([TRANSFER_ABI])
+    _topics.add(topic_map)
+    topic0 = HexBytes(next(iter(topic_map)))
+    tokens = [f"0x{i:040x}" for i in range(1, 6)]
+    return [
+        {
+            "address": tokens[i % len(tokens)],
+            "topics": [
+                topic0,
+                HexBytes(i.to_bytes(32, "big")),
+                HexBytes((i + 1).to_bytes(32, "big")),
+            ],
+            "data": HexBytes(encode(["uint256"], [i * 10**18])),
+            "logIndex": i,
+            "blockNumber": 1,
+            "transactionIndex": 0,
+        }
+        for i in range(count)
+    ]
+
+
+def main(count: int) -> None:
+    logs = build_receipt_logs(count)
+    _decode_logs(logs[:10])  # warm up decoder caches
+
+    start = time.perf_counter()
+    events = _decode_logs(logs)
+    elapsed = time.perf_counter() - start
+
+    assert len(events) == count
+    print(f"decoded {count} logs in {elapsed:.3f}s ({count / elapsed:,.0f} logs/s)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+Benchmark for loading stored deployments from the deployments database.
+
+A temporary database is filled with deployments that each have a few source files,
+some of them shared. Every deployment is then read by alias, once with a query per
+deployment and once with a single bulk fetch, as done by `Contract` and
+`Contract.many`. No RPC requests are made.
+
+Usage: python tests/benchmarks/bench_deployments.py [NUMBER_OF_DEPLOYMENTS]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from eth_utils import to_checksum_address
+
+from brownie._config import CONFIG
+from brownie.network import state
+from brownie.utils.sql import Cursor
+
+
+class FakeContract:
+    def __init__(self, i: int) -> None:
+        self.address = to_checksum_address(f"0x{i + 1:040x}")
+        paths = [f"contracts/Token{i}.sol", "interfaces/IERC20.sol", "libraries/SafeMath.sol"]
+        self._sources = {path: f"// {path}\n" + "contract X {}\n" * 50 for path in paths}
+        self._build = {
+            "abi": [{"type": "function", "name": "foo", "inputs": [], "outputs": []}] * 20,
+            "allSourcePaths": {str(k): v for k, v in enumerate(paths)},
+            "compiler": {"version": "0.8.0"},
+            "contractName": f"Token{i}",
+            "deployedBytecode": "60" * 2000,
+            "type": "contract",
+        }
+
+
+def main(count: int) -> None:
+    CONFIG._active_network = {"id": "mainnet", "chainid": 1}
+    with tempfile.TemporaryDirectory() as folder:
+        state.cur = Cursor(Path(folder).joinpath("deployments.db"), wal=True)
+        state.cur.execute("CREATE TABLE IF NOT EXISTS sources (hash PRIMARY KEY, source)")
+        for i in range(count):
+            state._add_deployment(FakeContract(i), f"token{i}")
+        aliases = [f"token{i}" for i in range(count)]
+
+        start = time.perf_counter()
+        # the results are kept in both cases, as they are when creating `Contract` objects
+        loaded = [state._get_deployment(alias=alias) for alias in aliases]
+        single = time.perf_counter() - start
+        assert all(i[0] is not None for i in loaded)
+        del loaded
+
+        start = time.perf_counter()
+        deployments = state._get_deployments(aliases)
+        bulk = time.perf_counter() - start
+        assert all(i[0] is not None for i in deployments)
+        state.cur.close()
+
+    print(f"{count} deployments, one query each: {single:.3f}s ({single / count * 1e6:.1f}us each)")
+    print(f"{count} deployments, bulk fetch:     {bulk:.3f}s ({bulk / count * 1e6:.1f}us each)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
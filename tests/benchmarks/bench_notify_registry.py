@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+"""
+Benchmark for the per-test overhead of notifying the revert registry.
+
+`fn_isolation` and hypothesis reset the chain once per test or example, and each
+reset notifies every registered object. This benchmark keeps a heap comparable to
+a large test session alive (500,000 objects) and times the notifications alone,
+without any RPC requests.
+
+Usage: python tests/benchmarks/bench_notify_registry.py [NUMBER_OF_RESETS]
+"""
+
+import sys
+import time
+
+from brownie.network.state import _notify_registry, _revert_register
+
+
+class Registered:
+    def __init__(self) -> None:
+        self.reverts = 0
+        _revert_register(self)
+
+    def _revert(self, height: int) -> None:
+        self.reverts += 1
+
+    def _reset(self) -> None:
+        self.reverts = 0
+
+
+def main(count: int) -> None:
+    heap = [{"key": [i, str(i)]} for i in range(500_000)]
+    registered = [Registered() for i in range(50)]
+
+    start = time.perf_counter()
+    for _ in range(count):
+        _notify_registry(1)  # type: ignore [arg-type]
+    elapsed = time.perf_counter() - start
+
+    assert all(i.reverts == count for i in registered)
+    assert len(heap) == 500_000
+    print(f"{count} notifications in {elapsed:.3f}s ({elapsed / count * 1e3:.3f}ms per reset)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
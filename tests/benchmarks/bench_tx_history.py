@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""
+Benchmark for the per-transaction overhead of the transaction history.
+
+Every transaction sent from a local account adds a receipt to the history, looks up
+the pending nonce of the sender and filters for other transactions with the same
+sender and nonce. This benchmark performs those lookups for a number of receipts
+from a single sender, without any RPC requests.
+
+Usage: python tests/benchmarks/bench_tx_history.py [NUMBER_OF_TRANSACTIONS]
+"""
+
+import sys
+import time
+
+from brownie.convert import EthAddress
+from brownie.network.state import TxHistory
+from brownie.network.transaction import Status, TransactionReceipt
+
+SENDER = EthAddress("0x" + "aa" * 20)
+
+
+def fake_tx(nonce: int) -> TransactionReceipt:
+    tx = TransactionReceipt.__new__(TransactionReceipt)
+    tx.txid = f"0x{nonce:064x}"
+    tx.sender = SENDER
+    tx.receiver = EthAddress("0x" + "bb" * 20)
+    tx.nonce = nonce
+    tx.status = Status(-1)
+    tx.block_number = None
+    return tx
+
+
+def main(count: int) -> None:
+    history = TxHistory()
+    history.clear()
+    txs = [fake_tx(i) for i in range(count)]
+
+    start = time.perf_counter()
+    for tx in txs:
+        last_tx = history._last_from_sender(SENDER)
+        assert last_tx is None or last_tx.nonce == tx.nonce - 1
+        history._add_tx(tx)
+        history.filter(sender=SENDER, nonce=tx.nonce, key=lambda k: k != tx)
+        tx._set_status(1)
+    elapsed = time.perf_counter() - start
+
+    assert len(history) == count
+    history.clear()
+    print(f"{count} transactions in {elapsed:.3f}s ({elapsed / count * 1e6:.1f}us per tx)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
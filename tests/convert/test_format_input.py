@@ -2,7 +2,7 @@
 
 import pytest
 
-from brownie.convert.normalize import format_input
+from brownie.convert.normalize import format_input, get_input_formatter
 
 abi = {
     "inputs": [
@@ -44,3 +44,22 @@ def test_wrong_length_nested_array():
 def test_non_sequence():
     with pytest.raises(TypeError):
         format_input(abi, ["123", (1,), ([1, 1], [2, 2]), "0xff"])
+
+
+def test_compiled_formatter():
+    formatter = get_input_formatter(abi)
+    values = [(1, 2, 3), (1,), ([1, 1], [2, 2]), "0xff"]
+    assert formatter(values) == format_input(abi, values)
+    # the formatter is reused for every call
+    assert formatter([(4, 5, 6), (), (), "0x00"]) == [[4, 5, 6], [], [], "0x" + "00" * 32]
+    with pytest.raises(OverflowError, match="testFunction '.*' - .*outside allowable range"):
+        formatter([(1, 2, 70000), (1,), ([1, 1], [2, 2]), "0xff"])
+
+
+def test_compiled_formatter_shared():
+    from brownie.convert import normalize
+
+    get_input_formatter(abi)
+    count = len(normalize._formatters)
+    get_input_formatter(dict(abi, name="otherFunction"))
+    assert len(normalize._formatters) == count
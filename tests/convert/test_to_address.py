@@ -3,6 +3,7 @@
 import pytest
 
 from brownie.convert import to_address
+from brownie.convert.datatypes import _ChecksumCache, checksum_cache
 
 addr = "0x14b0Ed2a7C4cC60DD8F676AE44D0831d3c9b2a9E"
 addr_encoded = b"\x14\xb0\xed*|L\xc6\r\xd8\xf6v\xaeD\xd0\x83\x1d<\x9b*\x9e"
@@ -26,3 +27,32 @@ def test_wrong_length():
         to_address(addr[:20])
     with pytest.raises(ValueError):
         to_address(addr + "00")
+
+
+def test_checksum_cached():
+    checksum_cache.clear()
+    for _ in range(3):
+        assert to_address(addr.lower()) == addr
+    assert (checksum_cache.hits, checksum_cache.misses) == (2, 1)
+
+
+def test_invalid_not_cached():
+    checksum_cache.clear()
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            to_address("0x00")
+    assert len(checksum_cache) == 0
+    assert checksum_cache.misses == 2
+
+
+def test_cache_eviction():
+    cache = _ChecksumCache(maxsize=2)
+    values = [f"0x{i:040x}" for i in range(3)]
+    for value in values[:2]:
+        cache.checksum(value)
+    # the first value was used most recently, the second is evicted
+    cache.checksum(values[0])
+    cache.checksum(values[2])
+    assert len(cache) == 2
+    cache.checksum(values[1])
+    assert (cache.hits, cache.misses) == (1, 4)
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+
+import pytest
+
+from brownie import compile_source
+from brownie.exceptions import VirtualMachineError
+from brownie.network.account import Account
+
+code = """
+pragma solidity ^0.6.0;
+contract Foo {
+    uint256 public total;
+    function add(uint256 value) external {
+        require(value > 0, "zero");
+        total += value;
+    }
+}
+"""
+
+
+def test_send_batch(accounts, history):
+    receipts = accounts[0].send_batch(
+        [{"to": accounts[i], "amount": i * 1000} for i in range(1, 6)]
+    )
+    assert [i.status for i in receipts] == [1] * 5
+    assert [i.receiver for i in receipts] == list(accounts[1:6])
+    assert [i.nonce for i in receipts] == list(range(5))
+    assert history[-5:] == receipts
+    assert accounts[0].nonce == 5
+
+
+def test_send_batch_contract(accounts):
+    foo = compile_source(code).Foo.deploy({"from": accounts[0]})
+    receipts = accounts[0].send_batch(
+        [{"to": foo, "data": foo.add.encode_input(i)} for i in range(1, 4)]
+    )
+    assert [i.fn_name for i in receipts] == ["add"] * 3
+    assert foo.total() == 6
+
+
+def test_send_batch_raises_on_revert(accounts):
+    foo = compile_source(code).Foo.deploy({"from": accounts[0]})
+    with pytest.raises(VirtualMachineError):
+        accounts[0].send_batch([{"to": foo, "data": foo.add.encode_input(0)}])
+
+
+def test_send_batch_raises_on_revert_without_rpc_error(accounts, monkeypatch):
+    foo = compile_source(code).Foo.deploy({"from": accounts[0]})
+    broadcast = Account._broadcast
+
+    def no_rpc_error(self, *args):
+        # like most nodes, return a txid for the reverting tx instead of an error
+        txid = broadcast(self, *args)[0]
+        return txid, None, None
+
+    monkeypatch.setattr(Account, "_broadcast", no_rpc_error)
+    with pytest.raises(VirtualMachineError):
+        accounts[0].send_batch(
+            [{"to": foo, "data": foo.add.encode_input(0), "gas_limit": 100000}],
+            allow_revert=True,
+        )
+
+
+def test_send_batch_skip(accounts):
+    foo = compile_source(code).Foo.deploy({"from": accounts[0]})
+    receipts = accounts[0].send_batch(
+        [
+            {"to": foo, "data": foo.add.encode_input(1)},
+            {"to": foo, "data": foo.add.encode_input(0)},
+            {"to": foo, "data": foo.add.encode_input(2)},
+        ],
+        on_error="skip",
+    )
+    assert [i.status for i in receipts] == [1, 0, 1]
+    assert foo.total() == 3
+
+
+def test_send_batch_required_confs_zero(accounts):
+    receipts = accounts[0].send_batch([{"to": accounts[1]}] * 3, required_confs=0)
+    for receipt in receipts:
+        receipt.wait(1)
+    assert [i.status for i in receipts] == [1] * 3
+
+
+def test_send_batch_invalid_arguments():
+    account = Account("0x66aB6D9362d4F35596279692F0251Db635165871")
+    with pytest.raises(ValueError):
+        account.send_batch([], on_error="ignore")
+    with pytest.raises(TypeError):
+        account.send_batch([{"to": account, "nonce": 1}])
@@ -0,0 +1,184 @@
+#!/usr/bin/python3
+
+import traceback
+
+import pytest
+from hexbytes import HexBytes
+from web3.eth import Eth
+from web3.exceptions import ContractLogicError
+
+from brownie._config import CONFIG
+from brownie.network.account import _GasEstimateCache
+from brownie.network.state import Chain
+
+SENDER = "0x66aB6D9362d4F35596279692F0251Db635165871"
+RECEIVER = "0x33A4622B82D4c04a53e170c638B944ce27cffce3"
+
+
+class Estimator:
+    def __init__(self, gas=50000):
+        self.gas = gas
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.gas
+
+
+def _tx(data="0xa9059cbb" + "00" * 64, value=0):
+    return {"from": SENDER, "to": RECEIVER, "value": value, "data": HexBytes(data)}
+
+
+@pytest.fixture
+def head(monkeypatch):
+    block = {"number": 10}
+    monkeypatch.setattr(Eth, "block_number", property(lambda self: block["number"]))
+    monkeypatch.setattr(Chain(), "_time_offset", 0)
+    yield block
+
+
+@pytest.fixture
+def development(monkeypatch, head):
+    network = {"id": "development", "cmd": "ganache-cli", "settings": {"gas_estimate_cache": True}}
+    monkeypatch.setattr(CONFIG, "_active_network", network)
+    yield network
+
+
+@pytest.fixture
+def live(monkeypatch):
+    network = {
+        "id": "mainnet",
+        "settings": {
+            "gas_estimate_cache": True,
+            "gas_estimate_margin": 1.2,
+            "gas_estimate_ttl": 60,
+        },
+    }
+    monkeypatch.setattr(CONFIG, "_active_network", network)
+    yield network
+
+
+def test_disabled(development):
+    development["settings"]["gas_estimate_cache"] = False
+    cache = _GasEstimateCache()
+    estimator = Estimator()
+    for _ in range(3):
+        assert cache.estimate(_tx(), estimator) == 50000
+    assert estimator.calls == 3
+    assert cache.lookups["estimate"] == 0
+
+
+def test_development_same_state(development, head):
+    cache = _GasEstimateCache()
+    estimator = Estimator()
+    for _ in range(3):
+        assert cache.estimate(_tx(), estimator) == 50000
+    assert estimator.calls == 1
+    assert (cache.hits["estimate"], cache.lookups["estimate"]) == (2, 3)
+
+    # different calldata is estimated separately
+    cache.estimate(_tx(data="0xa9059cbb" + "00" * 63 + "01"), estimator)
+    assert estimator.calls == 2
+
+    # a new block is a different state
+    head.update(number=11)
+    cache.estimate(_tx(), estimator)
+    assert estimator.calls == 3
+
+
+def test_development_sleep(development, head):
+    cache = _GasEstimateCache()
+    calls = []
+
+    def call():
+        calls.append(1)
+        raise ValueError("execution reverted: timelock")
+
+    with pytest.raises(ValueError):
+        cache.check(_tx(), call)
+    # time-dependent state changes without a new block
+    Chain()._time_offset = 3600
+    cache.check(_tx(), lambda: calls.append(1))
+    assert len(calls) == 2
+
+
+def test_development_revert(development, head):
+    cache = _GasEstimateCache()
+    estimator = Estimator()
+    cache.estimate(_tx(), estimator)
+    head.update(number=11)
+    cache.estimate(_tx(), estimator)
+    assert len(cache._exact) == 2
+
+    # results for blocks above the height of the revert are discarded
+    cache._revert(10)
+    assert len(cache._exact) == 1
+    head.update(number=10)
+    cache.estimate(_tx(), estimator)
+    assert estimator.calls == 2
+
+    cache._reset()
+    assert not cache._exact
+
+
+def test_revert_check(development):
+    cache = _GasEstimateCache()
+    calls = []
+
+    def call():
+        calls.append(1)
+        raise ValueError("execution reverted")
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="execution reverted"):
+            cache.check(_tx(), call)
+    cache.check(_tx(value=1), lambda: calls.append(1))
+    cache.check(_tx(value=1), lambda: calls.append(1))
+    assert len(calls) == 2
+    assert (cache.hits["revert_check"], cache.lookups["revert_check"]) == (2, 4)
+
+
+def test_revert_check_raises_new_exception(development):
+    cache = _GasEstimateCache()
+
+    def call():
+        raise ContractLogicError("execution reverted: foo", data="0x1234")
+
+    raised = []
+    for _ in range(3):
+        with pytest.raises(ContractLogicError) as exc_info:
+            cache.check(_tx(), call)
+        raised.append(exc_info.value)
+    assert len({id(i) for i in raised}) == 3
+    for exc in raised:
+        assert exc.args == ("execution reverted: foo",)
+        assert exc.data == "0x1234"
+        # only the frames of a single raise are included
+        assert len(traceback.extract_tb(exc.__traceback__)) == len(
+            traceback.extract_tb(raised[0].__traceback__)
+        )
+
+
+def test_live_heuristic(live):
+    cache = _GasEstimateCache()
+    estimator = Estimator()
+    assert cache.estimate(_tx(), estimator) == 50000
+    # the same function with calldata of the same length reuses the estimate
+    assert cache.estimate(_tx(data="0xa9059cbb" + "11" * 64), estimator) == 60000
+    assert estimator.calls == 1
+    # a different function is estimated
+    cache.estimate(_tx(data="0x095ea7b3" + "00" * 64), estimator)
+    assert estimator.calls == 2
+
+    # estimates expire
+    live["settings"]["gas_estimate_ttl"] = -1
+    cache.estimate(_tx(), estimator)
+    assert estimator.calls == 3
+
+
+def test_live_revert_check_not_cached(live):
+    cache = _GasEstimateCache()
+    calls = []
+    for _ in range(3):
+        cache.check(_tx(), lambda: calls.append(1))
+    assert len(calls) == 3
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+
+import threading
+
+from brownie.network.account import _is_nonce_error, _NonceManager
+from brownie.network.state import _notify_registry
+
+
+class FakeAccount:
+    def __init__(self, nonce):
+        self.nonce = nonce
+        self.queries = 0
+
+    def _pending_nonce(self):
+        self.queries += 1
+        return self.nonce
+
+
+def test_allocates_locally():
+    account = FakeAccount(5)
+    nonces = _NonceManager(account)
+    allocated = []
+
+    def allocate():
+        for _ in range(100):
+            allocated.append(nonces.allocate())
+
+    threads = [threading.Thread(target=allocate) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(allocated) == list(range(5, 805))
+    assert account.queries == 1
+
+
+def test_release():
+    nonces = _NonceManager(FakeAccount(0))
+    assert [nonces.allocate() for i in range(3)] == [0, 1, 2]
+    nonces.release(2)
+    assert nonces.allocate() == 2
+
+    # releasing an earlier nonce leaves a gap, the next nonce is read from the node
+    nonces.allocate()
+    nonces._account.nonce = 1
+    nonces.release(1)
+    assert nonces.allocate() == 1
+    assert nonces._account.queries == 2
+
+
+def test_observe():
+    nonces = _NonceManager(FakeAccount(0))
+    nonces.allocate()
+    nonces.observe(7)
+    assert nonces.allocate() == 8
+    nonces.observe(3)
+    assert nonces.allocate() == 9
+
+
+def test_resync_on_revert():
+    account = FakeAccount(3)
+    nonces = _NonceManager(account)
+    assert nonces.allocate() == 3
+    account.nonce = 1
+    _notify_registry(0)
+    assert nonces.allocate() == 1
+
+
+def test_is_nonce_error():
+    assert _is_nonce_error(ValueError({"code": -32000, "message": "nonce too low"}))
+    assert _is_nonce_error(
+        ValueError("the tx doesn't have the correct nonce. account has nonce of: 4")
+    )
+    assert not _is_nonce_error(ValueError({"code": -32000, "message": "insufficient funds"}))
+    assert not _is_nonce_error(ValueError())
@@ -24,16 +24,14 @@ def test_transact(accounts, tester):
 
 
 def test_block_identifier(accounts, history):
-    contract = compile_source(
-        """
+    contract = compile_source("""
 # @version 0.2.4
 foo: public(int128)
 
 @external
 def set_foo(_foo: int128):
     self.foo = _foo
-    """
-    ).Vyper.deploy({"from": accounts[0]})
+    """).Vyper.deploy({"from": accounts[0]})
 
     contract.set_foo(13)
     contract.set_foo(42)
@@ -110,3 +108,12 @@ def test_tuples(tester, accounts):
 def test_default_owner_with_coverage(tester, coverage_mode, accounts, config):
     config.active_network["settings"]["default_contract_owner"] = False
     tester.getTuple(accounts[0])
+
+
+def test_raw(tester, accounts):
+    value = ["blahblah", accounts[1], ["yesyesyes", "0x1234"]]
+    tester.setTuple(value)
+    result = tester.getTuple(accounts[1], raw=True)
+    assert result == ("blahblah", accounts[1].address.lower(), ("yesyesyes", b"\x124" + bytes(30)))
+    assert type(result) is tuple
+    assert type(result[1]) is str
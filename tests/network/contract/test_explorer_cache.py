@@ -0,0 +1,231 @@
+#!/usr/bin/python3
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from eth_utils import to_checksum_address
+
+from brownie._config import CONFIG
+from brownie.network import contract as contract_module
+from brownie.network import web3
+from brownie.network.contract import (
+    Contract,
+    _compile_explorer_source,
+    _explorer_cache,
+    _RateLimiter,
+)
+from brownie.network.event import _deployment_topics
+
+ABI = [
+    {
+        "type": "function",
+        "name": "value",
+        "inputs": [],
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+    }
+]
+
+
+class Explorer(ThreadingHTTPServer):
+    """
+    Stand-in for the Etherscan API, serving contracts with a known ABI which are
+    verified with a compiler that brownie does not support.
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), ExplorerHandler)
+        self.unverified = set()
+        self.implementations = {}
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/api"
+
+
+class ExplorerHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        query = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        with server.lock:
+            server.requests.append((query["action"], query["address"]))
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        time.sleep(0.05)
+        address = query["address"]
+        if query["action"] == "getsourcecode" and address in server.unverified:
+            result = [{"SourceCode": "", "ABI": "Contract source code not verified"}]
+        elif query["action"] == "getsourcecode":
+            result = [
+                {
+                    "SourceCode": "contract Foo {}",
+                    "ABI": json.dumps(ABI),
+                    "ContractName": "Foo",
+                    "CompilerVersion": "v0.4.11+commit.68ef5810",
+                    "OptimizationUsed": "0",
+                    "Runs": "200",
+                    "Implementation": server.implementations.get(address, ""),
+                }
+            ]
+        else:
+            result = json.dumps(ABI)
+        body = json.dumps({"status": "1", "message": "OK", "result": result}).encode()
+        with server.lock:
+            server.active -= 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _address(i):
+    return to_checksum_address(f"0x{i + 100:040x}")
+
+
+@pytest.fixture
+def explorer(monkeypatch, tmp_path):
+    server = Explorer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setitem(
+        CONFIG.settings,
+        "explorer",
+        {
+            "url": server.url,
+            "cache_ttl": 60,
+            "proxy_cache_ttl": 60,
+            "requests_per_second": None,
+            "max_workers": 4,
+        },
+    )
+    monkeypatch.setattr(CONFIG, "_active_network", {"id": "mainnet"})
+    monkeypatch.setattr(type(web3), "chain_id", property(lambda self: 1))
+    monkeypatch.setattr(web3.eth, "get_code", lambda address: b"\x60\x00")
+    monkeypatch.setattr(web3.eth, "get_storage_at", lambda address, slot: b"")
+    monkeypatch.setattr(contract_module, "_get_data_folder", lambda: tmp_path)
+    monkeypatch.setattr(_explorer_cache, "_cur", None)
+    yield server
+    server.shutdown()
+    server.server_close()
+    _explorer_cache._connect().close()
+    for i in range(10):
+        _deployment_topics.pop(_address(i), None)
+
+
+def test_responses_cached(explorer):
+    for _ in range(3):
+        contract = Contract.from_explorer(_address(0), silent=True)
+        assert contract.value.abi == ABI[0]
+    assert explorer.requests == [("getsourcecode", _address(0))]
+
+
+def test_cache_expires(explorer):
+    CONFIG.settings["explorer"]["cache_ttl"] = 60
+    Contract.from_explorer(_address(0), silent=True)
+    _explorer_cache._connect().execute("UPDATE responses SET timestamp=0")
+    Contract.from_explorer(_address(0), silent=True)
+    assert len(explorer.requests) == 2
+
+
+def test_cache_disabled(explorer):
+    CONFIG.settings["explorer"]["cache_ttl"] = None
+    for _ in range(2):
+        Contract.from_explorer(_address(0), silent=True)
+    assert len(explorer.requests) == 2
+
+
+def test_unverified_not_cached(explorer):
+    explorer.unverified.add(_address(0))
+    for _ in range(2):
+        contract = Contract.from_explorer(_address(0), silent=True)
+        assert contract.value.abi == ABI[0]
+    # the source is fetched again in case the contract was verified meanwhile
+    assert sorted(explorer.requests) == [
+        ("getabi", _address(0)),
+        ("getsourcecode", _address(0)),
+        ("getsourcecode", _address(0)),
+    ]
+
+
+def test_proxy_cache_expires(explorer):
+    CONFIG.settings["explorer"]["cache_ttl"] = 3600
+    explorer.implementations[_address(0)] = _address(1)
+    Contract.from_explorer(_address(0), silent=True)
+    _explorer_cache._connect().execute("UPDATE responses SET timestamp=?", (time.time() - 120,))
+    Contract.from_explorer(_address(0), silent=True)
+    # the implementation may have changed, but its own source has not
+    assert sorted(explorer.requests) == [
+        ("getsourcecode", _address(0)),
+        ("getsourcecode", _address(0)),
+        ("getsourcecode", _address(1)),
+    ]
+
+
+def test_proxy_cache_disabled(explorer):
+    CONFIG.settings["explorer"]["proxy_cache_ttl"] = None
+    explorer.implementations[_address(0)] = _address(1)
+    for _ in range(2):
+        Contract.from_explorer(_address(0), silent=True)
+    assert sorted(explorer.requests) == [
+        ("getsourcecode", _address(0)),
+        ("getsourcecode", _address(0)),
+        ("getsourcecode", _address(1)),
+    ]
+
+
+@pytest.mark.parametrize("ttl", [60, None])
+def test_from_explorer_many(explorer, ttl):
+    CONFIG.settings["explorer"]["cache_ttl"] = ttl
+    addresses = [_address(i) for i in range(8)] + [_address(0)]
+    contracts = Contract.from_explorer_many(addresses, silent=True)
+
+    assert [i.address for i in contracts] == addresses
+    assert contracts[0] is contracts[-1]
+    # each response is fetched once, concurrently
+    assert len(explorer.requests) == 8
+    assert len(set(explorer.requests)) == 8
+    assert explorer.max_active > 1
+    # responses are only kept in memory while the contracts are created
+    assert not _explorer_cache._memory
+
+
+def test_rate_limit():
+    limiter = _RateLimiter()
+    start = time.monotonic()
+    threads = [threading.Thread(target=limiter.wait, args=(50,)) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - start >= 0.18
+
+
+def test_compile_once(monkeypatch):
+    calls = []
+
+    def compile_and_format(sources, **kwargs):
+        calls.append(sources)
+        return {"Foo": {"abi": []}}
+
+    monkeypatch.setattr(contract_module.compiler, "compile_and_format", compile_and_format)
+    contract_module._explorer_builds.clear()
+    args = ("Foo", "v0.8.19+commit.7dd6d404", "0.8.19", {"enabled": True, "runs": 200}, None)
+    for _ in range(3):
+        build_json, sources = _compile_explorer_source(*args, "contract Foo {}")
+        assert sources == {"Foo-flattened.sol": "contract Foo {}"}
+    assert len(calls) == 1
+
+    _compile_explorer_source(*args, "contract Foo { uint x; }")
+    assert len(calls) == 2
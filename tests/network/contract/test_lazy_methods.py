@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+
+import copy
+import warnings
+
+import pytest
+from eth_utils import to_checksum_address
+
+from brownie.exceptions import BrownieEnvironmentWarning
+from brownie.network import web3
+from brownie.network.contract import (
+    Contract,
+    ContractCall,
+    ContractTx,
+    OverloadedMethod,
+    _get_template,
+)
+from brownie.network.event import _deployment_topics
+
+
+def _fn(name, inputs=(), mutability="view"):
+    return {
+        "type": "function",
+        "name": name,
+        "inputs": [{"name": f"arg{i}", "type": t} for i, t in enumerate(inputs)],
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": mutability,
+    }
+
+
+ABI = [_fn(f"fn{i}") for i in range(20)] + [
+    _fn("transfer", ["address", "uint256"], "nonpayable"),
+    _fn("over", ["uint256"]),
+    _fn("over", ["uint256", "address"]),
+    {
+        "type": "event",
+        "name": "Transfer",
+        "anonymous": False,
+        "inputs": [{"name": "to", "type": "address", "indexed": True}],
+    },
+]
+
+
+@pytest.fixture(autouse=True)
+def get_code(monkeypatch):
+    monkeypatch.setattr(web3.eth, "get_code", lambda address: b"\x60\x00")
+    yield
+    for i in range(1, 4):
+        _deployment_topics.pop(_address(i), None)
+
+
+def _address(i):
+    return to_checksum_address(f"0x{i:040x}")
+
+
+def _contract(i=1, abi=ABI):
+    return Contract.from_abi("Pool", _address(i), abi, persist=False)
+
+
+def test_methods_created_on_access():
+    contract = _contract()
+    assert "fn3" not in contract.__dict__
+    assert "events" not in contract.__dict__
+    assert isinstance(contract.fn3, ContractCall)
+    assert isinstance(contract.transfer, ContractTx)
+    assert contract.fn3 is contract.fn3
+    assert contract.fn3._name == "Pool.fn3"
+    assert contract.events.linked_contract is contract
+    assert list(contract.__dict__).count("fn3") == 1
+
+
+def test_overloaded():
+    contract = _contract()
+    assert isinstance(contract.over, OverloadedMethod)
+    assert len(contract.over.methods) == 2
+    assert contract.over["uint256"].abi["inputs"][0]["type"] == "uint256"
+
+
+def test_template_shared():
+    first, second = _contract(1), _contract(2)
+    assert first._template is second._template
+    assert first.selectors is second.selectors
+    # an equal ABI from another source shares the template
+    assert _contract(3, copy.deepcopy(ABI))._template is first._template
+    assert _get_template(ABI[:5]) is not first._template
+
+
+def test_dir():
+    names = dir(_contract())
+    assert {"fn0", "fn19", "over", "transfer", "events", "balance"} <= set(names)
+
+
+def test_unknown_attribute():
+    contract = _contract()
+    with pytest.raises(AttributeError, match="Contract 'Pool' object has no attribute 'foo'"):
+        contract.foo
+
+
+def test_cannot_assign_method():
+    contract = _contract()
+    with pytest.raises(AttributeError):
+        contract.fn1 = 1
+
+
+def test_get_method_object():
+    contract = _contract()
+    method = contract.get_method_object(contract.signatures["fn7"] + "00" * 32)
+    assert method is contract.fn7
+
+
+def test_namespace_collision():
+    abi = ABI + [_fn("balance"), _fn("info"), _fn("events")]
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        contract = _contract(abi=abi)
+    assert len([i for i in caught if i.category is BrownieEnvironmentWarning]) == 3
+    assert isinstance(contract.balance, ContractCall)
+    assert contract.wei_balance.__name__ == "balance"
+    assert callable(contract.info) and not isinstance(contract.info, ContractCall)
+    assert not isinstance(contract.events, ContractCall)
+
+
+def test_codec_created_once():
+    contract = _contract()
+    calldata = contract.transfer.encode_input(_address(2), 10)
+    assert contract.transfer._codec is contract.transfer._codec
+    assert contract.transfer.decode_input(calldata) == [_address(2), 10]
+    assert contract.fn1.decode_output("0x" + "00" * 31 + "2a") == 42
+
+
+def test_decode_output_raw():
+    contract = _contract()
+    output = "0x" + "00" * 31 + "2a"
+    result = contract.fn1.decode_output(output, raw=True)
+    assert result == 42
+    assert type(result) is int
+    assert type(contract.fn1.decode_output(output)) is not int
@@ -1,4 +1,63 @@
 import pytest
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+
+
+class FakeBlocks:
+    """A live chain of 1000 blocks which counts calls to `eth_getBlockByNumber`."""
+
+    def __init__(self):
+        self.height = 999
+        self.requested = []
+
+    def get_block(self, block_id, full_transactions=False):
+        if block_id == "latest":
+            block_id = self.height
+        self.requested.append(block_id)
+        return AttributeDict(
+            {
+                "number": block_id,
+                "hash": HexBytes(block_id.to_bytes(32, "big")),
+                "timestamp": block_id * 12,
+                "gasLimit": 30_000_000,
+            }
+        )
+
+
+@pytest.fixture
+def fake_blocks(monkeypatch, config, chain, web3):
+    blocks = FakeBlocks()
+    monkeypatch.setattr(config, "_active_network", {"id": "fake", "chainid": 424242})
+    monkeypatch.setattr(type(web3.eth), "block_number", property(lambda self: blocks.height))
+    monkeypatch.setattr(web3.eth, "get_block", blocks.get_block)
+    chain._block_cache.clear()
+    yield blocks
+    chain._block_cache.clear()
+
+
+def test_blocks_in_order(fake_blocks, chain):
+    assert [i.number for i in chain.blocks(100, 600, workers=4)] == list(range(100, 600))
+    assert [i.number for i in chain.blocks(-10, workers=1)] == list(range(990, 1000))
+    assert len(list(chain)) == 1000
+
+
+def test_getitem_uses_block_cache(fake_blocks, chain):
+    list(chain.blocks(900))
+    fake_blocks.requested.clear()
+
+    assert chain[900].number == 900
+    assert chain[-100].number == 900
+    assert fake_blocks.requested == []
+
+    # recent blocks may still be reorganized, and are requested again
+    assert chain[-1].number == 999
+    assert fake_blocks.requested == [999]
+
+
+def test_block_cache_by_hash(fake_blocks, chain):
+    block = chain[999]
+    assert chain._block_cache.get(block.hash, False) is block
+    assert chain._block_cache.get(block.hash, True) is None
 
 
 def test_length(devnetwork, chain):
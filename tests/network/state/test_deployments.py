@@ -0,0 +1,118 @@
+#!/usr/bin/python3
+
+import sqlite3
+import threading
+
+import pytest
+from eth_utils import to_checksum_address
+
+from brownie._config import CONFIG
+from brownie.network import state
+from brownie.utils import sql
+from brownie.utils.sql import Cursor
+
+
+class FakeContract:
+    def __init__(self, i, source="contract Foo {}"):
+        self.address = to_checksum_address(f"0x{i + 1:040x}")
+        self._sources = {"contracts/Foo.sol": source}
+        self._build = {
+            "abi": [],
+            "allSourcePaths": {"0": "contracts/Foo.sol"},
+            "compiler": {"version": "0.8.0"},
+            "contractName": "Foo",
+            "pcMap": {"0": {"op": "PUSH1"}},
+            "type": "contract",
+        }
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    cur = Cursor(tmp_path.joinpath("deployments.db"), wal=True)
+    cur.execute("CREATE TABLE IF NOT EXISTS sources (hash PRIMARY KEY, source)")
+    monkeypatch.setattr(state, "cur", cur)
+    monkeypatch.setattr(CONFIG, "_active_network", {"id": "mainnet", "chainid": 1})
+    yield cur
+    cur.close()
+
+
+def test_get_deployment(store):
+    contract = FakeContract(0)
+    state._add_deployment(contract, "foo")
+    for build, sources in (
+        state._get_deployment(contract.address),
+        state._get_deployment(alias="foo"),
+    ):
+        assert build["address"] == contract.address
+        assert build["alias"] == "foo"
+        assert build["allSourcePaths"] == {"0": "contracts/Foo.sol"}
+        assert build["pcMap"] == {0: {"op": "PUSH1"}}
+        assert sources == {"contracts/Foo.sol": "contract Foo {}"}
+    assert state._get_deployment(alias="bar") == (None, None)
+    # values are bound, not interpolated into the query
+    assert state._get_deployment(alias="' OR '1'='1") == (None, None)
+
+
+def test_get_deployments(store):
+    contracts = [FakeContract(i, source=f"contract Foo{i % 3} {{}}") for i in range(1200)]
+    for i, contract in enumerate(contracts):
+        state._add_deployment(contract, f"foo{i}" if i % 2 else None)
+
+    values = [i.address for i in contracts] + ["foo1", "unknown", contracts[0].address.lower()]
+    deployments = state._get_deployments(values)
+    assert len(deployments) == len(values)
+    for contract, (build, sources) in zip(contracts, deployments):
+        assert build["address"] == contract.address
+        assert sources == contract._sources
+    assert deployments[1200][0]["address"] == contracts[1].address
+    assert deployments[1201] == (None, None)
+    assert deployments[1202][0]["address"] == contracts[0].address
+    # each deployment has its own build data
+    assert deployments[1200][0] is not deployments[1][0]
+
+
+def test_get_deployments_no_table(store):
+    assert state._get_deployments(["foo"]) == [(None, None)]
+
+
+def test_read_during_write(store):
+    store.execute("CREATE TABLE test (a)")
+    store.insert("test", 1)
+    with store._lock:
+        # a write in progress does not block reads
+        thread = threading.Thread(target=lambda: store.fetchone("SELECT a FROM test"))
+        thread.start()
+        thread.join(5)
+        assert not thread.is_alive()
+
+
+def test_connect_closes_readers(store, tmp_path):
+    store.execute("CREATE TABLE test (a)")
+    store.insert("test", 1)
+    assert store.fetchone("SELECT a FROM test") == (1,)
+    readers = store._readers[:]
+
+    store.connect(tmp_path.joinpath("other.db"))
+    assert not store._readers
+    with pytest.raises(sqlite3.ProgrammingError):
+        readers[0][1].execute("SELECT 1")
+    with pytest.raises(sqlite3.OperationalError):
+        store.fetchone("SELECT a FROM test")
+
+
+def test_connect_closes_reader_in_use(store, tmp_path, monkeypatch):
+    connect = sqlite3.connect
+    connections = []
+
+    def connect_reader(*args, **kwargs):
+        # the cursor is connected to another file while the read is made
+        db = connect(*args, **kwargs)
+        db.create_function("reconnect", 0, lambda: store.connect(tmp_path.joinpath("other.db")))
+        connections.append(db)
+        return db
+
+    monkeypatch.setattr(sql.sqlite3, "connect", connect_reader)
+    assert store.fetchone("SELECT reconnect()") == (None,)
+    assert not store._readers
+    with pytest.raises(sqlite3.ProgrammingError):
+        connections[0].execute("SELECT 1")
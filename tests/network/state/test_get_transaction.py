@@ -12,7 +12,7 @@ def test_exists_in_history(accounts, chain, history):
 @auto_retry
 def test_not_in_history(accounts, chain, history):
     tx = accounts[0].transfer(accounts[1], 1000)
-    history._list.clear()
+    history.clear()
     othertx = chain.get_transaction(tx.txid)
 
     assert tx != othertx
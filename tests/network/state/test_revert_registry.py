@@ -0,0 +1,28 @@
+#!/usr/bin/python3
+
+from brownie.network import state
+
+
+class Registered:
+    def __init__(self):
+        state._revert_register(self)
+
+    def _revert(self, height):
+        pass
+
+    def _reset(self):
+        pass
+
+
+def test_released_without_collection():
+    obj = Registered()
+    key = id(obj)
+    assert state._revert_refs[key]() is obj
+    del obj
+    assert key not in state._revert_refs
+
+
+def test_unregister():
+    obj = Registered()
+    state._revert_unregister(obj)
+    assert id(obj) not in state._revert_refs
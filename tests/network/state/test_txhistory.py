@@ -1,5 +1,11 @@
 #!/usr/bin/python3
 
+import pytest
+
+from brownie._config import CONFIG
+from brownie.convert import EthAddress
+from brownie.network.transaction import Status, TransactionReceipt
+
 
 def test_adds_tx(accounts, history):
     assert len(history) == 0
@@ -77,3 +83,140 @@ def test_filter(accounts, history):
     assert history.filter(sender=accounts[0]) == [tx1, tx3]
     assert history.filter(sender=accounts[1], receiver=accounts[2]) == [tx2]
     assert history.filter(sender=accounts[0], key=lambda k: k.value > "1 ether") == [tx3]
+
+
+def fake_tx(txid, sender, receiver, nonce, status=-1, block_number=None):
+    # a receipt which is only used within the history, without querying the network
+    tx = TransactionReceipt.__new__(TransactionReceipt)
+    tx.txid = txid
+    tx.sender = EthAddress(sender)
+    tx.receiver = EthAddress(receiver) if receiver else None
+    tx.nonce = nonce
+    tx.status = Status(status)
+    tx.block_number = block_number
+    tx._raw_trace = None
+    tx._trace = None
+    tx._trace_released = False
+    tx._trace_users = 0
+    return tx
+
+
+@pytest.fixture
+def fake_history(history):
+    history.clear()
+    yield history
+    history.clear()
+
+
+def test_filter_uses_index(fake_history):
+    a, b = "0x" + "aa" * 20, "0x" + "bb" * 20
+    txs = [fake_tx(f"0x{i:064x}", a if i % 2 else b, b, i // 2) for i in range(10)]
+    for tx in txs:
+        fake_history._add_tx(tx)
+    fake_history._add_tx(txs[0])
+
+    assert len(fake_history) == 10
+    assert fake_history.filter(sender=a.upper().replace("0X", "0x")) == txs[1::2]
+    assert fake_history.filter(sender=a, nonce=2) == [txs[5]]
+    assert fake_history.to_receiver(b) == txs
+    assert fake_history.of_address(a) == txs[1::2]
+    assert fake_history.of_address(b) == txs
+    assert fake_history.filter(txid=txs[3].txid) == [txs[3]]
+
+    txs[4]._set_status(1)
+    txs[2]._set_status(1)
+    assert fake_history.filter(status=1) == [txs[2], txs[4]]
+    assert fake_history.filter(status=-1, sender=b) == [txs[0], txs[6], txs[8]]
+
+
+def test_dropped_tx_removed(fake_history):
+    sender = "0x" + "aa" * 20
+    first = fake_tx("0x01", sender, None, 0)
+    replacement = fake_tx("0x02", sender, None, 0)
+    fake_history._add_tx(first)
+    fake_history._add_tx(replacement)
+    assert fake_history._last_from_sender(sender) is replacement
+
+    replacement._set_status(-2)
+    assert fake_history.copy() == [first]
+    assert fake_history.filter(sender=sender, nonce=0) == [first]
+    assert fake_history._last_from_sender(sender) is first
+    assert fake_history.filter(status=-2) == []
+
+    first._set_status(-2)
+    assert not fake_history
+    assert fake_history._last_from_sender(sender) is None
+
+
+@pytest.fixture
+def history_settings(monkeypatch):
+    settings = CONFIG.settings["history"]
+    for key, value in settings.items():
+        monkeypatch.setitem(settings, key, value)
+    yield settings
+
+
+def test_spills_to_store(fake_history, history_settings):
+    history_settings["max_receipts"] = 3
+    sender = "0x" + "aa" * 20
+    txs = [fake_tx(f"0x{i:064x}", sender, None, i, 1, i) for i in range(10)]
+    for tx in txs:
+        fake_history._add_tx(tx)
+
+    assert len(fake_history) == 10
+    assert fake_history._list == txs[7:]
+    assert [i.txid for i in fake_history] == [i.txid for i in txs]
+    assert fake_history[0].txid == txs[0].txid
+    assert fake_history[0] is fake_history[0]
+    assert fake_history[-1] is txs[-1]
+    assert [i.nonce for i in fake_history[2:5]] == [2, 3, 4]
+    assert fake_history[2] in fake_history
+    assert [i.nonce for i in fake_history.filter(sender=sender, status=1)] == list(range(10))
+    assert fake_history.filter(sender=sender, nonce=4) == [fake_history[4]]
+    assert fake_history._get(txs[1].txid) is fake_history[1]
+
+    fake_history._revert(5)
+    assert [i.nonce for i in fake_history] == list(range(6))
+    assert fake_history._last_from_sender(sender).nonce == 5
+
+
+def test_pending_tx_not_spilled(fake_history, history_settings):
+    history_settings["max_receipts"] = 1
+    sender = "0x" + "aa" * 20
+    txs = [fake_tx(f"0x{i:064x}", sender, None, i) for i in range(3)]
+    for tx in txs:
+        fake_history._add_tx(tx)
+    assert fake_history._list == txs
+
+    txs[1]._set_status(1)
+    assert fake_history._list == txs
+    txs[0]._set_status(1)
+    assert fake_history._list == txs[2:]
+    assert [i.txid for i in fake_history] == [i.txid for i in txs]
+
+
+def test_trace_budget(fake_history, history_settings):
+    history_settings["max_trace_bytes"] = 100
+    txs = [fake_tx(f"0x{i:064x}", "0x" + "aa" * 20, None, i, 1) for i in range(3)]
+    for tx in txs:
+        fake_history._add_tx(tx)
+        tx._raw_trace = [{}]
+        fake_history._trace_loaded(tx, 60)
+
+    assert [i._trace_released for i in txs] == [True, True, False]
+    assert txs[0]._raw_trace is None
+    assert txs[2]._raw_trace == [{}]
+    assert fake_history._trace_bytes == 60
+
+
+def test_drop_traces(fake_history, history_settings):
+    tx = fake_tx("0x01", "0x" + "aa" * 20, None, 0, 1)
+    fake_history._add_tx(tx)
+    tx._raw_trace = tx._trace = [{}]
+    fake_history._trace_accessed(tx)
+    assert tx._trace is not None
+
+    history_settings["drop_traces"] = True
+    fake_history._trace_accessed(tx)
+    assert tx._trace is None
+    assert tx._trace_released
@@ -68,3 +68,19 @@ def test_does_not_undo_mining(accounts, chain, web3):
     accounts[0].transfer(accounts[1], 100)
     chain.undo()
     assert web3.eth.block_number == height
+
+
+@pytest.mark.parametrize("interval,expected", [(0, 0), (1, 3), (3, 3)])
+def test_undo_snapshot_interval(accounts, chain, config, history, interval, expected):
+    config.settings["undo_snapshot_interval"] = interval
+    balances = [accounts[0].balance()]
+    for i in range(1, 6):
+        accounts[0].transfer(accounts[i], f"{i} ether")
+        balances.append(accounts[0].balance())
+
+    # reverts to the nearest snapshot, without broadcasting any transaction
+    chain.undo(2)
+    assert accounts[0].balance() == balances[expected]
+    assert len(history) == expected
+    chain.redo(5 - expected)
+    assert accounts[0].balance() == balances[5]
@@ -0,0 +1,260 @@
+#!/usr/bin/python3
+
+import threading
+import time
+
+import pytest
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from web3.eth import Eth
+from web3.exceptions import MethodUnavailable, TransactionNotFound
+
+from brownie.network import confirmations, web3
+from brownie.network.confirmations import confirmation_tracker
+from brownie.network.head import head_tracker
+
+SENDER = "0x66aB6D9362d4F35596279692F0251Db635165871"
+
+
+class FakeChain:
+    """A chain where transactions are mined explicitly, without support for filters."""
+
+    def __init__(self):
+        self.blocks = {}
+        self.canonical = []
+        self.receipts = {}
+        self.nonces = {}
+        self.requests = {"receipt": 0, "block_receipts": 0, "nonce": 0}
+        self.mine([])
+
+    def mine(self, txids, fork=0, canonical=None):
+        canonical = list(self.canonical if canonical is None else canonical)
+        number = len(canonical)
+        block = AttributeDict(
+            {
+                "number": number,
+                "hash": HexBytes(number.to_bytes(16, "big") + fork.to_bytes(16, "big")),
+                "parentHash": canonical[-1].hash if canonical else HexBytes(bytes(32)),
+                "timestamp": number,
+                "transactions": [HexBytes(i) for i in txids],
+            }
+        )
+        self.blocks[block.hash] = block
+        for txid in txids:
+            self.receipts[txid] = AttributeDict(
+                {"transactionHash": HexBytes(txid), "blockNumber": number, "blockHash": block.hash}
+            )
+            self.nonces[SENDER] = self.nonces.get(SENDER, 0) + 1
+        self.canonical = canonical + [block]
+
+    def fork(self, height, txids):
+        for block in self.canonical[height + 1 :]:
+            for txid in block.transactions:
+                del self.receipts[f"0x{bytes(txid).hex()}"]
+                self.nonces[SENDER] -= 1
+        self.mine(txids, fork=1, canonical=self.canonical[: height + 1])
+
+    def get_block(self, block_id, full_transactions=False):
+        if block_id == "latest":
+            return self.canonical[-1]
+        if isinstance(block_id, int):
+            return self.canonical[block_id]
+        return self.blocks[HexBytes(block_id)]
+
+    def get_transaction_receipt(self, txid):
+        self.requests["receipt"] += 1
+        txid = HexBytes(txid)
+        for key, receipt in self.receipts.items():
+            if HexBytes(key) == txid:
+                return receipt
+        raise TransactionNotFound(txid)
+
+    def get_transaction_count(self, address, block_identifier=None):
+        self.requests["nonce"] += 1
+        return self.nonces.get(address, 0)
+
+    def request_blocking(self, method, params):
+        assert method == "eth_getBlockReceipts"
+        self.requests["block_receipts"] += 1
+        block = self.canonical[int(params[0], 16)]
+        return [
+            {
+                "transactionHash": f"0x{bytes(i).hex()}",
+                "blockNumber": hex(block.number),
+                "blockHash": f"0x{bytes(block.hash).hex()}",
+            }
+            for i in block.transactions
+        ]
+
+
+class FakeReceipt:
+    def __init__(self, txid, nonce):
+        self.txid = txid
+        self.nonce = nonce
+        self.sender = SENDER
+        self.status = -1
+        self.block_number = None
+        self._silent = True
+        self._confirmed = threading.Event()
+        self._confirm_exc = None
+        self.confirmed_with = []
+
+    def _confirm(self, receipt, required_confs):
+        self.confirmed_with.append(receipt)
+        self.status = 1
+        self._confirmed.set()
+
+    def _set_status(self, status):
+        self.status = status
+
+
+def _txid(i):
+    return f"0x{i:064x}"
+
+
+def _wait_until(condition):
+    deadline = time.time() + 5
+    while not condition():
+        if time.time() > deadline:
+            raise TimeoutError
+        time.sleep(0.01)
+
+
+def _track(receipts, required_confs):
+    for receipt in receipts:
+        confirmation_tracker.track(receipt, required_confs)
+    # wait until the tracker has checked the receipts against the current head
+    _wait_until(lambda: all(i.checked for i in list(confirmation_tracker._entries.values())))
+
+
+@pytest.fixture
+def fake_chain(monkeypatch):
+    def no_filter(*args):
+        raise MethodUnavailable({"code": -32601, "message": "method not found"})
+
+    chain = FakeChain()
+    monkeypatch.setattr(web3.eth, "get_block", chain.get_block)
+    monkeypatch.setattr(web3.eth, "filter", no_filter)
+    monkeypatch.setattr(web3.eth, "get_transaction_receipt", chain.get_transaction_receipt)
+    monkeypatch.setattr(web3.eth, "get_transaction_count", chain.get_transaction_count)
+    monkeypatch.setattr(web3.manager, "request_blocking", chain.request_blocking)
+    monkeypatch.setattr(Eth, "block_number", property(lambda self: chain.canonical[-1].number))
+    monkeypatch.setattr(confirmation_tracker, "_block_receipts", None)
+    yield chain
+    with confirmation_tracker._lock:
+        confirmation_tracker._entries.clear()
+    while confirmation_tracker._thread is not None or head_tracker._thread is not None:
+        time.sleep(0.01)
+
+
+def test_confirms_all_receipts_in_block(fake_chain):
+    receipts = [FakeReceipt(_txid(i), i) for i in range(100)]
+    _track(receipts, 1)
+
+    fake_chain.mine([i.txid for i in receipts[:50]])
+    for receipt in receipts[:50]:
+        assert receipt._confirmed.wait(5)
+    assert [len(i.confirmed_with) for i in receipts] == [1] * 50 + [0] * 50
+    assert receipts[0].confirmed_with[0].blockNumber == 1
+    # one query for the receipts of the block, instead of one per transaction
+    assert fake_chain.requests["block_receipts"] == 1
+
+    fake_chain.mine([i.txid for i in receipts[50:]])
+    for receipt in receipts[50:]:
+        assert receipt._confirmed.wait(5)
+    assert fake_chain.requests["block_receipts"] == 2
+
+
+def test_block_receipts_not_supported(fake_chain, monkeypatch):
+    def not_supported(method, params):
+        raise MethodUnavailable({"code": -32601, "message": "method not found"})
+
+    monkeypatch.setattr(web3.manager, "request_blocking", not_supported)
+    receipts = [FakeReceipt(_txid(i), i) for i in range(3)]
+    _track(receipts, 1)
+    fake_chain.mine([i.txid for i in receipts])
+    for receipt in receipts:
+        assert receipt._confirmed.wait(5)
+    assert confirmation_tracker._block_receipts is False
+
+
+def test_required_confs(fake_chain):
+    receipt = FakeReceipt(_txid(1), 0)
+    _track([receipt], 3)
+    fake_chain.mine([receipt.txid])
+    fake_chain.mine([])
+    _wait_until(lambda: head_tracker.head.number == 2)
+    assert not receipt._confirmed.wait(0.5)
+    assert receipt.block_number == 1
+    assert receipt.status == -1
+
+    fake_chain.mine([])
+    assert receipt._confirmed.wait(5)
+    assert receipt.status == 1
+
+
+def test_wait_for(fake_chain):
+    receipt = FakeReceipt(_txid(1), 0)
+    _track([receipt], 0)
+    event = confirmation_tracker.wait_for(receipt, 2)
+    fake_chain.mine([receipt.txid])
+    assert receipt._confirmed.wait(5)
+    assert not event.wait(0.5)
+    fake_chain.mine([])
+    assert event.wait(5)
+
+
+def test_dropped(fake_chain):
+    receipt = FakeReceipt(_txid(1), 0)
+    _track([receipt], 1)
+    # the nonce is used by a transaction which is not tracked
+    fake_chain.mine([_txid(2)])
+    assert receipt._confirmed.wait(5)
+    assert receipt.status == -2
+    assert not receipt.confirmed_with
+
+
+def test_mined_before_tracking(fake_chain):
+    receipt = FakeReceipt(_txid(1), 0)
+    fake_chain.mine([receipt.txid])
+    confirmation_tracker.track(receipt, 1)
+    # no new block is mined, the receipt is queried directly
+    assert receipt._confirmed.wait(5)
+    assert receipt.status == 1
+
+
+def test_reorg(fake_chain):
+    receipt = FakeReceipt(_txid(1), 0)
+    _track([receipt], 3)
+    fake_chain.mine([receipt.txid])
+    _wait_until(lambda: receipt.block_number == 1)
+
+    # the block including the transaction is orphaned
+    fake_chain.fork(0, [])
+    _wait_until(lambda: receipt.block_number is None)
+
+    fake_chain.mine([receipt.txid])
+    fake_chain.mine([])
+    fake_chain.mine([])
+    assert receipt._confirmed.wait(5)
+    assert receipt.confirmed_with[0].blockNumber == 2
+
+
+def test_no_requests_without_new_blocks(fake_chain):
+    receipts = [FakeReceipt(_txid(i), i) for i in range(10)]
+    _track(receipts, 1)
+    requests = dict(fake_chain.requests)
+    time.sleep(2.5)
+    # pending receipts and nonces are only checked again when a block arrives
+    assert fake_chain.requests == requests
+
+
+def test_blocks_not_delivered(fake_chain, monkeypatch):
+    receipt = FakeReceipt(_txid(1), 0)
+    _track([receipt], 1)
+    # the head tracker stops delivering blocks, receipts are polled instead
+    monkeypatch.setattr(confirmations, "FALLBACK_INTERVAL", 0.5)
+    monkeypatch.setattr(confirmation_tracker, "_process_block", lambda block: None)
+    fake_chain.mine([receipt.txid])
+    assert receipt._confirmed.wait(5)
+    assert receipt.status == 1
@@ -1,15 +1,22 @@
 #!/usr/bin/python3
 
 import asyncio
+import json
 import time
 
+import eth_event
 import pytest
+from faster_eth_abi import encode
+from hexbytes import HexBytes
 from web3.datastructures import AttributeDict
 from web3.exceptions import ABIEventFunctionNotFound
 
 from brownie import Contract, compile_source
+from brownie.convert.normalize import format_event
 from brownie.exceptions import EventLookupError
-from brownie.network.event import EventDict, EventWatcher, _EventItem, event_watcher
+from brownie.network import event as event_module
+from brownie.network import web3
+from brownie.network.event import EventDict, EventWatcher, _decode_logs, _EventItem, event_watcher
 from brownie.network.transaction import TransactionReceipt
 
 
@@ -24,11 +31,110 @@ def event_watcher_instance():
     return event_watcher
 
 
+TRANSFER_ABI = {
+    "anonymous": False,
+    "inputs": [
+        {"indexed": True, "name": "from", "type": "address"},
+        {"indexed": True, "name": "to", "type": "address"},
+        {"indexed": False, "name": "value", "type": "uint256"},
+    ],
+    "name": "Transfer",
+    "type": "event",
+}
+
+
+@pytest.fixture
+def transfer_topic():
+    topic_map = eth_event.get_topic_map([TRANSFER_ABI])
+    event_module._topics.add(topic_map)
+    return HexBytes(next(iter(topic_map)))
+
+
+def transfer_log(topic, index, address="0x0000000000000000000000000000000000000001"):
+    return {
+        "address": address,
+        "topics": [topic, HexBytes(index.to_bytes(32, "big")), HexBytes(bytes(32))],
+        "data": HexBytes(encode(["uint256"], [index])),
+        "logIndex": index,
+    }
+
+
 def wait_for_tx(tx: TransactionReceipt, n: int = 1):
     if tx.confirmations != n:
         tx.wait(n)
 
 
+def test_decode_many_logs(transfer_topic):
+    addresses = [f"0x{i:040x}" for i in range(1, 4)]
+    logs = [transfer_log(transfer_topic, i, addresses[i % 3]) for i in range(1000)]
+    events = _decode_logs(logs)
+
+    assert len(events) == 1000
+    assert events.keys() == ["Transfer"]
+    assert [i["value"] for i in events["Transfer"]] == list(range(1000))
+    assert [i.address for i in events] == [addresses[i % 3] for i in range(1000)]
+    assert events[5]["from"] == f"0x{5:040x}"
+
+
+def test_decode_logs_matches_eth_event(transfer_topic):
+    logs = [transfer_log(transfer_topic, i) for i in range(3)]
+    logs.append({"address": logs[0]["address"], "topics": [], "data": HexBytes(b"")})
+    logs.append({"address": logs[0]["address"], "topics": [HexBytes(b"1" * 32)], "data": "0x"})
+
+    topic_map = eth_event.get_topic_map([TRANSFER_ABI])
+    expected = eth_event.decode_logs(logs, topic_map, allow_undecoded=True)
+    assert str(_decode_logs(logs)) == str(EventDict(format_event(i) for i in expected))
+
+
+def test_params():
+    components = [{"type": "uint256"}, {"type": "tuple[]", "components": [{"type": "bool"}]}]
+    abi = [
+        {"type": "address"},
+        {"type": "tuple", "components": components},
+        {"type": "tuple[2]", "components": components},
+        {"type": "tuple[]", "components": [{"type": "bytes32"}]},
+    ]
+    assert event_module._params(abi) == [
+        "address",
+        "(uint256,(bool)[])",
+        "(uint256,(bool)[])[2]",
+        "(bytes32)[]",
+    ]
+
+
+def test_decode_malformed_log(transfer_topic):
+    log = transfer_log(transfer_topic, 1)
+    log["topics"].pop()
+    with pytest.warns(UserWarning, match="more topics than expected"):
+        events = _decode_logs([transfer_log(transfer_topic, 0), log])
+    assert len(events) == 1
+
+
+def test_topic_registry(tmp_path, monkeypatch):
+    monkeypatch.setattr("brownie.network.event._get_data_folder", lambda: tmp_path)
+    abi = dict(TRANSFER_ABI, inputs=[dict(i, indexed=False) for i in TRANSFER_ABI["inputs"]])
+    registry = event_module._TopicRegistry()
+    registry.add(eth_event.get_topic_map([abi]))
+    topic = next(iter(eth_event.get_topic_map([abi])))
+    assert not any(i["indexed"] for i in registry.get(topic)["inputs"])
+
+    # a fresh registry reads topics written by another instance
+    registry.add(eth_event.get_topic_map([TRANSFER_ABI]))
+    assert event_module._TopicRegistry().get(topic) == registry.get(topic)
+    assert registry.get(topic)["inputs"][0]["indexed"] is True
+    assert registry.get("0x" + "00" * 32) is None
+
+
+def test_topic_registry_migrates_json(tmp_path, monkeypatch):
+    monkeypatch.setattr("brownie.network.event._get_data_folder", lambda: tmp_path)
+    topic_map = eth_event.get_topic_map([TRANSFER_ABI])
+    tmp_path.joinpath("topics.json").write_text(json.dumps(topic_map))
+
+    registry = event_module._TopicRegistry()
+    assert registry.subset(topic_map) == topic_map
+    assert not tmp_path.joinpath("topics.json").exists()
+
+
 def test_tuple_values(accounts, tester):
     value = ["blahblah", accounts[1], ("yesyesyes", "0x1234")]
     tx = tester.setTuple(value)
@@ -110,8 +216,7 @@ def test_eventitem_raises(event):
 
 
 def test_same_topic_different_abi(accounts):
-    proj = compile_source(
-        """
+    proj = compile_source("""
     pragma solidity 0.5.0;
 
     contract Foo {
@@ -127,8 +232,7 @@ def test_same_topic_different_abi(accounts):
             _addr.foo();
             emit Baz(4, 5, 6);
         }
-    }"""
-    )
+    }""")
 
     foo = proj.Foo.deploy({"from": accounts[0]})
     bar = proj.Bar.deploy({"from": accounts[0]})
@@ -287,6 +391,23 @@ class TestEventWatcher:
         assert result.get("timed_out") is False, "Event listener timed out."
         assert expected_num == result.event_data["args"]["num"]
 
+    def test_can_stream_events(_, tester: Contract):
+        start = web3.eth.block_number + 1
+        for i in range(3):
+            wait_for_tx(tester.emitEvents("", i))
+
+        async def take(count):
+            stream = tester.events.stream("IndexedEvent", from_block=start, delay=0.05)
+            result = []
+            async for event_data in stream:
+                result.append(event_data["args"]["num"])
+                if len(result) == count:
+                    break
+            await stream.aclose()
+            return result
+
+        assert asyncio.run(take(3)) == [0, 1, 2]
+
     def test_not_repeating_callback_is_removed_after_triggered(_, tester: Contract):
         expected_trigger_count: int = 1
         trigger_count: int = 0
@@ -330,6 +451,60 @@ class TestEventWatcher:
 
         assert trigger_count == expected_trigger_count
 
+    def test_events_are_fetched_together(_, tester: Contract):
+        received = []
+
+        tester.events.subscribe("IndexedEvent", callback=received.append, delay=0.05)
+        tester.events.subscribe("Debug", callback=received.append, delay=0.05)
+        wait_for_tx(tester.emitEvents("", 0))
+        time.sleep(0.2)
+
+        metrics = event_watcher.metrics
+        assert len(received) == 3
+        assert metrics["dispatched_callbacks"] == metrics["completed_callbacks"] == 2
+        assert metrics["pending_callbacks"] == 0
+
+    def test_backpressure_warning(_, tester: Contract):
+        event_watcher.backpressure_threshold = 0
+
+        tester.events.subscribe("IndexedEvent", callback=lambda _: time.sleep(0.1), delay=0.05)
+        with pytest.warns(RuntimeWarning):
+            wait_for_tx(tester.emitEvents("", 0))
+            time.sleep(0.2)
+
+        event_watcher.backpressure_threshold = 64
+        assert event_watcher.metrics["backpressure_events"] == 1
+
+    def test_callback_exception_warns(_, tester: Contract):
+        def _callback(data):
+            raise ValueError("oops")
+
+        tester.events.subscribe("IndexedEvent", callback=_callback, delay=0.05)
+        with pytest.warns(RuntimeWarning, match="ValueError: oops"):
+            wait_for_tx(tester.emitEvents("", 0))
+            time.sleep(0.2)
+
+    def test_event_in_current_block_is_delivered(_, tester: Contract):
+        received = []
+
+        wait_for_tx(tester.emitEvents("", 0))
+        tester.events.subscribe("IndexedEvent", callback=received.append, delay=0.05)
+        time.sleep(0.2)
+
+        assert len(received) == 1
+
+    def test_reset_shuts_down_executor(_, tester: Contract):
+        tester.events.subscribe("IndexedEvent", callback=lambda _: None, delay=0.05)
+        wait_for_tx(tester.emitEvents("", 0))
+        time.sleep(0.2)
+        executor = event_watcher._executor
+        assert executor is not None
+
+        event_watcher.reset()
+        assert event_watcher._executor is None
+        with pytest.raises(RuntimeError):
+            executor.submit(lambda: None)
+
     @pytest.mark.skip(reason="For developing purpose")
     def test_scripting(_, tester: Contract):
         pass
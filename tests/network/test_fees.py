@@ -0,0 +1,206 @@
+#!/usr/bin/python3
+
+import time
+
+import pytest
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from web3.eth import Eth
+from web3.exceptions import MethodUnavailable
+
+from brownie.network import fees, web3
+from brownie.network.fees import fee_oracle
+from brownie.network.head import head_tracker
+
+
+class FakeChain:
+    """A chain with EIP-1559 fees which can be extended, without support for filters."""
+
+    def __init__(self, height):
+        self.canonical = []
+        self.requests = {
+            "latest": 0,
+            "block_number": 0,
+            "fee_history": 0,
+            "max_priority_fee": 0,
+            "gas_price": 0,
+        }
+        self.extend(height + 1)
+
+    def extend(self, count):
+        for _ in range(count):
+            number = len(self.canonical)
+            self.canonical.append(
+                AttributeDict(
+                    {
+                        "number": number,
+                        "hash": HexBytes(number.to_bytes(32, "big")),
+                        "parentHash": HexBytes((max(number, 1) - 1).to_bytes(32, "big")),
+                        "timestamp": number,
+                        "baseFeePerGas": 10**9 + number,
+                    }
+                )
+            )
+
+    def block_number(self, eth):
+        self.requests["block_number"] += 1
+        return self.canonical[-1].number
+
+    def get_block(self, block_id, full_transactions=False):
+        if block_id == "latest":
+            self.requests["latest"] += 1
+            return self.canonical[-1]
+        if isinstance(block_id, int):
+            return self.canonical[block_id]
+        return self.canonical[int.from_bytes(HexBytes(block_id), "big")]
+
+    def fee_history(self, block_count, newest_block, reward_percentiles):
+        self.requests["fee_history"] += 1
+        blocks = self.canonical[max(newest_block - block_count + 1, 0) : newest_block + 1]
+        return AttributeDict(
+            {
+                "oldestBlock": blocks[0].number,
+                "baseFeePerGas": [i.baseFeePerGas for i in blocks] + [10**9 + newest_block + 1],
+                "reward": [[i.number * 100 + p for p in reward_percentiles] for i in blocks],
+            }
+        )
+
+
+@pytest.fixture
+def fake_chain(monkeypatch):
+    def no_filter(*args):
+        raise MethodUnavailable({"code": -32601, "message": "method not found"})
+
+    chain = FakeChain(10)
+
+    def max_priority_fee(self):
+        chain.requests["max_priority_fee"] += 1
+        return 2 * 10**9
+
+    monkeypatch.setattr(web3.eth, "get_block", chain.get_block)
+    monkeypatch.setattr(web3.eth, "filter", no_filter)
+    monkeypatch.setattr(web3.eth, "fee_history", chain.fee_history)
+    monkeypatch.setattr(Eth, "max_priority_fee", property(max_priority_fee))
+    monkeypatch.setattr(Eth, "block_number", property(chain.block_number))
+    monkeypatch.setattr(fees, "MAX_INTERVAL", 0.05)
+    fee_oracle._reset()
+    yield chain
+    fee_oracle._last_access = 0
+    while fee_oracle._thread is not None or head_tracker._thread is not None:
+        time.sleep(0.01)
+
+
+def _wait_for_head(number):
+    deadline = time.time() + 5
+    while fee_oracle._head is None or fee_oracle._head["number"] != number:
+        if time.time() > deadline:
+            raise TimeoutError
+        time.sleep(0.01)
+
+
+def test_lookups_served_from_memory(fake_chain, monkeypatch):
+    assert fee_oracle.base_fee == 10**9 + 10
+    # requests made from the head tracker thread are not counted
+    requests = dict(fake_chain.requests)
+    monkeypatch.setattr(head_tracker, "_loop", lambda: None)
+    for _ in range(100):
+        assert fee_oracle.base_fee == 10**9 + 10
+        assert fee_oracle.next_base_fee == 10**9 + 11
+        assert fee_oracle.priority_fee == 600
+        assert fee_oracle.reward(90) == 640
+    assert fake_chain.requests["fee_history"] == 1
+    assert fake_chain.requests["max_priority_fee"] == 0
+    assert fake_chain.requests["latest"] == requests["latest"]
+    assert fake_chain.requests["block_number"] == requests["block_number"]
+
+
+def test_fetches_once_per_block(fake_chain):
+    assert fee_oracle.base_fee == 10**9 + 10
+    fake_chain.extend(1)
+    _wait_for_head(11)
+    for _ in range(10):
+        assert fee_oracle.base_fee == 10**9 + 11
+        assert fee_oracle.priority_fee == 700
+    assert fake_chain.requests["fee_history"] == 2
+
+
+def test_invalid_percentile(fake_chain):
+    with pytest.raises(ValueError):
+        fee_oracle.reward(60)
+
+
+def test_fee_history_not_supported(fake_chain, monkeypatch):
+    def not_supported(*args):
+        raise MethodUnavailable({"code": -32601, "message": "method not found"})
+
+    monkeypatch.setattr(web3.eth, "fee_history", not_supported)
+    for _ in range(10):
+        assert fee_oracle.priority_fee == 2 * 10**9
+    assert fake_chain.requests["max_priority_fee"] == 1
+    with pytest.raises(ValueError):
+        fee_oracle.reward(50)
+
+
+def test_revert_refetches(fake_chain):
+    fee_oracle.priority_fee
+    fee_oracle._revert(10)
+    fee_oracle.priority_fee
+    assert fake_chain.requests["fee_history"] == 2
+
+
+def test_confirmed_block_served_immediately(fake_chain):
+    assert fee_oracle.base_fee == 10**9 + 10
+    fake_chain.extend(1)
+    # a transaction confirmed in a block the head tracker has not necessarily seen yet
+    fee_oracle._observe_block(11)
+    assert fee_oracle.base_fee == 10**9 + 11
+    fee_oracle._observe_block(10)
+    assert fee_oracle.base_fee == 10**9 + 11
+    assert fake_chain.requests["fee_history"] == 2
+
+
+def test_max_priority_fee(fake_chain):
+    for _ in range(10):
+        assert fee_oracle.max_priority_fee == 2 * 10**9
+    assert fake_chain.requests["max_priority_fee"] == 1
+    assert fake_chain.requests["fee_history"] == 0
+
+
+def test_gas_price_without_fee_history(fake_chain, monkeypatch):
+    def generate_gas_price(*args):
+        fake_chain.requests["gas_price"] += 1
+        return 10**9
+
+    def not_supported(*args):
+        raise MethodUnavailable({"code": -32601, "message": "method not found"})
+
+    monkeypatch.setattr(web3.eth, "fee_history", not_supported)
+    monkeypatch.setattr(web3.eth, "generate_gas_price", generate_gas_price)
+    for _ in range(3):
+        assert fee_oracle.gas_price == 10**9
+    assert fake_chain.requests["gas_price"] == 1
+    assert fake_chain.requests["fee_history"] == 0
+
+    fake_chain.extend(1)
+    _wait_for_head(11)
+    fee_oracle.gas_price
+    assert fake_chain.requests["gas_price"] == 2
+    assert fake_chain.requests["fee_history"] == 0
+
+
+def test_gas_price_without_strategy(fake_chain, monkeypatch):
+    monkeypatch.setattr(web3.eth, "_gas_price_strategy", None)
+    assert fee_oracle.gas_price is None
+    assert fake_chain.requests["latest"] == 0
+
+
+def test_revert_registered_once(fake_chain, monkeypatch):
+    from brownie.network import state
+
+    registered = []
+    monkeypatch.setattr(state, "_revert_register", registered.append)
+    monkeypatch.setattr(fee_oracle, "_registered", False)
+    for i in range(3):
+        fee_oracle._revert(10)
+        assert fee_oracle.base_fee == 10**9 + 10
+    assert registered == [fee_oracle]
@@ -0,0 +1,131 @@
+#!/usr/bin/python3
+
+import time
+
+import pytest
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from web3.exceptions import MethodUnavailable
+
+from brownie.network import web3
+from brownie.network.head import MAX_FAILURES, Reorg, head_tracker
+
+
+class FakeChain:
+    """A chain which can be extended or forked, without support for filters."""
+
+    def __init__(self, height):
+        self.blocks = {}
+        self.canonical = []
+        self.extend(height + 1)
+
+    def extend(self, count, fork=0, canonical=None):
+        # the canonical chain is replaced at once, so the tracker never sees a partial fork
+        canonical = list(self.canonical if canonical is None else canonical)
+        for _ in range(count):
+            number = len(canonical)
+            parent = canonical[-1].hash if canonical else HexBytes(bytes(32))
+            block = AttributeDict(
+                {
+                    "number": number,
+                    "hash": HexBytes(number.to_bytes(16, "big") + fork.to_bytes(16, "big")),
+                    "parentHash": parent,
+                    "timestamp": number * 12,
+                }
+            )
+            self.blocks[block.hash] = block
+            canonical.append(block)
+        self.canonical = canonical
+
+    def fork(self, height, count, fork):
+        self.extend(count, fork, self.canonical[: height + 1])
+
+    def get_block(self, block_id, full_transactions=False):
+        if block_id == "latest":
+            return self.canonical[-1]
+        if isinstance(block_id, int):
+            return self.canonical[block_id]
+        return self.blocks[HexBytes(block_id)]
+
+
+@pytest.fixture
+def fake_chain(monkeypatch):
+    def no_filter(*args):
+        raise MethodUnavailable({"code": -32601, "message": "method not found"})
+
+    chain = FakeChain(10)
+    monkeypatch.setattr(web3.eth, "get_block", chain.get_block)
+    monkeypatch.setattr(web3.eth, "filter", no_filter)
+    yield chain
+    while head_tracker._thread is not None:
+        time.sleep(0.01)
+
+
+def test_new_heads(fake_chain):
+    with head_tracker.subscribe(0.05) as subscription:
+        assert subscription.get(timeout=5).number == 10
+        fake_chain.extend(2)
+        assert [subscription.get(timeout=5).number for i in range(2)] == [11, 12]
+
+
+def test_subscriptions_share_upstream(fake_chain):
+    with head_tracker.subscribe(0.05) as first, head_tracker.subscribe(0.05) as second:
+        assert first.get(timeout=5) == second.get(timeout=5) == fake_chain.canonical[10]
+        fake_chain.extend(1)
+        assert first.get(timeout=5) == second.get(timeout=5) == fake_chain.canonical[11]
+
+
+def test_reorg(fake_chain):
+    with head_tracker.subscribe(0.05) as subscription:
+        subscription.get(timeout=5)
+        fake_chain.extend(3)
+        assert [subscription.get(timeout=5).number for i in range(3)] == [11, 12, 13]
+        orphaned = fake_chain.canonical[11:]
+        fake_chain.fork(10, 4, fork=1)
+
+        reorg = subscription.get(timeout=5)
+        assert isinstance(reorg, Reorg)
+        assert reorg.orphaned == orphaned
+        assert reorg.ancestor == 10
+        assert reorg.depth == 3
+        assert [subscription.get(timeout=5) for i in range(4)] == fake_chain.canonical[11:]
+
+
+def test_new_blocks_yields_reorgs(fake_chain, chain):
+    blocks = chain.new_blocks(poll_interval=0.05, reorgs=True)
+    try:
+        assert next(blocks).number == 10
+        orphaned = fake_chain.canonical[10:]
+        fake_chain.fork(9, 1, fork=1)
+        assert next(blocks) == Reorg(orphaned, 9)
+        assert next(blocks) == fake_chain.canonical[10]
+    finally:
+        blocks.close()
+
+
+def test_failures_stop_tracker(fake_chain, monkeypatch):
+    requests = []
+
+    def get_block(block_id, full_transactions=False):
+        requests.append(time.monotonic())
+        raise ValueError({"code": -32000, "message": "internal error"})
+
+    monkeypatch.setattr(web3.eth, "get_block", get_block)
+    with head_tracker.subscribe(0.05) as subscription:
+        with pytest.raises(ValueError):
+            subscription.get(timeout=5)
+    assert head_tracker._thread is None
+    assert len(requests) == MAX_FAILURES
+    # the tracker waits between failed requests
+    assert requests[-1] - requests[0] >= 0.05 * (MAX_FAILURES - 1)
+
+
+def test_connection_error_stops_tracker(fake_chain, monkeypatch):
+    def filter(*args):
+        raise ConnectionError
+
+    monkeypatch.setattr(web3.eth, "filter", filter)
+    with head_tracker.subscribe(0.05) as subscription:
+        with pytest.raises(ConnectionError):
+            subscription.get(timeout=5)
+    assert head_tracker._thread is None
@@ -0,0 +1,229 @@
+#!/usr/bin/python3
+
+import asyncio
+
+import pytest
+from faster_eth_abi import encode
+from hexbytes import HexBytes
+from requests import Timeout
+from web3.exceptions import BlockNotFound
+
+from brownie.network import logs, web3
+
+ADDRESS = "0x0000000000000000000000000000000000000001"
+EVENT_ABI = {
+    "anonymous": False,
+    "inputs": [
+        {"indexed": True, "name": "a", "type": "uint256"},
+        {"indexed": False, "name": "b", "type": "uint256"},
+    ],
+    "name": "Foo",
+    "type": "event",
+}
+
+
+@pytest.fixture
+def requested_ranges(monkeypatch):
+    """Patches `eth_getLogs` to return one `Foo` log per block, limited to 30 blocks."""
+    topic = HexBytes(logs.get_topic(EVENT_ABI))
+    requested = []
+
+    def get_logs(params):
+        start, stop = params["fromBlock"], params["toBlock"]
+        requested.append((start, stop))
+        if stop - start >= 30:
+            raise ValueError({"code": -32005, "message": "query returned more than 10000 results"})
+        return [
+            {
+                "address": ADDRESS,
+                "topics": [topic, HexBytes(encode(["uint256"], [i]))],
+                "data": HexBytes(encode(["uint256"], [i * 2])),
+                "blockNumber": i,
+                "blockHash": HexBytes(b"\x00" * 32),
+                "logIndex": 0,
+                "transactionIndex": 0,
+                "transactionHash": HexBytes(b"\x00" * 32),
+            }
+            for i in range(start, stop + 1)
+        ]
+
+    monkeypatch.setattr(web3.eth, "get_logs", get_logs)
+    yield requested
+
+
+def test_single_request(requested_ranges):
+    result = logs.get_logs(ADDRESS, [logs.get_topic(EVENT_ABI)], 0, 9)
+    assert len(result) == 10
+    assert requested_ranges == [(0, 9)]
+
+
+def test_split_on_too_many_results(requested_ranges):
+    result = logs.get_logs(ADDRESS, [logs.get_topic(EVENT_ABI)], 0, 199, chunk_size=100)
+    assert [i["blockNumber"] for i in result] == list(range(200))
+    assert max(stop - start for start, stop in requested_ranges if (start, stop) != (0, 99)) < 100
+
+
+def test_sequential(requested_ranges):
+    result = logs.get_logs(ADDRESS, None, 0, 99, chunk_size=20, max_workers=1)
+    assert [i["blockNumber"] for i in result] == list(range(100))
+    assert requested_ranges == [(i, i + 19) for i in range(0, 100, 20)]
+
+
+def test_empty_range(requested_ranges):
+    assert logs.get_logs(ADDRESS, None, 10, 9) == []
+    assert requested_ranges == []
+
+
+def test_unrelated_error_is_raised(monkeypatch):
+    def get_logs(params):
+        raise ValueError({"code": -32000, "message": "invalid argument"})
+
+    monkeypatch.setattr(web3.eth, "get_logs", get_logs)
+    with pytest.raises(ValueError):
+        logs.get_logs(ADDRESS, None, 0, 100)
+
+
+def test_decode_logs(requested_ranges):
+    result = logs.decode_logs(logs.get_logs(ADDRESS, None, 0, 4), [EVENT_ABI])
+    assert list(result) == ["Foo"]
+    assert [dict(i["args"]) for i in result["Foo"]] == [{"a": i, "b": i * 2} for i in range(5)]
+
+
+def test_decoder_is_cached():
+    assert logs.get_decoder(EVENT_ABI) is logs.get_decoder(dict(EVENT_ABI))
+
+
+class FakeChain:
+    """A chain of 100 blocks with one `Foo` log per block, which can be reorganized."""
+
+    def __init__(self):
+        self.height = 99
+        self.fork = 0
+        self.requested_ranges = []
+
+    def block_hash(self, number):
+        fork = self.fork if number > 80 else 0
+        return HexBytes(number.to_bytes(16, "big") + fork.to_bytes(16, "big"))
+
+    def get_block(self, number):
+        if number > self.height:
+            raise BlockNotFound(f"Block with id: '{number}' not found.")
+        return {"number": number, "hash": self.block_hash(number)}
+
+    def get_logs(self, params):
+        start, stop = params["fromBlock"], min(params["toBlock"], self.height)
+        self.requested_ranges.append((start, stop))
+        topic = HexBytes(logs.get_topic(EVENT_ABI))
+        return [
+            {
+                "address": ADDRESS,
+                "topics": [topic, HexBytes(encode(["uint256"], [i]))],
+                "data": HexBytes(encode(["uint256"], [i * 2 + self.fork])),
+                "blockNumber": i,
+                "blockHash": self.block_hash(i),
+                "logIndex": 0,
+                "transactionIndex": 0,
+                "transactionHash": HexBytes(b"\x00" * 32),
+            }
+            for i in range(start, stop + 1)
+        ]
+
+
+@pytest.fixture
+def fake_chain(monkeypatch, config):
+    chain = FakeChain()
+    monkeypatch.setattr(config, "_active_network", {"id": "fake", "chainid": 424242})
+    monkeypatch.setattr(type(web3.eth), "block_number", property(lambda self: chain.height))
+    monkeypatch.setattr(web3.eth, "get_block", chain.get_block)
+    monkeypatch.setattr(web3.eth, "get_logs", chain.get_logs)
+    logs.event_index.rollback(-1)
+    yield chain
+    logs.event_index.rollback(-1)
+
+
+def test_index_sync(fake_chain):
+    assert logs.event_index.sync(ADDRESS, 10, 49) == 40
+    assert logs.event_index.synced_range(ADDRESS) == (10, 49)
+    assert logs.event_index.covers(ADDRESS, 20, 30)
+    assert not logs.event_index.covers(ADDRESS, 0, 30)
+
+    result = logs.event_index.get_logs(ADDRESS, [logs.get_topic(EVENT_ABI)], 20, 29)
+    assert [i["blockNumber"] for i in result] == list(range(20, 30))
+    assert logs.decode_logs(result, [EVENT_ABI])["Foo"][0]["args"] == {"a": 20, "b": 40}
+
+
+def test_index_sync_is_incremental(fake_chain):
+    logs.event_index.sync(ADDRESS, 10, 49)
+    fake_chain.requested_ranges.clear()
+
+    assert logs.event_index.sync(ADDRESS, 0) == 60
+    assert fake_chain.requested_ranges == [(0, 9), (50, 99)]
+    assert logs.event_index.synced_range(ADDRESS) == (0, 99)
+    assert len(logs.event_index.get_logs(ADDRESS)) == 100
+
+
+def test_index_reorg_rollback(fake_chain):
+    logs.event_index.sync(ADDRESS, 0)
+    fake_chain.fork = 1
+    fake_chain.height = 95
+
+    logs.event_index.sync(ADDRESS, 0)
+    assert logs.event_index.synced_range(ADDRESS) == (0, 95)
+    result = logs.decode_logs(logs.event_index.get_logs(ADDRESS, from_block=81), [EVENT_ABI])
+    assert [i["args"]["b"] for i in result["Foo"]] == [i * 2 + 1 for i in range(81, 96)]
+
+
+def test_index_not_rolled_back_on_error(fake_chain, monkeypatch):
+    logs.event_index.sync(ADDRESS, 0)
+
+    def timeout(number):
+        raise Timeout
+
+    monkeypatch.setattr(web3.eth, "get_block", timeout)
+    with pytest.raises(Timeout):
+        logs.event_index.sync(ADDRESS, 0)
+    assert logs.event_index.synced_range(ADDRESS) == (0, 99)
+    assert len(logs.event_index.get_logs(ADDRESS)) == 100
+
+
+def test_index_query_by_topic(fake_chain):
+    logs.event_index.sync(ADDRESS, 0, 9)
+    assert logs.event_index.get_logs(topics=["0x" + "00" * 32]) == []
+    assert len(logs.event_index.get_logs(topics=[logs.get_topic(EVENT_ABI)])) == 10
+
+
+async def take(stream, count):
+    result = []
+    async for log in stream:
+        result.append(log)
+        if len(result) == count:
+            break
+    await stream.aclose()
+    return result
+
+
+def test_stream_logs_in_order(fake_chain):
+    stream = logs.stream_logs(ADDRESS, logs.get_topic(EVENT_ABI), 0, delay=0.01, buffer_size=7)
+    result = asyncio.run(take(stream, 100))
+    assert [i["blockNumber"] for i in result] == list(range(100))
+
+
+def test_streams_share_requests(fake_chain):
+    async def main():
+        streams = [logs.stream_logs(ADDRESS, None, 90, delay=0.01) for i in range(500)]
+        results = await asyncio.gather(*(take(i, 10) for i in streams))
+        return results, logs._pollers[asyncio.get_running_loop()].requests
+
+    results, requests = asyncio.run(main())
+    assert all([i["blockNumber"] for i in result] == list(range(90, 100)) for result in results)
+    assert requests == 1
+
+
+def test_stream_raises_on_error(monkeypatch):
+    def get_logs(params):
+        raise ValueError({"code": -32000, "message": "invalid argument"})
+
+    monkeypatch.setattr(type(web3.eth), "block_number", property(lambda self: 10))
+    monkeypatch.setattr(web3.eth, "get_logs", get_logs)
+    with pytest.raises(ValueError):
+        asyncio.run(take(logs.stream_logs(ADDRESS, None, 0, delay=0.01), 1))
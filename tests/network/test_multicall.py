@@ -1,9 +1,13 @@
+import contextvars
 import inspect
+import threading
 
 import pytest
 from lazy_object_proxy import Proxy
 
 import brownie
+from brownie.network.contract import ContractCall
+from brownie.network.multicall import _next_batch
 
 
 @pytest.mark.skip("goerli is dead, maybe fix this with another network")
@@ -42,9 +46,9 @@ def test_flush_mid_execution(accounts, tester):
 
     with brownie.multicall:
         tester.getTuple(addr)
-        assert len([x for v in brownie.multicall._pending_calls.values() for x in v]) == 1
+        assert len(brownie.multicall._pending_calls) == 1
         brownie.multicall.flush()
-        assert len([x for v in brownie.multicall._pending_calls.values() for x in v]) == 0
+        assert len(brownie.multicall._pending_calls) == 0
 
 
 @pytest.mark.skip("goerli is dead, maybe fix this with another network")
@@ -55,10 +59,10 @@ def test_proxy_object_fetches_on_next_use(accounts, tester):
 
     with brownie.multicall:
         ret_val = tester.getTuple(addr)
-        assert len([x for v in brownie.multicall._pending_calls.values() for x in v]) == 1
+        assert len(brownie.multicall._pending_calls) == 1
         # ret_val is now fetched
         assert ret_val == value
-        assert len([x for v in brownie.multicall._pending_calls.values() for x in v]) == 0
+        assert len(brownie.multicall._pending_calls) == 0
 
 
 @pytest.mark.skip("goerli is dead, maybe fix this with another network")
@@ -128,3 +132,129 @@ def test_all_values_come_from_the_same_block(chain, devnetwork):
         assert first_call == second_call == third_call == fourth_call
 
     assert brownie.multicall._contract.getBlockNumber() == first_call + 20
+
+
+def test_deploy_multicall3(accounts, config):
+    multicall = brownie.multicall.deploy({"from": accounts[0]}, version=3)
+    assert config.active_network["multicall3"] == multicall.address
+    assert "multicall2" not in config.active_network
+
+    with brownie.multicall:
+        assert brownie.multicall.address == multicall.address
+        assert brownie.multicall._version == 3
+    assert brownie.multicall.address == multicall.address
+
+
+def test_deploy_invalid_version(accounts):
+    with pytest.raises(ValueError):
+        brownie.multicall.deploy({"from": accounts[0]}, version=1)
+
+
+def test_duplicate_calls_share_result(accounts, tester, monkeypatch):
+    brownie.multicall.deploy({"from": accounts[0]}, version=3)
+    addr = accounts[1]
+    value = ["blahblah", addr, ["yesyesyes", "0x1234"]]
+    tester.setTuple(value)
+    aggregated = []
+    call = ContractCall.call
+
+    def aggregate_call(self, *args, **kwargs):
+        if self._name == "aggregate3":
+            aggregated.append(args[0])
+        return call(self, *args, **kwargs)
+
+    monkeypatch.setattr(ContractCall, "call", aggregate_call)
+    with brownie.multicall:
+        results = [tester.getTuple(addr) for i in range(3)]
+        results.append(tester.getTuple(accounts[2]))
+        assert len(brownie.multicall._pending_calls) == 4
+
+    assert results[:3] == [value, value, value]
+    # one aggregate call with a single slot for the three identical calls
+    assert len(aggregated) == 1
+    assert len(aggregated[0]) == 2
+
+
+def test_raw_calls(accounts, tester):
+    brownie.multicall.deploy({"from": accounts[0]}, version=3)
+    addr = accounts[1]
+    value = ["blahblah", addr, ["yesyesyes", "0x1234"]]
+    tester.setTuple(value)
+
+    with brownie.multicall:
+        result = tester.getTuple(addr, raw=True)
+        formatted = tester.getTuple(addr)
+
+    assert result == ("blahblah", addr.address.lower(), ("yesyesyes", b"\x124" + bytes(30)))
+    assert type(result.__wrapped__) is tuple
+    assert formatted == value
+
+
+def test_balance_is_batched(accounts, tester):
+    brownie.multicall.deploy({"from": accounts[0]}, version=3)
+    expected = [accounts[1].balance(), tester.balance()]
+
+    with brownie.multicall:
+        balances = [accounts[1].balance(), tester.balance()]
+        assert all(isinstance(i, Proxy) for i in balances)
+
+    assert balances == expected
+    assert not isinstance(accounts[1].balance(), Proxy)
+
+
+def test_calls_in_other_threads_are_not_batched(accounts, tester):
+    addr = accounts[1]
+    value = ["blahblah", addr, ["yesyesyes", "0x1234"]]
+    tester.setTuple(value)
+    results = []
+
+    with brownie.multicall:
+        # threads may inherit the context of the caller, e.g. on free-threaded builds
+        thread = threading.Thread(
+            target=lambda: contextvars.Context().run(lambda: results.append(tester.getTuple(addr)))
+        )
+        thread.start()
+        thread.join()
+        assert len(brownie.multicall._pending_calls) == 0
+
+    assert not isinstance(results[0], Proxy)
+    assert results[0] == value
+
+
+def test_address_is_not_shared_between_threads():
+    address = "0x0000000000000000000000000000000000000001"
+    seen = []
+
+    brownie.multicall(address=address)
+    thread = threading.Thread(
+        target=lambda: contextvars.Context().run(lambda: seen.append(brownie.multicall.address))
+    )
+    thread.start()
+    thread.join()
+    assert seen == [None]
+    assert brownie.multicall.address == address
+    _next_batch.set(None)
+
+
+def test_contract_is_not_shared_between_threads(accounts, chain):
+    multicall = brownie.multicall.deploy({"from": accounts[0]}, version=3)
+    seen = []
+
+    def batch_in_thread():
+        with brownie.multicall(block_identifier=chain.height):
+            seen.append((brownie.multicall._contract, brownie.multicall._version))
+        seen.append((brownie.multicall._contract, brownie.multicall._version))
+
+    with brownie.multicall:
+        contract = brownie.multicall._contract
+        thread = threading.Thread(target=lambda: contextvars.Context().run(batch_in_thread))
+        thread.start()
+        thread.join()
+        assert brownie.multicall._contract is contract
+        assert brownie.multicall.address == multicall.address
+
+    assert seen[0][0] is not contract
+    assert seen[0][0].address == multicall.address
+    assert seen[0][1] == 3
+    assert seen[1] == (None, None)
+    assert brownie.multicall.address == multicall.address